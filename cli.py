@@ -3,7 +3,7 @@ import tkinter as tk
 import tkinter.font as tkFont
 import re
 import os
-import yaml
+import serialization
 
 class ToolTip:
     def __init__(self, widget, text:str, font:tuple=("Verdana", 15), delay:int=500):
@@ -590,7 +590,7 @@ class CLI(ctk.CTk):
 
         if os.path.exists(os.path.join(self.program_path, "clidata.yaml")):
             with open(os.path.join(self.program_path, "clidata.yaml"), "r") as file:
-                self.clidata = yaml.safe_load(file)
+                self.clidata = serialization.load(file)
 
         os.chdir(self.clidata["current_working_directory"])
 
@@ -743,7 +743,7 @@ class CLI(ctk.CTk):
             return CliMessage("On" if self.clidata["helper"] else "Off")
         
         with open(os.path.join(self.program_path, "clidata.yaml"), "w") as file:
-            yaml.dump(self.clidata, file, allow_unicode=True, sort_keys=False)
+            serialization.dump(self.clidata, file)
 
     def add_commands(self, *commands: "CliCommand"):
 
@@ -850,7 +850,7 @@ class CLI(ctk.CTk):
                 return CliMessage(message="Available themes mode: dark, light or system", status="warning")
         
         with open(os.path.join(self.program_path, "clidata.yaml"), "w") as file:
-            yaml.dump(self.clidata, file, allow_unicode=True, sort_keys=False)
+            serialization.dump(self.clidata, file)
 
     def typer_helper(self, event: tk.Event):
 
@@ -912,7 +912,7 @@ class CLI(ctk.CTk):
             return CliMessage("Path not found.", status="error")
         
         with open(os.path.join(self.program_path, "clidata.yaml"), "w") as file:
-            yaml.dump(self.clidata, file, allow_unicode=True, sort_keys=False)
+            serialization.dump(self.clidata, file)
 
     def __clear(self, *args):
 
@@ -1024,7 +1024,7 @@ class CLI(ctk.CTk):
             self.clidata["commands_history"].append(commands_line)
 
         with open(os.path.join(self.program_path, "clidata.yaml"), "w") as file:
-            yaml.dump(self.clidata, file, allow_unicode=True, sort_keys=False)
+            serialization.dump(self.clidata, file)
         
         self.current_history_index = -1
 
@@ -1,10 +1,26 @@
 import re
-import yaml
+import serialization
 import os
 from pathlib import Path
 
 DECIMAL_PLACES = 3
 
+# ASITIC CHIP SIZE (µm), SUBSTRATE FFT GRID AND EDDY CURRENT SWITCH
+CHIP_DEFAULTS = {
+    "chipx": 512,
+    "chipy": 512,
+    "fftx": 128,
+    "ffty": 128,
+    "eddy": 0,
+}
+
+# CHAVES DO FORMATO PADRÃO LIDAS PELOS MODELOS ELÉTRICOS, POR TIPO DE CAMADA
+DEFAULT_KEYS = {
+    "layer": ("resistivity", "Resistivity of layer"),
+    "metal": ("sheet_resistance", "Sheet resistance of metal"),
+    "via": ("resistance", "Resistance of via"),
+}
+
 LAYER_KEY_ORDER = [
     ["description"],
     ["rho", "resistivity", "conductivity"],
@@ -203,6 +219,34 @@ def convert_techfile_to_default(techfile: dict[str, list[dict[str, any]]]) -> di
     return converted_techfile
 
 
+def default_techfile(techfile: dict[str, list[dict[str, any]]]) -> dict[str, list[dict[str, any]]]:
+    """
+    Obtém um techfile no formato padrão lido pelos modelos elétricos, convertendo as camadas,
+    metais e vias dados por condutividade ou resistividade.
+    :param techfile: Dicionário com listas de elementos do techfile, em qualquer formato.
+    :return: O próprio techfile, se já estiver no formato padrão, ou sua cópia convertida.
+    :raises ValueError: Se uma camada, metal ou via não tiver como obter seu valor padrão.
+    """
+
+    def is_default(element: dict[str, any], layer_type: str) -> bool:
+        return DEFAULT_KEYS[layer_type][0] in element and "conductivity" not in element
+
+    if all(is_default(element, layer_type) for layer_type in DEFAULT_KEYS for element in techfile.get(layer_type, [])):
+        return techfile
+
+    try:
+        converted_techfile = convert_techfile_to_default(techfile=techfile)
+    except ZeroDivisionError:
+        raise ValueError("An element of the techfile has zero thickness, width or conductivity")
+
+    for layer_type, (key, label) in DEFAULT_KEYS.items():
+        for index, element in enumerate(converted_techfile.get(layer_type, [])):
+            if key not in element:
+                raise ValueError(f"{label} {element.get('name', element.get('description', index))} do not exist")
+
+    return converted_techfile
+
+
 def convert_techfile_values(techfile: dict[str, list[dict[str, any]]]) -> dict[str, list[dict[str, any]]]:
     """
     Converte apenas os valores dos elementos em um techfile.
@@ -268,15 +312,25 @@ def reorder_techfile(techfile:dict[str, list[dict[str, any]]]) -> dict[str, list
     
     return techfile_aux
 
-def chip_params(file_path:str):
+def chip_settings(techfile: dict[str, list[dict[str, any]]]) -> dict[str, int]:
+    """
+    Obtém as dimensões do chip e da grade FFT do substrato de um techfile.
+    :param techfile: Techfile cujo elemento "chip" pode sobrescrever os valores padrão.
+    :return: Dicionário com chipx, chipy, fftx, ffty e eddy.
+    """
+    chip = techfile.get("chip") or [{}]
+
+    return {key: chip[0].get(key, value) for key, value in CHIP_DEFAULTS.items()}
+
+def chip_params(file_path:str, chip:dict[str, int]=CHIP_DEFAULTS):
     return f"""<chip>
-    chipx = 512
-    chipy = 512
-    fftx = 128
-    ffty = 128
+    chipx = {chip["chipx"]}
+    chipy = {chip["chipy"]}
+    fftx = {chip["fftx"]}
+    ffty = {chip["ffty"]}
     TechFile = {os.path.basename(file_path)}
     TechPath = .
-    eddy = 0
+    eddy = {chip["eddy"]}
 """
 
 def process_user_path(user_input: str, correct_extension: str) -> str:
@@ -310,17 +364,18 @@ def process_user_path(user_input: str, correct_extension: str) -> str:
 def write_tech(techfile:dict[str, list[dict[str, any]]], file_path:str):
 
     with open(process_user_path(file_path, ".tech"), "w") as file:
-        yaml.dump(techfile, file, allow_unicode=True, sort_keys=False)
+        serialization.dump(techfile, file)
 
 def write_tek(techfile:dict[str, list[dict[str, any]]], file_path:str):
 
     file_path = process_user_path(file_path, ".tek")
+    chip = chip_settings(techfile=techfile)
 
     techfile = convert_techfile_to_default(techfile=techfile)
     techfile = convert_techfile_keys(techfile=techfile, output_type="tek")
     
     with open(file_path, "w") as file:
-        file.write(f"{chip_params(os.path.basename(file_path))}\n")
+        file.write(f"{chip_params(os.path.basename(file_path), chip)}\n")
         for layer_type in techfile:
             if layer_type != "chip":
                 for params_index in range(len(techfile[layer_type])):
@@ -339,7 +394,7 @@ def load_tech(file_path:str) -> dict[str, list[dict[str, any]]]:
     file_path = process_user_path(file_path, ".tech")
 
     with open(file_path, "r") as file:
-        return yaml.safe_load(file)
+        return serialization.load(file)
 
 def load_tek(file_path:str):
 
@@ -372,11 +427,16 @@ def load_tek(file_path:str):
                 if current_header is not None:  # Só adiciona se houver um cabeçalho ativo
                     loaded_techfile[current_header][current_index][key] = value
 
-    loaded_techfile.pop("chip", None)
+    # Mantém apenas as dimensões do chip e da grade FFT
+    chip = loaded_techfile.pop("chip", [{}])[0]
+    chip = {key: chip[key] for key in CHIP_DEFAULTS if key in chip}
 
     loaded_techfile = reorder_techfile(techfile=loaded_techfile)
     loaded_techfile = convert_techfile_keys(techfile=loaded_techfile, output_type="tech")
     loaded_techfile = convert_techfile_values(techfile=loaded_techfile)
 
+    if chip:
+        loaded_techfile = {"chip": convert_techfile_values(techfile={"chip": [chip]})["chip"], **loaded_techfile}
+
     # Exibe o resultado formatado como JSON
     return loaded_techfile
\ No newline at end of file
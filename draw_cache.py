@@ -0,0 +1,190 @@
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import spiral
+
+DEFAULT_CACHE_DIRECTORY = os.environ.get(
+    "INDUCALC_CACHE_DIR",
+    os.path.join(os.path.expanduser("~"), ".cache", "inducalc", "gds"),
+)
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+def canonicalize(value):
+
+    """
+    Normalizes a project value so that equal parameters always hash the same.
+
+    Dictionaries are sorted by key, tuples become lists and every number becomes a
+    float, so 120 and 120.0 are the same length.
+    """
+
+    if isinstance(value, dict):
+        return {str(key): canonicalize(value[key]) for key in sorted(value, key=str)}
+    if isinstance(value, (list, tuple)):
+        return [canonicalize(item) for item in value]
+    if isinstance(value, bool) or value is None:
+        return value
+    if isinstance(value, (int, float)):
+        return float(value)
+
+    return value
+
+def draw_key(inductor_name: str, inductor: dict[str], techfile: dict[str, list[dict[str]]], **options) -> str:
+
+    """
+    Gets the content hash of a drawing.
+
+    Args:
+        inductor_name: Name of the inductor, which names the GDS cell.
+        inductor: Inductor parameters, as stored in the project, without the techfile name.
+        techfile: Techfile referenced by the inductor.
+        **options: Drawing options changing the output, as the GDS backend and the trace mode.
+
+    Returns:
+        Hexadecimal SHA-256 digest.
+    """
+
+    content = {
+        "generator": spiral.GENERATOR_VERSION,
+        "inductor_name": inductor_name,
+        "inductor": canonicalize(inductor),
+        "techfile": canonicalize(techfile),
+        "options": canonicalize(options),
+    }
+
+    return hashlib.sha256(json.dumps(content, sort_keys=True, separators=(",", ":")).encode()).hexdigest()
+
+class DrawCache:
+
+    """
+    Content-addressed store of drawn GDS files, bounded in size.
+
+    Entries are named by their draw_key. The modification time of an entry is its last
+    use, so the least recently used entries are removed first when the cache outgrows
+    its size bound.
+
+    Attributes:
+        directory (str): Cache directory.
+        max_bytes (int): Maximum total size of the entries.
+        link (bool): Whether hits hard-link the entries instead of copying them. A linked
+            output shares its data with the cache, so it must be replaced rather than
+            rewritten in place, as staging_path does.
+    """
+
+    def __init__(self, directory: str = DEFAULT_CACHE_DIRECTORY, max_bytes: int = DEFAULT_MAX_BYTES, link: bool = False):
+
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.link = link
+
+    def entry_path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.gds")
+
+    def fetch(self, key: str, output_file: str) -> bool:
+
+        """
+        Places a cached drawing at the output file.
+
+        Args:
+            key: Content hash of the drawing.
+            output_file: Path of the GDS file.
+
+        Returns:
+            Whether the drawing was in the cache.
+        """
+
+        entry = self.entry_path(key)
+        if not os.path.isfile(entry):
+            return False
+
+        os.utime(entry)
+
+        # THE PREVIOUS OUTPUT IS ONLY REPLACED ONCE THE CACHED DRAWING IS IN PLACE
+        staging = staging_path(output_file)
+        try:
+            if self.link:
+                try:
+                    os.link(entry, staging)
+                except OSError:
+                    shutil.copyfile(entry, staging)
+            else:
+                shutil.copyfile(entry, staging)
+            os.replace(staging, output_file)
+        finally:
+            if os.path.exists(staging):
+                os.remove(staging)
+
+        return True
+
+    def store(self, key: str, output_file: str):
+
+        """
+        Copies a drawn GDS file into the cache and evicts old entries.
+
+        Args:
+            key: Content hash of the drawing.
+            output_file: Path of the drawn GDS file.
+        """
+
+        os.makedirs(self.directory, exist_ok=True)
+
+        # COPYING UNDER A TEMPORARY NAME SO A HALF-WRITTEN ENTRY IS NEVER A HIT
+        descriptor, temporary_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        os.close(descriptor)
+        try:
+            shutil.copyfile(output_file, temporary_path)
+            os.replace(temporary_path, self.entry_path(key))
+        except BaseException:
+            os.remove(temporary_path)
+            raise
+
+        self.evict()
+
+    def entries(self) -> list[os.DirEntry]:
+
+        if not os.path.isdir(self.directory):
+            return []
+
+        return [entry for entry in os.scandir(self.directory) if entry.name.endswith(".gds") and entry.is_file()]
+
+    def size(self) -> int:
+        return sum(entry.stat().st_size for entry in self.entries())
+
+    def evict(self):
+
+        """
+        Removes the least recently used entries until the cache fits in its size bound.
+        """
+
+        entries = sorted(self.entries(), key=lambda entry: entry.stat().st_mtime_ns)
+        total = sum(entry.stat().st_size for entry in entries)
+
+        for entry in entries:
+            if total <= self.max_bytes:
+                break
+            total -= entry.stat().st_size
+            try:
+                os.remove(entry.path)
+            except FileNotFoundError:
+                pass
+
+    def clear(self):
+
+        for entry in self.entries():
+            os.remove(entry.path)
+
+def staging_path(output_file: str) -> str:
+
+    """
+    Gets the path a drawing is written to before it replaces the output file.
+
+    It lies in the same directory, so the replacement is a single rename that keeps the
+    previous output until the new one is complete, and never writes into a file hard-linked
+    from the cache.
+    """
+
+    directory, name = os.path.split(os.path.abspath(output_file))
+
+    return os.path.join(directory, f".{os.getpid()}.{name}")
@@ -0,0 +1,282 @@
+import os
+import numpy as np
+import inductance
+import pi_model
+import quality
+import resistance
+import spiral
+import sweep
+
+# EVALUATED COLUMNS, IN µm, nH, Hz AND µm²
+COLUMNS = ("length", "width", "space", "turns", "inductance", "quality", "area", "self_resonance")
+
+def dominated(points: np.ndarray, others: np.ndarray, block_size: int = 1024) -> np.ndarray:
+
+    """
+    Finds the points dominated by any of the other points, every objective being maximized.
+
+    A point is dominated when another one is at least as good in every objective and
+    better in one. The comparisons are made in blocks of points, which bounds the memory.
+
+    Args:
+        points: Array of shape (points, objectives).
+        others: Array of shape (others, objectives).
+        block_size: Number of points compared at once.
+
+    Returns:
+        Boolean array of shape (points,).
+    """
+
+    mask = np.zeros(len(points), dtype=bool)
+    if not len(others):
+        return mask
+
+    for first in range(0, len(points), block_size):
+        block = points[first:first + block_size]
+
+        # ONE OBJECTIVE AT A TIME, SO EVERY TEMPORARY IS A (BLOCK, OTHERS) MATRIX
+        at_least = np.ones((len(block), len(others)), dtype=bool)
+        better = np.zeros((len(block), len(others)), dtype=bool)
+        for objective in range(points.shape[1]):
+            at_least &= others[:, objective] >= block[:, objective, None]
+            better |= others[:, objective] > block[:, objective, None]
+
+        mask[first:first + block_size] = np.any(at_least & better, axis=1)
+
+    return mask
+
+def objectives(columns: dict[str, np.ndarray]) -> np.ndarray:
+
+    """
+    Gets the objectives of evaluated geometries: the inductance and the quality factor are
+    maximized, and the area is minimized.
+    """
+
+    return np.stack((columns["inductance"], columns["quality"], -columns["area"]), axis=-1)
+
+def evaluate(
+        length: np.ndarray,
+        width: np.ndarray,
+        space: np.ndarray,
+        turns: np.ndarray,
+        techfile: dict[str, list[dict[str]]],
+        base_metal_index: int,
+        exit_metal_index: int,
+        frequency: float,
+        resonance_frequencies: np.ndarray = None,
+    ) -> dict[str, np.ndarray]:
+
+    """
+    Evaluates square spirals sharing a techfile and metals, from arrays.
+
+    Args:
+        length: External lengths in µm.
+        width: Widths of the metal traces in µm.
+        space: Spaces between base metal traces in µm.
+        turns: Numbers of turns.
+        techfile: Techfile of the inductors.
+        base_metal_index: Index of the base metal.
+        exit_metal_index: Index of the exit metal.
+        frequency: Frequency of the quality factor in Hz.
+        resonance_frequencies: Increasing frequencies in Hz searched for the self-resonance.
+            Without them the self-resonant frequencies are NaN.
+
+    Returns:
+        Arrays of every column of COLUMNS.
+    """
+
+    inductances = inductance.current_sheet(length, width, space, turns, shape="square")
+    resistances = resistance.square_resistances(length, width, space, turns, techfile, base_metal_index, exit_metal_index)
+    parameters = np.broadcast_to(pi_model.stack_parameters(techfile, base_metal_index, exit_metal_index), (len(length), 8))
+
+    def quality_factors(frequencies):
+        return quality.quality_factor(pi_model.assemble(frequencies, inductances, resistances, width, turns, parameters))
+
+    return {
+        "length": length,
+        "width": width,
+        "space": space,
+        "turns": turns,
+        "inductance": inductances,
+        "quality": quality_factors([frequency])[:, 0],
+        "area": np.square(length),
+        "self_resonance": (
+            np.full(len(length), np.nan) if resonance_frequencies is None
+            else quality.self_resonance(resonance_frequencies, quality_factors(resonance_frequencies))
+        ),
+    }
+
+def explore(
+        length: list[float],
+        width: list[float],
+        space: list[float],
+        turns: list[float],
+        techfile: dict[str, list[dict[str]]],
+        base_metal: str,
+        exit_metal: str,
+        frequency: float | int,
+        resonance_frequencies=None,
+        chunk_size: int = 4096,
+        raw_directory: str = None,
+        progress: callable = None,
+    ) -> dict[str]:
+
+    """
+    Explores every combination of square spiral parameters, keeping the Pareto front of
+    inductance, quality factor and area.
+
+    The combinations are enumerated and evaluated in chunks, and each chunk is merged into
+    the front and discarded, so the memory does not grow with the size of the space. Raw
+    results are written into memory-mapped column files as they are evaluated.
+
+    Args:
+        length: External lengths in µm.
+        width: Widths of the metal traces in µm.
+        space: Spaces between base metal traces in µm.
+        turns: Numbers of turns.
+        techfile: Techfile of the inductors.
+        base_metal: Name of the base metal.
+        exit_metal: Name of the exit metal.
+        frequency: Frequency of the quality factor in Hz.
+        resonance_frequencies: Increasing frequencies in Hz searched for the self-resonance.
+            Defaults to 64 points from 0.1 to 100 GHz.
+        chunk_size: Number of combinations evaluated at once.
+        raw_directory: Optional directory receiving a .npy file per column with every result.
+        progress: Optional function receiving the progress as a fraction between 0 and 1.
+
+    Returns:
+        Columns of the front ("front", sorted by inductance), the number of combinations
+        ("evaluated") and the number of them with a valid model ("valid").
+
+    Raises:
+        ValueError: If a metal do not exist.
+    """
+
+    base_metal_index = spiral.get_metal_index(techfile=techfile, metal_name=base_metal)
+    exit_metal_index = spiral.get_metal_index(techfile=techfile, metal_name=exit_metal)
+    if base_metal_index == -1 or exit_metal_index == -1:
+        raise ValueError("Metal do not exist")
+
+    if resonance_frequencies is None:
+        resonance_frequencies = np.linspace(0.1, 100, 64) * 1e9
+
+    axes = [np.asarray(values, dtype=float) for values in (length, width, space, turns)]
+    shape = tuple(len(values) for values in axes)
+    total = int(np.prod(shape))
+
+    raw = None
+    if raw_directory is not None:
+        os.makedirs(raw_directory, exist_ok=True)
+        raw = {
+            column: np.lib.format.open_memmap(os.path.join(raw_directory, f"{column}.npy"), mode="w+", dtype=float, shape=(total,))
+            for column in COLUMNS
+        }
+
+    report = spiral.Progress(callback=progress)
+    report(0)
+
+    front = {column: np.empty(0) for column in COLUMNS}
+    valid = 0
+
+    stack = {
+        "techfile": techfile,
+        "base_metal_index": base_metal_index,
+        "exit_metal_index": exit_metal_index,
+        "frequency": frequency,
+    }
+
+    for start in range(0, total, chunk_size):
+        indices = np.unravel_index(np.arange(start, min(start + chunk_size, total)), shape)
+
+        # THE SELF-RESONANCE IS NOT AN OBJECTIVE, SO WITHOUT RAW RESULTS IT IS ONLY SEARCHED ON THE FRONT
+        with np.errstate(invalid="ignore", divide="ignore"):
+            chunk = evaluate(
+                *(values[index] for values, index in zip(axes, indices)),
+                **stack,
+                resonance_frequencies=None if raw is None else resonance_frequencies,
+            )
+
+        if raw is not None:
+            for column in COLUMNS:
+                raw[column][start:start + len(indices[0])] = chunk[column]
+
+        # DROPPING THE INVALID POINTS AND THOSE ALREADY DOMINATED BY THE FRONT BEFORE MERGING
+        points = objectives(chunk)
+        keep = np.isfinite(points).all(axis=1)
+        valid += int(keep.sum())
+
+        front_points = objectives(front)
+        keep[keep] = ~dominated(points[keep], front_points)
+
+        # THE FRONT IS ALREADY NON-DOMINATED, SO ONLY THE NEW POINTS ARE COMPARED WITH EACH OTHER AND WITH IT
+        keep[keep] = ~dominated(points[keep], points[keep])
+        remaining = ~dominated(front_points, points[keep])
+
+        front = {column: np.concatenate((front[column][remaining], chunk[column][keep])) for column in COLUMNS}
+
+        report(min(start + chunk_size, total) / total)
+
+    if raw is not None:
+        for column in COLUMNS:
+            raw[column].flush()
+
+    if raw is None and len(front["length"]):
+        with np.errstate(invalid="ignore", divide="ignore"):
+            front["self_resonance"] = evaluate(
+                *(front[column] for column in sweep.SWEEP_PARAMETERS),
+                **stack,
+                resonance_frequencies=resonance_frequencies,
+            )["self_resonance"]
+
+    order = np.argsort(front["inductance"], kind="stable")
+
+    return {
+        "front": {column: values[order] for column, values in front.items()},
+        "evaluated": total,
+        "valid": valid,
+    }
+
+def write_front(output_file: str, front: dict[str, np.ndarray], techfile_name: str, base_metal: str, exit_metal: str):
+
+    """
+    Writes a Pareto front into a columnar .npz file, with the techfile and metals it was
+    explored with.
+    """
+
+    np.savez(
+        output_file,
+        **front,
+        techfile_name=np.array(techfile_name),
+        base_metal=np.array(base_metal),
+        exit_metal=np.array(exit_metal),
+    )
+
+def front_inductors(input_file: str, prefix: str) -> dict[str, dict[str]]:
+
+    """
+    Reads a Pareto front file into inductors, as stored in a project.
+
+    Args:
+        input_file: Path of the .npz file written by write_front.
+        prefix: Prefix of the inductor names.
+
+    Returns:
+        Inductor parameters by inductor name.
+    """
+
+    with np.load(input_file) as front:
+        geometries: dict[str, dict[str, float]] = dict()
+        for values in zip(*(front[column].tolist() for column in sweep.SWEEP_PARAMETERS)):
+            geometries.update(sweep.sweep_variants(*([value] for value in values), prefix=prefix))
+
+        return {
+            name: {
+                "base_metal": str(front["base_metal"]),
+                "exit_metal": str(front["exit_metal"]),
+                **geometry,
+                "techfile_name": str(front["techfile_name"]),
+                "x": 0.0,
+                "y": 0.0,
+            }
+            for name, geometry in geometries.items()
+        }
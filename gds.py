@@ -0,0 +1,375 @@
+import math
+import struct
+import numpy as np
+
+# GDSII RECORD TYPES (RECORD TYPE << 8 | DATA TYPE)
+HEADER = 0x0002
+BGNLIB = 0x0102
+LIBNAME = 0x0206
+UNITS = 0x0305
+ENDLIB = 0x0400
+BGNSTR = 0x0502
+STRNAME = 0x0606
+ENDSTR = 0x0700
+BOUNDARY = 0x0800
+PATH = 0x0900
+SREF = 0x0A00
+AREF = 0x0B00
+LAYER = 0x0D02
+DATATYPE = 0x0E02
+WIDTH = 0x0F03
+XY = 0x1003
+ENDEL = 0x1100
+SNAME = 0x1206
+COLROW = 0x1302
+STRANS = 0x1A01
+ANGLE = 0x1C05
+PATHTYPE = 0x2102
+
+GDS_VERSION = 600
+MAX_XY_POINTS = 8191
+
+# MODIFICATION AND ACCESS DATES OF THE LIBRARY AND ITS CELLS, FIXED TO 1970-01-01 00:00:00 SO
+# THE SAME CELLS ALWAYS GIVE THE SAME FILE
+TIMESTAMP = struct.pack(">12h", 1970, 1, 1, 0, 0, 0, 1970, 1, 1, 0, 0, 0)
+
+class Reference:
+
+    """
+    Placement of a cell inside another cell, either single (SREF) or as an array (AREF).
+
+    Attributes:
+        cell (Cell): Referenced cell.
+        origin (tuple[float, float]): Position of the referenced cell origin.
+        rotation (float): Counterclockwise rotation in degrees, applied after the reflection.
+        x_reflection (bool): Whether the cell is mirrored about the x axis.
+        columns (int): Number of columns of the array.
+        rows (int): Number of rows of the array.
+        spacing (tuple[float, float]): Column and row pitches of the array, along the axes of
+            the referenced cell, so the array turns and mirrors with it.
+    """
+
+    def __init__(
+            self,
+            cell: "Cell",
+            origin: tuple[float, float] = (0, 0),
+            rotation: float = 0,
+            x_reflection: bool = False,
+            columns: int = 1,
+            rows: int = 1,
+            spacing: tuple[float, float] = (0, 0),
+        ):
+
+        self.cell = cell
+        self.origin = (float(origin[0]), float(origin[1]))
+        self.rotation = rotation
+        self.x_reflection = x_reflection
+        self.columns = columns
+        self.rows = rows
+        self.spacing = (float(spacing[0]), float(spacing[1]))
+
+    def __repr__(self):
+        return f'Reference(cell="{self.cell.name}", origin={self.origin}, columns={self.columns}, rows={self.rows})'
+
+class Cell:
+
+    """
+    Lightweight GDSII structure built from coordinate arrays.
+
+    Polygons are kept in batches of same-sized polygons, so that thousands of
+    rectangles cost a single NumPy array instead of thousands of objects.
+
+    Attributes:
+        name (str): Name of the structure.
+        polygons (list[tuple[tuple[int, int], np.ndarray]]): Layer and (n, vertices, 2) array of each batch.
+        paths (list[tuple[tuple[int, int], np.ndarray, float]]): Layer, (points, 2) array and width of each path.
+        references (list[Reference]): Placements of other cells.
+    """
+
+    def __init__(self, name: str):
+
+        self.name = name
+        self.polygons: list[tuple[tuple[int, int], np.ndarray]] = []
+        self.paths: list[tuple[tuple[int, int], np.ndarray, float]] = []
+        self.references: list[Reference] = []
+
+    def add_polygon(self, polygon, layer: tuple[int, int]):
+
+        """
+        Adds a single polygon.
+
+        Args:
+            polygon: Sequence of (x, y) vertices.
+            layer: GDS number and datatype.
+        """
+
+        self.polygons.append((tuple(layer), np.asarray(polygon, dtype=float)[None]))
+
+    def add_polygons(self, polygons: np.ndarray, layer: tuple[int, int]):
+
+        """
+        Adds a batch of polygons with the same number of vertices.
+
+        Args:
+            polygons: Array of shape (n, vertices, 2).
+            layer: GDS number and datatype.
+        """
+
+        self.polygons.append((tuple(layer), np.asarray(polygons, dtype=float)))
+
+    def add_path(self, path, width: float, layer: tuple[int, int]):
+
+        """
+        Adds a path with flush ends.
+
+        Args:
+            path: Sequence of (x, y) points of the path center line.
+            width: Width of the path.
+            layer: GDS number and datatype.
+        """
+
+        self.paths.append((tuple(layer), np.asarray(path, dtype=float), float(width)))
+
+    def add_rectangle(self, x: float, y: float, width: float, height: float, layer: tuple[int, int]):
+
+        """
+        Adds a rectangle given its lower left corner.
+        """
+
+        self.add_polygon(((x, y), (x + width, y), (x + width, y + height), (x, y + height)), layer=layer)
+
+    def add_reference(self, cell: "Cell", **kwargs) -> Reference:
+
+        """
+        Places another cell inside this one. Keyword arguments are passed to Reference.
+        """
+
+        reference = Reference(cell, **kwargs)
+        self.references.append(reference)
+
+        return reference
+
+    def dependencies(self) -> list["Cell"]:
+
+        """
+        Gets this cell and every cell it references, children before parents.
+        """
+
+        ordered: list["Cell"] = []
+        visited: set[int] = set()
+
+        def visit(cell: "Cell"):
+            if id(cell) in visited:
+                return
+            visited.add(id(cell))
+            for reference in cell.references:
+                visit(reference.cell)
+            ordered.append(cell)
+
+        visit(self)
+
+        return ordered
+
+    def __repr__(self):
+        return f'Cell(name="{self.name}", polygons={sum(len(batch) for layer, batch in self.polygons)}, references={len(self.references)})'
+
+def real8(value: float) -> bytes:
+
+    """
+    Encodes a number as a GDSII 8-byte real (excess-64, base-16 exponent).
+    """
+
+    if value == 0:
+        return bytes(8)
+
+    sign = 0x80 if value < 0 else 0
+    mantissa, exponent = math.frexp(abs(value))
+
+    # CONVERTING THE BASE-2 EXPONENT INTO A BASE-16 ONE
+    shift = (-exponent) % 4
+    mantissa /= 2 ** shift
+    exponent = (exponent + shift) // 4
+
+    integer_mantissa = round(mantissa * 2 ** 56)
+    if integer_mantissa >= 2 ** 56:
+        integer_mantissa >>= 4
+        exponent += 1
+
+    return bytes((sign | (exponent + 64),)) + integer_mantissa.to_bytes(7, "big")
+
+def record(record_type: int, data: bytes = b"") -> bytes:
+
+    """
+    Packs a GDSII record, padding its data to an even length.
+    """
+
+    if len(data) % 2:
+        data += b"\0"
+
+    return struct.pack(">HH", len(data) + 4, record_type) + data
+
+def string_record(record_type: int, text: str) -> bytes:
+    return record(record_type, text.encode("ascii"))
+
+def boundaries(polygons: np.ndarray, layer: tuple[int, int], scale: float) -> bytes:
+
+    """
+    Encodes a batch of polygons as BOUNDARY elements in a single NumPy operation.
+
+    Args:
+        polygons: Array of shape (n, vertices, 2) in user units.
+        layer: GDS number and datatype.
+        scale: Database units per user unit.
+    """
+
+    count, vertices = polygons.shape[:2]
+    if vertices + 1 > MAX_XY_POINTS:
+        raise ValueError(f"Polygons with {vertices} vertices exceed the GDSII limit of {MAX_XY_POINTS - 1}")
+
+    # CLOSING THE POLYGONS AND SNAPPING THEM TO THE DATABASE GRID
+    closed = np.concatenate((polygons, polygons[:, :1]), axis=1)
+    coordinates = np.rint(closed * scale).astype(">i4").view(np.uint8).reshape(count, -1)
+
+    prefix = np.frombuffer(
+        record(BOUNDARY)
+        + record(LAYER, struct.pack(">h", layer[0]))
+        + record(DATATYPE, struct.pack(">h", layer[1]))
+        + struct.pack(">HH", coordinates.shape[1] + 4, XY),
+        dtype=np.uint8,
+    )
+    suffix = np.frombuffer(record(ENDEL), dtype=np.uint8)
+
+    return np.concatenate(
+        (
+            np.broadcast_to(prefix, (count, len(prefix))),
+            coordinates,
+            np.broadcast_to(suffix, (count, len(suffix))),
+        ),
+        axis=1,
+    ).tobytes()
+
+def path_element(path: np.ndarray, width: float, layer: tuple[int, int], scale: float) -> bytes:
+
+    """
+    Encodes a path as a PATH element with flush ends.
+    """
+
+    if len(path) > MAX_XY_POINTS:
+        raise ValueError(f"Paths with {len(path)} points exceed the GDSII limit of {MAX_XY_POINTS}")
+
+    return (
+        record(PATH)
+        + record(LAYER, struct.pack(">h", layer[0]))
+        + record(DATATYPE, struct.pack(">h", layer[1]))
+        + record(PATHTYPE, struct.pack(">h", 0))
+        + record(WIDTH, struct.pack(">i", round(width * scale)))
+        + record(XY, np.rint(path * scale).astype(">i4").tobytes())
+        + record(ENDEL)
+    )
+
+def reference_element(reference: Reference, scale: float) -> bytes:
+
+    data = b""
+    is_array = reference.columns > 1 or reference.rows > 1
+
+    data += record(AREF if is_array else SREF)
+    data += string_record(SNAME, reference.cell.name)
+
+    if reference.x_reflection or reference.rotation:
+        data += record(STRANS, struct.pack(">H", 0x8000 if reference.x_reflection else 0))
+        if reference.rotation:
+            data += record(ANGLE, real8(reference.rotation))
+
+    x, y = reference.origin
+    if is_array:
+        data += record(COLROW, struct.pack(">hh", reference.columns, reference.rows))
+
+        # THE LATTICE VECTORS ARE REFLECTED AND ROTATED AS THE PLACEMENT
+        lattice = np.array(((reference.columns * reference.spacing[0], 0), (0, reference.rows * reference.spacing[1])))
+        if reference.x_reflection:
+            lattice[:, 1] = -lattice[:, 1]
+        angle = math.radians(reference.rotation)
+        rotation = np.array(((math.cos(angle), -math.sin(angle)), (math.sin(angle), math.cos(angle))))
+
+        points = np.array((x, y)) + np.vstack(((0, 0), lattice @ rotation.T))
+    else:
+        points = np.array(((x, y),))
+
+    data += record(XY, np.rint(points * scale).astype(">i4").tobytes())
+    data += record(ENDEL)
+
+    return data
+
+def write_gds(
+        output_file: str,
+        cells: "Cell | list[Cell]",
+        library_name: str = "LIB",
+        unit: float = 1e-6,
+        precision: float = 1e-9,
+    ):
+
+    """
+    Writes cells and every cell they reference into a GDSII stream file.
+
+    The library is assembled in memory and written with a single call. Cells with
+    the same name and contents are written only once.
+
+    Args:
+        output_file: Path of the GDS file.
+        cells: Top cell or list of top cells.
+        library_name: Name of the library.
+        unit: Size of the user unit in meters.
+        precision: Size of the database unit in meters.
+
+    Raises:
+        ValueError: If two cells with different contents have the same name.
+    """
+
+    if isinstance(cells, Cell):
+        cells = [cells]
+
+    scale = unit / precision
+
+    stream = bytearray()
+    stream += record(HEADER, struct.pack(">h", GDS_VERSION))
+    stream += record(BGNLIB, TIMESTAMP)
+    stream += string_record(LIBNAME, library_name)
+    stream += record(UNITS, real8(precision / unit) + real8(precision))
+
+    written: dict[str, bytes] = dict()
+    visited: set[int] = set()
+    for top_cell in cells:
+        for cell in top_cell.dependencies():
+            if id(cell) in visited:
+                continue
+            visited.add(id(cell))
+
+            structure = bytearray()
+            structure += record(BGNSTR, TIMESTAMP)
+            structure += string_record(STRNAME, cell.name)
+
+            for layer, polygons in cell.polygons:
+                if len(polygons):
+                    structure += boundaries(polygons=polygons, layer=layer, scale=scale)
+
+            for layer, path, width in cell.paths:
+                structure += path_element(path=path, width=width, layer=layer, scale=scale)
+
+            for reference in cell.references:
+                structure += reference_element(reference=reference, scale=scale)
+
+            structure += record(ENDSTR)
+
+            # CELLS REBUILT UNDER THE SAME NAME ARE ONLY KEPT WHEN THEY ARE THE SAME CELL
+            if cell.name in written:
+                if written[cell.name] != structure:
+                    raise ValueError(f"Two different cells are named {cell.name}")
+                continue
+            written[cell.name] = bytes(structure)
+
+            stream += structure
+
+    stream += record(ENDLIB)
+
+    with open(output_file, "wb") as file:
+        file.write(stream)
@@ -0,0 +1,394 @@
+import numpy as np
+
+# DIRECTION OF EACH SEGMENT OF A SQUARE SPIRAL, INDEXED BY SEGMENT % 4
+# WEST SIDE GOES UP, NORTH SIDE GOES RIGHT, EAST SIDE GOES DOWN, SOUTH SIDE GOES LEFT
+SQUARE_DIRECTIONS = np.array(
+    (
+        (0, 1),  # WEST
+        (1, 0),  # NORTH
+        (0, -1), # EAST
+        (-1, 0), # SOUTH
+    ),
+    dtype=float,
+)
+
+# OFFSETS OF THE LOWER LEFT AND UPPER RIGHT CORNERS OF A SEGMENT RECTANGLE, IN TRACE WIDTHS
+SQUARE_LOW_OFFSETS = np.array(((0, 0), (0, -1), (-1, 0), (0, 0)), dtype=float)
+SQUARE_HIGH_OFFSETS = np.array(((1, 0), (0, 0), (0, 0), (0, 1)), dtype=float)
+
+def square_spiral_lengths(
+        length: float | int,
+        width: float | int,
+        space: float | int,
+        turns: float | int,
+    ) -> np.ndarray:
+
+    """
+    Gets the length of every segment of a square spiral.
+
+    The first three segments have the external length and, from then on, the
+    length shrinks by one pitch (space + width) every two segments.
+
+    Args:
+        length: External length of the square inductor.
+        width: Width of the metal traces forming the inductor.
+        space: Space between base metal traces.
+        turns: Number of turns in the spiral inductor.
+
+    Returns:
+        Array of shape (segments,) with the length of each segment.
+    """
+
+    index = np.arange(round(turns * 4))
+
+    return length - (space + width) * np.maximum(0, (index - 1) // 2)
+
+def square_spiral_path(
+        length: float | int,
+        width: float | int,
+        space: float | int,
+        turns: float | int,
+        x: float | int = 0,
+        y: float | int = 0,
+    ) -> np.ndarray:
+
+    """
+    Gets the outer edge path of a square spiral.
+
+    The path starts at (x, y), runs clockwise and inwards, and the trace lies on
+    the right side of it.
+
+    Args:
+        length: External length of the square inductor.
+        width: Width of the metal traces forming the inductor.
+        space: Space between base metal traces.
+        turns: Number of turns in the spiral inductor.
+        x: X coordinate of the inductor's starting position.
+        y: Y coordinate of the inductor's starting position.
+
+    Returns:
+        Array of shape (segments + 1, 2) with the corners of the path.
+    """
+
+    lengths = square_spiral_lengths(length=length, width=width, space=space, turns=turns)
+    directions = SQUARE_DIRECTIONS[np.arange(len(lengths)) % 4]
+
+    path = np.empty((len(lengths) + 1, 2))
+    path[0] = (x, y)
+    np.cumsum(directions * lengths[:, None], axis=0, out=path[1:])
+    path[1:] += path[0]
+
+    return path
+
+def square_spiral_segments(
+        length: float | int,
+        width: float | int,
+        space: float | int,
+        turns: float | int,
+        x: float | int = 0,
+        y: float | int = 0,
+    ) -> np.ndarray:
+
+    """
+    Gets the rectangle of every segment of a square spiral.
+
+    Args:
+        length: External length of the square inductor.
+        width: Width of the metal traces forming the inductor.
+        space: Space between base metal traces.
+        turns: Number of turns in the spiral inductor.
+        x: X coordinate of the inductor's starting position.
+        y: Y coordinate of the inductor's starting position.
+
+    Returns:
+        Array of shape (segments, 4, 2) with the lower left, lower right, upper right
+        and upper left corners of each segment.
+    """
+
+    path = square_spiral_path(length=length, width=width, space=space, turns=turns, x=x, y=y)
+
+    return square_path_segments(path=path, width=width)
+
+def square_path_segments(path: np.ndarray, width: float | int) -> np.ndarray:
+
+    """
+    Gets the rectangle of every segment of a square spiral path.
+
+    Args:
+        path: Outer edge path of a square spiral, as returned by square_spiral_path.
+        width: Width of the metal traces forming the inductor.
+
+    Returns:
+        Array of shape (segments, 4, 2) with the lower left, lower right, upper right
+        and upper left corners of each segment.
+    """
+
+    sides = np.arange(len(path) - 1) % 4
+
+    low = np.minimum(path[:-1], path[1:]) + width * SQUARE_LOW_OFFSETS[sides]
+    high = np.maximum(path[:-1], path[1:]) + width * SQUARE_HIGH_OFFSETS[sides]
+
+    return np.stack(
+        (
+            low,
+            np.stack((high[:, 0], low[:, 1]), axis=-1),
+            high,
+            np.stack((low[:, 0], high[:, 1]), axis=-1),
+        ),
+        axis=1,
+    )
+
+def offset_path(path: np.ndarray, distance: float | int) -> np.ndarray:
+
+    """
+    Offsets a path to its right side, keeping sharp (mitered) corners.
+
+    Args:
+        path: Array of shape (points, 2).
+        distance: Offset distance. Negative distances offset to the left side.
+
+    Returns:
+        Array of shape (points, 2) with the offset path.
+    """
+
+    directions = np.diff(path, axis=0)
+    directions /= np.linalg.norm(directions, axis=1)[:, None]
+    normals = np.stack((directions[:, 1], -directions[:, 0]), axis=-1)
+
+    # EACH CORNER MOVES ALONG THE BISECTOR OF ITS TWO NORMALS, FAR ENOUGH TO KEEP BOTH EDGES AT DISTANCE
+    offsets = np.empty_like(path)
+    offsets[0] = normals[0]
+    offsets[-1] = normals[-1]
+    offsets[1:-1] = (normals[:-1] + normals[1:]) / (1 + np.sum(normals[:-1] * normals[1:], axis=1))[:, None]
+
+    return path + distance * offsets
+
+def trace_outline(path: np.ndarray, width: float | int) -> np.ndarray:
+
+    """
+    Gets the outline of a trace as a single non-overlapping polygon.
+
+    Args:
+        path: Outer edge path of the trace, with the trace on its right side.
+        width: Width of the trace.
+
+    Returns:
+        Array of shape (2 * points, 2) with the polygon vertices.
+    """
+
+    return np.concatenate((path, offset_path(path=path, distance=width)[::-1]))
+
+def polygon_spiral_path(
+        length: float | int,
+        width: float | int,
+        space: float | int,
+        turns: float | int,
+        sides: int,
+        x: float | int = 0,
+        y: float | int = 0,
+        continuous: bool = False,
+    ) -> np.ndarray:
+
+    """
+    Gets the outer edge path of a regular polygon spiral.
+
+    Every segment lies on a side of a regular polygon whose apothem shrinks by one
+    pitch (space + width) per turn, and each corner is the intersection of two
+    consecutive sides. As for the square spiral, the path starts at (x, y), runs
+    clockwise and inwards from a vertical side, and the trace lies on the right
+    side of it. With four sides it is the square spiral path.
+
+    By default the whole pitch is taken at the first side of each turn. Spirals with
+    many sides per turn must be continuous instead, shrinking by a fraction of the
+    pitch at every side, since nearly parallel sides one pitch apart meet far away.
+
+    Args:
+        length: External length of the inductor, twice the outer apothem.
+        width: Width of the metal traces forming the inductor.
+        space: Space between base metal traces.
+        turns: Number of turns in the spiral inductor.
+        sides: Number of sides, and segments, per turn.
+        x: X coordinate of the lower left corner of the inductor's bounding square.
+        y: Y coordinate of the lower left corner of the inductor's bounding square.
+        continuous: Whether the apothem shrinks at every side instead of once per turn.
+
+    Returns:
+        Array of shape (segments + 1, 2) with the corners of the path.
+
+    Raises:
+        ValueError: If there are less than 3 sides per turn or if the turns do not fit
+            in the length, leaving inner sides shorter than the trace corners.
+    """
+
+    if sides < 3:
+        raise ValueError(f"A polygon spiral needs at least 3 sides per turn, got {sides}")
+
+    segments = round(turns * sides)
+
+    # LINE OF EVERY SEGMENT, PLUS THE LINES CUTTING THE FIRST AND THE LAST ONES
+    index = np.arange(-1, segments + 1)
+    angles = np.pi - 2 * np.pi * (index % sides) / sides
+    normals = np.stack((np.cos(angles), np.sin(angles)), axis=-1)
+    shrinks = np.maximum(index, 0) / sides if continuous else np.maximum(index, 0) // sides
+    distances = length / 2 - (space + width) * shrinks
+
+    # INTERSECTING EACH LINE WITH THE NEXT ONE
+    n1, n2 = normals[:-1], normals[1:]
+    d1, d2 = distances[:-1], distances[1:]
+    determinants = n1[:, 0] * n2[:, 1] - n1[:, 1] * n2[:, 0]
+
+    path = np.stack(
+        (
+            (d1 * n2[:, 1] - d2 * n1[:, 1]) / determinants,
+            (n1[:, 0] * d2 - n2[:, 0] * d1) / determinants,
+        ),
+        axis=-1,
+    )
+
+    # EVERY SEGMENT MUST KEEP ITS DIRECTION ON THE INNER EDGE OF THE TRACE
+    inner_edge = offset_path(path=path, distance=width)
+    if np.any(np.sum(np.diff(path, axis=0) * np.diff(inner_edge, axis=0), axis=1) <= 0):
+        raise ValueError(f"{turns:g} turns of width {width:g} and space {space:g} do not fit in a length of {length:g}")
+
+    return path + (x + length / 2, y + length / 2)
+
+def path_quads(path: np.ndarray, width: float | int) -> np.ndarray:
+
+    """
+    Gets the quadrilateral of every segment of a trace, tiling it without overlaps.
+
+    Args:
+        path: Outer edge path of the trace, with the trace on its right side.
+        width: Width of the trace.
+
+    Returns:
+        Array of shape (segments, 4, 2) with the corners of each quadrilateral.
+    """
+
+    inner_edge = offset_path(path=path, distance=width)
+
+    return np.stack((path[:-1], path[1:], inner_edge[1:], inner_edge[:-1]), axis=1)
+
+def polygon_spiral_exit(
+        path: np.ndarray,
+        length: float | int,
+        width: float | int,
+        space: float | int,
+        x: float | int = 0,
+        y: float | int = 0,
+    ) -> tuple[tuple[float, float], tuple[float, float, float, float], bool]:
+
+    """
+    Gets the via pad and the exit trace of a polygon spiral.
+
+    The pad is a trace-wide square centered on the end of the trace, and the exit runs
+    from it along the axis closest to the outward direction, one pitch past the outer
+    edge of the inductor.
+
+    Args:
+        path: Outer edge path of the spiral, as returned by polygon_spiral_path.
+        length: External length of the inductor.
+        width: Width of the metal traces forming the inductor.
+        space: Space between base metal traces.
+        x: X coordinate of the lower left corner of the inductor's bounding square.
+        y: Y coordinate of the lower left corner of the inductor's bounding square.
+
+    Returns:
+        Lower left corner of the pad, exit rectangle as (x, y, width, height) and whether
+        the end of the trace is slanted, only covering part of the pad.
+    """
+
+    l = length
+    w = width
+    p = space + width
+
+    direction = (path[-1] - path[-2]) / np.hypot(*(path[-1] - path[-2]))
+    right = (direction[1], -direction[0])
+
+    pad_x = float(path[-1][0] + (w / 2) * (right[0] - direction[0]) - w / 2)
+    pad_y = float(path[-1][1] + (w / 2) * (right[1] - direction[1]) - w / 2)
+
+    slanted = bool(min(abs(direction[0]), abs(direction[1])) > 1e-9)
+
+    outward = (-right[0], -right[1])
+    if abs(outward[0]) >= abs(outward[1]):
+        if outward[0] > 0:
+            exit_rectangle = (pad_x, pad_y, x + l + p - pad_x, w)
+        else:
+            exit_rectangle = (x - p, pad_y, pad_x + w - x + p, w)
+    else:
+        if outward[1] > 0:
+            exit_rectangle = (pad_x, pad_y, w, y + l + p - pad_y)
+        else:
+            exit_rectangle = (pad_x, y - p, w, pad_y + w - y + p)
+
+    return (pad_x, pad_y), exit_rectangle, slanted
+
+def symmetric_half_rings(
+        length: float | int,
+        width: float | int,
+        space: float | int,
+        turns: int,
+        gap: float | int,
+        x: float | int = 0,
+        y: float | int = 0,
+    ) -> tuple[np.ndarray, np.ndarray]:
+
+    """
+    Gets the outer edge paths of the rings of a symmetric square spiral.
+
+    Each ring is split into a left and a right half. Adjacent rings are joined by
+    crossovers, between rings 0 and 1 at the top, 1 and 2 at the bottom and so on,
+    and the outer ring opens at the bottom for the ports. Every side with a crossover
+    or the ports has a gap in the middle, while the remaining side of the innermost
+    ring is closed, which makes its middle the center tap.
+
+    Args:
+        length: External length of the inductor.
+        width: Width of the metal traces forming the inductor.
+        space: Space between base metal traces.
+        turns: Number of rings.
+        gap: Width of the gaps in the rings.
+        x: X coordinate of the lower left corner of the inductor.
+        y: Y coordinate of the lower left corner of the inductor.
+
+    Returns:
+        Left and right half paths, both arrays of shape (turns, 4, 2). The traces lie on
+        the right side of the paths.
+    """
+
+    ring = np.arange(turns)
+    pitch = space + width
+
+    left = x + ring * pitch
+    right = x + length - ring * pitch
+    bottom = y + ring * pitch
+    top = y + length - ring * pitch
+    middle = x + length / 2
+
+    # EVERY SIDE IS OPEN BUT THE ONE OF THE INNERMOST RING WITHOUT A CROSSOVER
+    innermost = ring == turns - 1
+    bottom_gap = np.where(innermost & (ring % 2 == 1), 0, gap / 2)
+    top_gap = np.where(innermost & (ring % 2 == 0), 0, gap / 2)
+
+    left_halves = np.stack(
+        (
+            np.stack((middle - bottom_gap, bottom), axis=-1),
+            np.stack((left, bottom), axis=-1),
+            np.stack((left, top), axis=-1),
+            np.stack((middle - top_gap, top), axis=-1),
+        ),
+        axis=1,
+    )
+
+    right_halves = np.stack(
+        (
+            np.stack((middle + top_gap, top), axis=-1),
+            np.stack((right, top), axis=-1),
+            np.stack((right, bottom), axis=-1),
+            np.stack((middle + bottom_gap, bottom), axis=-1),
+        ),
+        axis=1,
+    )
+
+    return left_halves, right_halves
@@ -0,0 +1,165 @@
+import numpy as np
+import geometry
+
+# µ0 / 4π IN nH/µm
+MU_0_4PI = 1e-4
+
+def geometric_mean_distance(distance: np.ndarray, width: float | int) -> np.ndarray:
+
+    """
+    Gets the geometric mean distance between two parallel traces of the same width.
+
+    Args:
+        distance: Center to center distances in µm.
+        width: Width of the traces in µm.
+    """
+
+    ratio = np.square(width / distance)
+
+    return distance * np.exp(
+        - ratio / 12
+        - ratio ** 2 / 60
+        - ratio ** 3 / 168
+        - ratio ** 4 / 360
+        - ratio ** 5 / 660
+    )
+
+def self_inductances(lengths: np.ndarray, width: float | int, thickness: float | int) -> np.ndarray:
+
+    """
+    Gets the self inductance of rectangular bars.
+
+    L = 2 l (ln(2 l / (w + t)) + 0.50049 + (w + t) / (3 l)) µ0 / 4π
+
+    Args:
+        lengths: Lengths of the bars in µm.
+        width: Width of the bars in µm.
+        thickness: Thickness of the bars in µm.
+
+    Returns:
+        Self inductances in nH.
+    """
+
+    lengths = np.asarray(lengths, dtype=float)
+    perimeter = width + thickness
+
+    return 2 * MU_0_4PI * lengths * (np.log(2 * lengths / perimeter) + 0.50049 + perimeter / (3 * lengths))
+
+def parallel_mutual_inductances(
+        first: np.ndarray,
+        second: np.ndarray,
+        distance: np.ndarray,
+    ) -> np.ndarray:
+
+    """
+    Gets the mutual inductance between parallel filaments with the same direction.
+
+    The Neumann integral over two parallel filaments, with axial spans [a1, a2] and
+    [b1, b2] at a distance d, is F(a2 - b1) - F(a2 - b2) - F(a1 - b1) + F(a1 - b2),
+    with F(u) = u asinh(u / d) - sqrt(u² + d²).
+
+    Args:
+        first: Array of shape (..., 2) with the axial spans of the first filaments in µm.
+        second: Array of shape (..., 2) with the axial spans of the second filaments in µm.
+        distance: Distances between the filaments in µm.
+
+    Returns:
+        Mutual inductances in nH.
+    """
+
+    def primitive(u):
+        return u * np.arcsinh(u / distance) - np.sqrt(np.square(u) + np.square(distance))
+
+    return MU_0_4PI * (
+        primitive(first[..., 1] - second[..., 0])
+        - primitive(first[..., 1] - second[..., 1])
+        - primitive(first[..., 0] - second[..., 0])
+        + primitive(first[..., 0] - second[..., 1])
+    )
+
+def partial_inductances(path: np.ndarray, width: float | int, thickness: float | int) -> dict[str, np.ndarray]:
+
+    """
+    Gets the partial inductances of a Manhattan trace with the Greenhouse method.
+
+    Perpendicular segments have no mutual inductance, so the segments are grouped by
+    axis. Within an axis the mutual matrix is symmetric, and each pair is computed
+    once, from the upper triangle. Segments running in opposite directions couple
+    negatively.
+
+    The four sides of a spiral are not mirror images of each other, since every
+    quarter turn is one pitch shorter than the previous one, so no two pairs share
+    their relative geometry and no pair can be taken from another.
+
+    Args:
+        path: Array of shape (points, 2) with the center line of the trace in µm. Every
+            segment must be horizontal or vertical.
+        width: Width of the trace in µm.
+        thickness: Thickness of the trace in µm.
+
+    Returns:
+        Dictionary with the self inductance of each segment ("self"), the signed mutual
+        inductance matrix ("mutual"), the inductance of each segment including its share
+        of the mutual terms ("segment") and the total inductance ("total"), all in nH.
+    """
+
+    starts, ends = path[:-1], path[1:]
+    vectors = ends - starts
+    lengths = np.abs(vectors).sum(axis=1)
+
+    mutual = np.zeros((len(lengths), len(lengths)))
+
+    for axis in (0, 1):
+        # SEGMENTS ALONG THIS AXIS, WITH THEIR SPANS, DIRECTIONS AND PERPENDICULAR POSITIONS
+        members = np.flatnonzero(np.abs(vectors[:, axis]) > 0)
+        if len(members) < 2:
+            continue
+
+        spans = np.sort(np.stack((starts[members, axis], ends[members, axis]), axis=-1), axis=1)
+        directions = np.sign(vectors[members, axis])
+        positions = starts[members, 1 - axis]
+
+        j, k = np.triu_indices(len(members), k=1)
+        distance = geometric_mean_distance(np.abs(positions[j] - positions[k]), width)
+
+        values = directions[j] * directions[k] * parallel_mutual_inductances(spans[j], spans[k], distance)
+
+        mutual[members[j], members[k]] = values
+        mutual[members[k], members[j]] = values
+
+    self_inductance = self_inductances(lengths, width, thickness)
+    segment = self_inductance + mutual.sum(axis=1)
+
+    return {
+        "self": self_inductance,
+        "mutual": mutual,
+        "segment": segment,
+        "total": segment.sum(),
+    }
+
+def square_spiral_inductance(
+        length: float | int,
+        width: float | int,
+        space: float | int,
+        turns: float | int,
+        thickness: float | int,
+    ) -> dict[str, np.ndarray]:
+
+    """
+    Gets the partial inductances of a square spiral with the Greenhouse method.
+
+    Args:
+        length: External length of the square inductor in µm.
+        width: Width of the metal traces forming the inductor in µm.
+        space: Space between base metal traces in µm.
+        turns: Number of turns in the spiral inductor.
+        thickness: Thickness of the base metal in µm.
+
+    Returns:
+        Partial inductances by segment and the total inductance, as returned by partial_inductances.
+    """
+
+    outer_edge = geometry.square_spiral_path(length=length, width=width, space=space, turns=turns)
+    center_line = geometry.offset_path(path=outer_edge, distance=width / 2)
+
+    return partial_inductances(path=center_line, width=width, thickness=thickness)
@@ -1,7 +1,22 @@
 import cli
+import copy
 import os
-import yaml
+import serialization
 import converter
+import draw_cache
+import explorer
+import greenhouse
+import inductance
+import numpy as np
+import optimizer
+import peec
+import pi_model
+import project_store
+import quality
+import resistance
+import substrate
+import surrogate
+import sweep
 from spiral import *
 
 class InduCalcCLI(cli.CLI):
@@ -9,6 +24,13 @@ class InduCalcCLI(cli.CLI):
     def __init__(self, helper=True, title="Cli"):
         super().__init__(helper, title)
 
+        # PARSED PROJECTS BY RESOLVED PATH, WITH THE (MTIME, SIZE) OF THE FILE THEY WERE READ FROM
+        # AND, FOR .indc FILES, THE DIGEST OF ITS CONTENT
+        self.project_cache: dict[str, tuple[tuple[int, int], dict[str, dict[str, dict]], str | None]] = dict()
+
+        # SQLITE AND JOURNALED PROJECTS BY RESOLVED PATH, WITH THE ROWS THEY LAST READ OR WROTE
+        self.project_stores: dict[str, project_store.ProjectStore | project_store.ProjectJournal] = dict()
+
         self.add_commands(
             cli.CliCommand(
                 "project",
@@ -18,6 +40,27 @@ class InduCalcCLI(cli.CLI):
                         "delete",
                         event=self.delete_project,
                     ),
+                    cli.CliCommand(
+                        "export",
+                        arguments=[cli.CliArgument("output-file", help_message="project file (.indc)", type_=str)],
+                        event=self.export_project,
+                        help_message="write a project into an .indc file",
+                    ),
+                    cli.CliCommand(
+                        "import",
+                        arguments=[cli.CliArgument("input-file", help_message="project file (.indc)", type_=str)],
+                        event=self.import_project,
+                        help_message="create a project from an .indc file",
+                        options=[
+                            cli.CliOption("backend", allowed_values=[["yaml", "sqlite"]], help_message="project storage (default: yaml)", required=False, type_=str),
+                        ],
+                    ),
+                    cli.CliCommand(
+                        "journal",
+                        event=self.change_journal_state,
+                        help_message="turn on/off the append-only journal of an .indc project",
+                        options=[cli.CliOption("on", type_=bool, required=False), cli.CliOption("off", type_=bool, required=False)],
+                    ),
                     cli.CliCommand(
                         "list",
                         allowed_arguments=[],
@@ -26,6 +69,9 @@ class InduCalcCLI(cli.CLI):
                     cli.CliCommand(
                         "new",
                         event=self.create_new_project,
+                        options=[
+                            cli.CliOption("backend", allowed_values=[["yaml", "sqlite"]], help_message="project storage (default: yaml)", required=False, type_=str),
+                        ],
                     ),
                     cli.CliCommand(
                         "rename",
@@ -77,6 +123,9 @@ class InduCalcCLI(cli.CLI):
                             cli.CliOption("techfile-name", type_=str),
                             cli.CliOption("x", type_=float),
                             cli.CliOption("y", type_=float),
+                            cli.CliOption("shape", allowed_values=[["square", "octagonal", "circular", "symmetric"]], help_message="spiral shape (default: square)", required=False, type_=str),
+                            cli.CliOption("points-per-turn", help_message="vertices per turn of circular spirals (default: 64)", required=False, type_=int),
+                            cli.CliOption("tap-metal", help_message="center tap metal of symmetric spirals", required=False, type_=str),
                         ],
                     ),
                     cli.CliCommand(
@@ -93,6 +142,9 @@ class InduCalcCLI(cli.CLI):
                             cli.CliOption("techfile-name", required=False, type_=str),
                             cli.CliOption("x", required=False, type_=float),
                             cli.CliOption("y", required=False, type_=float),
+                            cli.CliOption("shape", allowed_values=[["square", "octagonal", "circular", "symmetric"]], help_message="spiral shape", required=False, type_=str),
+                            cli.CliOption("points-per-turn", help_message="vertices per turn of circular spirals", required=False, type_=int),
+                            cli.CliOption("tap-metal", help_message="center tap metal of symmetric spirals", required=False, type_=str),
                         ],
                     ),
                     cli.CliCommand(
@@ -112,6 +164,159 @@ class InduCalcCLI(cli.CLI):
                         ],
                         confirmation=True,
                         event=self.draw_inductor,
+                        options=[
+                            cli.CliOption("no-cache", help_message="redraw even if an identical drawing is cached", type_=bool),
+                            cli.CliOption("link", help_message="hard-link cached drawings instead of copying them", type_=bool),
+                            cli.CliOption("backend", allowed_values=[["native", "gdsfactory"]], help_message="gds writer", required=False, type_=str),
+                            cli.CliOption("trace", allowed_values=[["rectangles", "polygon", "path"]], help_message="base metal trace drawing", required=False, type_=str),
+                        ],
+                    ),
+                    cli.CliCommand(
+                        "estimate",
+                        event=self.estimate_inductance,
+                        help_message="estimate the inductance with closed-form expressions",
+                    ),
+                    cli.CliCommand(
+                        "pi-model",
+                        arguments=[
+                            cli.CliArgument("output-file", type_=str)
+                        ],
+                        confirmation=True,
+                        event=self.extract_pi_model,
+                        help_message="extract the π-model over a frequency grid into a csv table",
+                        options=[
+                            cli.CliOption("start", help_message="first frequency (GHz)", required=False, type_=float),
+                            cli.CliOption("stop", help_message="last frequency (GHz)", required=False, type_=float),
+                            cli.CliOption("points", help_message="number of frequencies", required=False, type_=int),
+                        ],
+                    ),
+                    cli.CliCommand(
+                        "eddy",
+                        event=self.compute_eddy_resistance,
+                        help_message="compute the resistance added by substrate eddy currents on the techfile chip fft grid",
+                        options=[
+                            cli.CliOption("start", help_message="first frequency (GHz)", required=False, type_=float),
+                            cli.CliOption("stop", help_message="last frequency (GHz)", required=False, type_=float),
+                            cli.CliOption("points", help_message="number of frequencies", required=False, type_=int),
+                        ],
+                    ),
+                    cli.CliCommand(
+                        "peec",
+                        event=self.solve_peec,
+                        help_message="solve the resistance and inductance of a square spiral with filaments, including current crowding",
+                        options=[
+                            cli.CliOption("start", help_message="first frequency (GHz)", required=False, type_=float),
+                            cli.CliOption("stop", help_message="last frequency (GHz)", required=False, type_=float),
+                            cli.CliOption("points", help_message="number of frequencies", required=False, type_=int),
+                            cli.CliOption("width-filaments", help_message="filaments across the trace width", required=False, type_=int),
+                            cli.CliOption("thickness-filaments", help_message="filaments across the metal thickness", required=False, type_=int),
+                            cli.CliOption("workers", help_message="number of processes", required=False, type_=int),
+                        ],
+                    ),
+                    cli.CliCommand(
+                        "quality",
+                        allowed_arguments=["project-name"],
+                        event=self.rank_quality_factors,
+                        help_message="tabulate the quality factors and self-resonant frequencies of a project, best first",
+                        options=[
+                            cli.CliOption("inductors", help_message="comma separated inductor names, every inductor by default", required=False, type_=str),
+                            cli.CliOption("frequency", help_message="frequency to rank the quality factors at (GHz), the peak by default", required=False, type_=float),
+                            cli.CliOption("start", help_message="first frequency (GHz)", required=False, type_=float),
+                            cli.CliOption("stop", help_message="last frequency (GHz)", required=False, type_=float),
+                            cli.CliOption("points", help_message="number of frequencies", required=False, type_=int),
+                        ],
+                    ),
+                    cli.CliCommand(
+                        "resistance",
+                        allowed_arguments=["project-name"],
+                        event=self.extract_resistances,
+                        help_message="extract the dc resistance of every inductor of a project",
+                    ),
+                    cli.CliCommand(
+                        "optimize",
+                        confirmation=True,
+                        event=self.optimize_inductor,
+                        help_message="add the square inductor reaching a target inductance with the highest quality factor, using inductor-name as name",
+                        options=[
+                            cli.CliOption("target", help_message="target inductance (nH)", type_=float),
+                            cli.CliOption("frequency", help_message="frequency of the quality factor (GHz)", type_=float),
+                            cli.CliOption("max-length", help_message="maximum external length (µm)", type_=float),
+                            cli.CliOption("base-metals", help_message="comma separated metals allowed for the spiral", type_=str),
+                            cli.CliOption("exit-metal", type_=str),
+                            cli.CliOption("techfile-name", type_=str),
+                            cli.CliOption("width", help_message="value, list (a,b,c) or range (start:stop:step), default 2:20:1", required=False, type_=str),
+                            cli.CliOption("space", help_message="value, list (a,b,c) or range (start:stop:step), default 2", required=False, type_=str),
+                            cli.CliOption("turns", help_message="value, list (a,b,c) or range (start:stop:step), default 1.5:8:0.25", required=False, type_=str),
+                            cli.CliOption("tolerance", help_message="maximum inductance error (%), default 2", required=False, type_=float),
+                        ],
+                    ),
+                    cli.CliCommand(
+                        "draw-all",
+                        allowed_arguments=["project-name", "output-file"],
+                        arguments=[
+                            cli.CliArgument("output-file", type_=str)
+                        ],
+                        confirmation=True,
+                        event=self.draw_all_inductors,
+                        help_message="draw every inductor of a project into one gds library",
+                        options=[
+                            cli.CliOption("spacing", help_message="space between inductors (µm)", required=False, type_=float),
+                            cli.CliOption("backend", allowed_values=[["native", "gdsfactory"]], help_message="gds writer", required=False, type_=str),
+                            cli.CliOption("trace", allowed_values=[["rectangles", "polygon", "path"]], help_message="base metal trace drawing", required=False, type_=str),
+                        ],
+                    ),
+                    cli.CliCommand(
+                        "sweep",
+                        arguments=[
+                            cli.CliArgument("output", help_message="output directory, or output file when merged", type_=str)
+                        ],
+                        confirmation=True,
+                        event=self.sweep_inductors,
+                        help_message="draw every combination of the given parameters, using inductor-name as prefix",
+                        options=[
+                            cli.CliOption("base-metal", type_=str),
+                            cli.CliOption("exit-metal", type_=str),
+                            cli.CliOption("length", help_message="value, list (a,b,c) or range (start:stop:step)", type_=str),
+                            cli.CliOption("width", help_message="value, list (a,b,c) or range (start:stop:step)", type_=str),
+                            cli.CliOption("space", help_message="value, list (a,b,c) or range (start:stop:step)", type_=str),
+                            cli.CliOption("turns", help_message="value, list (a,b,c) or range (start:stop:step)", type_=str),
+                            cli.CliOption("techfile-name", type_=str),
+                            cli.CliOption("merged", help_message="write a single gds library", type_=bool),
+                            cli.CliOption("workers", help_message="number of processes", required=False, type_=int),
+                            cli.CliOption("spacing", help_message="space between inductors of a merged library (µm)", required=False, type_=float),
+                            cli.CliOption("backend", allowed_values=[["native", "gdsfactory"]], help_message="gds writer", required=False, type_=str),
+                            cli.CliOption("trace", allowed_values=[["rectangles", "polygon", "path"]], help_message="base metal trace drawing", required=False, type_=str),
+                        ],
+                    ),
+                    cli.CliCommand(
+                        "explore",
+                        arguments=[
+                            cli.CliArgument("output-file", help_message="pareto front file (.npz)", type_=str)
+                        ],
+                        confirmation=True,
+                        event=self.explore_inductors,
+                        help_message="keep the pareto front of inductance, quality factor and area of every combination of the given parameters",
+                        options=[
+                            cli.CliOption("base-metal", type_=str),
+                            cli.CliOption("exit-metal", type_=str),
+                            cli.CliOption("length", help_message="value, list (a,b,c) or range (start:stop:step)", type_=str),
+                            cli.CliOption("width", help_message="value, list (a,b,c) or range (start:stop:step)", type_=str),
+                            cli.CliOption("space", help_message="value, list (a,b,c) or range (start:stop:step)", type_=str),
+                            cli.CliOption("turns", help_message="value, list (a,b,c) or range (start:stop:step)", type_=str),
+                            cli.CliOption("techfile-name", type_=str),
+                            cli.CliOption("frequency", help_message="frequency of the quality factor (GHz)", type_=float),
+                            cli.CliOption("raw", help_message="directory receiving every result as .npy columns", required=False, type_=str),
+                            cli.CliOption("chunk-size", help_message="number of geometries evaluated at once", required=False, type_=int),
+                        ],
+                    ),
+                    cli.CliCommand(
+                        "import-front",
+                        arguments=[
+                            cli.CliArgument("input-file", help_message="pareto front file (.npz)", type_=str)
+                        ],
+                        confirmation=True,
+                        event=self.import_front,
+                        help_message="add the inductors of a pareto front, using inductor-name as prefix",
                     ),
                 ],
             ),
@@ -239,7 +444,12 @@ class InduCalcCLI(cli.CLI):
                                 event=self.edit_chip,
                                 help_message="edit chip specs",
                                 options=[
-                                    cli.CliOption("grid", required=False, type_=float)
+                                    cli.CliOption("grid", required=False, type_=float),
+                                    cli.CliOption("chipx", help_message="chip width (µm)", required=False, type_=float),
+                                    cli.CliOption("chipy", help_message="chip height (µm)", required=False, type_=float),
+                                    cli.CliOption("fftx", help_message="substrate fft grid points along x", required=False, type_=int),
+                                    cli.CliOption("ffty", help_message="substrate fft grid points along y", required=False, type_=int),
+                                    cli.CliOption("eddy", help_message="substrate eddy currents switch (0 or 1)", required=False, type_=int),
                                 ],
                             ),
                             cli.CliCommand(
@@ -362,69 +572,282 @@ class InduCalcCLI(cli.CLI):
                                 ],
                             )
                         ]
+                    ),
+                    cli.CliCommand(
+                        "surrogate",
+                        event=self.report_surrogate,
+                        help_message="report the errors of the surrogate model of a techfile",
+                        subcommands=[
+                            cli.CliCommand(
+                                "fit",
+                                confirmation=True,
+                                event=self.fit_surrogate,
+                                help_message="fit the inductance and quality factor surrogate model of a techfile from solver samples",
+                                options=[
+                                    cli.CliOption("base-metal", type_=str),
+                                    cli.CliOption("exit-metal", type_=str),
+                                    cli.CliOption("frequency", help_message="frequency of the quality factor (GHz)", type_=float),
+                                    cli.CliOption("length", help_message="bounds, as a list (min,max) or range (start:stop:step)", type_=str),
+                                    cli.CliOption("width", help_message="bounds, as a list (min,max) or range (start:stop:step)", type_=str),
+                                    cli.CliOption("space", help_message="bounds, as a list (min,max) or range (start:stop:step)", type_=str),
+                                    cli.CliOption("turns", help_message="bounds, as a list (min,max) or range (start:stop:step)", type_=str),
+                                    cli.CliOption("samples", help_message="number of solved geometries (default 1000)", required=False, type_=int),
+                                    cli.CliOption("degree", help_message="degree of the polynomials (default 4)", required=False, type_=int),
+                                    cli.CliOption("held-out", help_message="fraction of the samples kept for the error report (default 0.2)", required=False, type_=float),
+                                    cli.CliOption("seed", required=False, type_=int),
+                                ],
+                            ),
+                            cli.CliCommand(
+                                "query",
+                                event=self.query_surrogate,
+                                help_message="get the inductance and quality factor of a square spiral from the surrogate model",
+                                options=[
+                                    cli.CliOption("length", help_message="external length (µm)", type_=float),
+                                    cli.CliOption("width", help_message="width (µm)", type_=float),
+                                    cli.CliOption("space", help_message="space (µm)", type_=float),
+                                    cli.CliOption("turns", type_=float),
+                                ],
+                            ),
+                        ]
                     )
                 ]
             )
         )
 
+    def project_path(self, project_name: str) -> str:
+
+        """
+        Gets the file of a project: its SQLite database if it exists, otherwise its .indc file.
+        """
+
+        database_path = converter.process_user_path(project_name, project_store.EXTENSION)
+        if os.path.exists(database_path):
+            return database_path
+
+        return converter.process_user_path(project_name, ".indc")
+
+    def open_project_store(self, project_path: str) -> project_store.ProjectStore | project_store.ProjectJournal | None:
+
+        """
+        Gets the store of a project kept in SQLite or in journal mode, by resolved path.
+        Plain .indc projects have none.
+        """
+
+        if project_path.endswith(project_store.EXTENSION):
+            store_type = project_store.ProjectStore
+        elif os.path.exists(project_store.journal_path(project_path)):
+            store_type = project_store.ProjectJournal
+        else:
+            return None
+
+        if not isinstance(self.project_stores.get(project_path), store_type):
+            self.project_stores[project_path] = store_type(project_path)
+
+        return self.project_stores[project_path]
+
+    def project_signature(self, project_path: str) -> tuple[int, ...]:
+
+        """
+        Gets the signature of a project file, followed by the one of its journal if it has one.
+        """
+
+        signature = self.file_signature(project_path)
+        if os.path.exists(project_store.journal_path(project_path)):
+            signature += self.file_signature(project_store.journal_path(project_path))
+
+        return signature
+
     def load_project(self, project_name:str) -> cli.CliMessage | dict[str, dict[str, dict]]:
 
-        project_path = converter.process_user_path(project_name, ".indc")
+        project_path = self.project_path(project_name)
 
         if not os.path.exists(project_path):
             return cli.CliMessage(f"Project not found: {project_name}", status="error")
-        
+
+        # UNCHANGED FILES ARE SERVED FROM MEMORY, AS COPIES SO A HANDLER FAILING HALFWAY THROUGH ITS
+        # CHANGES DOES NOT LEAVE THEM IN THE CACHE
+        project_path = os.path.realpath(project_path)
+        signature = self.project_signature(project_path)
+
+        cached = self.project_cache.get(project_path)
+        if cached is not None and cached[0] == signature:
+            return copy.deepcopy(cached[1])
+
         loaded_project: dict[str, dict[str, dict]] = None
-        with open(project_path, "r") as file:
-            loaded_project = yaml.safe_load(file)
+        content_digest: str = None
+        store = self.open_project_store(project_path)
+        if store is not None:
+            try:
+                loaded_project = store.load()
+            except ValueError as error:
+                return cli.CliMessage(str(error), status="error")
+        else:
+            with open(project_path, "r") as file:
+                content = file.read()
+            loaded_project = serialization.load(content)
+            content_digest = serialization.digest(content)
+
+        self.project_cache[project_path] = (signature, loaded_project, content_digest)
         
-        return loaded_project
+        return copy.deepcopy(loaded_project)
     
     def save_project(self, project_data: dict[str, dict[str, dict]], project_name:str):
 
-        project_path = converter.process_user_path(project_name, ".indc")
+        project_path = os.path.realpath(self.project_path(project_name))
+
+        # SQLITE AND JOURNALED PROJECTS ONLY WRITE THE ROWS THAT CHANGED
+        store = self.open_project_store(project_path)
+        if store is not None:
+            store.save(project_data)
+            self.project_cache[project_path] = (self.project_signature(project_path), copy.deepcopy(project_data), None)
+            return
+
+        # .indc FILES ARE REPLACED ATOMICALLY, AND ONLY WHEN THEIR CONTENT CHANGED
+        content = serialization.dump(project_data)
+        content_digest = serialization.digest(content)
+
+        cached = self.project_cache.get(project_path)
+        unchanged = (
+            cached is not None and cached[2] == content_digest
+            and os.path.exists(project_path) and cached[0] == self.file_signature(project_path)
+        )
+
+        if not unchanged:
+            serialization.write_atomic(project_path, content)
+
+        self.project_cache[project_path] = (self.file_signature(project_path), copy.deepcopy(project_data), content_digest)
 
-        with open(project_path, "w") as file:
-            yaml.dump(project_data, file, allow_unicode=True, sort_keys=False)
+    @staticmethod
+    def file_signature(file_path: str) -> tuple[int, int]:
+
+        """
+        Gets the modification time in ns and the size of a file, which change whenever it is written.
+        """
+
+        stat = os.stat(file_path)
+
+        return stat.st_mtime_ns, stat.st_size
 
     def create_new_project(self, arguments:dict[str], options:dict[str]):
 
+        if os.path.exists(self.project_path(arguments["project_name"])):
+            return cli.CliMessage(f"Project already exists: {arguments['project_name']}", status="error")
+
+        if options.get("backend", "yaml").lower() == "sqlite":
+            project_store.ProjectStore(converter.process_user_path(arguments["project_name"], project_store.EXTENSION)).create()
+            return
+
         file_path = converter.process_user_path(arguments["project_name"], ".indc")
 
         try:
             with open(file_path, "x") as file:
-                yaml.dump({"inductors": {}, "techfiles": {}}, file, allow_unicode=True, sort_keys=False)
+                serialization.dump({"inductors": {}, "techfiles": {}}, file)
         except:
             return cli.CliMessage(f"Project already exists: {arguments['project_name']}", status="error")
 
+    def import_project(self, arguments: dict[str], options: dict[str]):
+
+        input_file = converter.process_user_path(arguments["input_file"], ".indc")
+        if not os.path.isfile(input_file):
+            return cli.CliMessage(f"File not found: {input_file}", status="error")
+
+        if os.path.exists(self.project_path(arguments["project_name"])):
+            return cli.CliMessage(f"Project already exists: {arguments['project_name']}", status="error")
+
+        with open(input_file, "r") as file:
+            imported_project = serialization.load(file)
+
+        if options.get("backend", "yaml").lower() == "sqlite":
+            store = project_store.ProjectStore(converter.process_user_path(arguments["project_name"], project_store.EXTENSION))
+            store.create()
+            store.save(imported_project)
+        else:
+            with open(converter.process_user_path(arguments["project_name"], ".indc"), "x") as file:
+                serialization.dump(imported_project, file)
+
+        return cli.CliMessage(f"{len(imported_project['inductors'])} inductors and {len(imported_project['techfiles'])} techfiles imported")
+
+    def export_project(self, arguments: dict[str], options: dict[str]):
+
+        loaded_project = self.load_project(project_name=arguments["project_name"])
+        if isinstance(loaded_project, cli.CliMessage): return loaded_project
+
+        output_file = converter.process_user_path(arguments["output_file"], ".indc")
+        if os.path.realpath(output_file) == os.path.realpath(self.project_path(arguments["project_name"])):
+            return cli.CliMessage(f"The project is already stored in: {output_file}", status="error")
+
+        with open(output_file, "w") as file:
+            serialization.dump(loaded_project, file)
+
+    def change_journal_state(self, arguments: dict[str], options: dict[str]):
+
+        project_path = self.project_path(arguments["project_name"])
+        if not os.path.exists(project_path):
+            return cli.CliMessage(f"Project not found: {arguments['project_name']}", status="error")
+
+        if project_path.endswith(project_store.EXTENSION):
+            return cli.CliMessage("SQLite projects are already written row by row", status="warning")
+
+        project_path = os.path.realpath(project_path)
+        journal = self.open_project_store(project_path)
+
+        if "on" in options:
+            state = options["on"]
+        elif "off" in options:
+            state = not options["off"]
+        elif journal is None:
+            return cli.CliMessage("Off")
+        else:
+            return cli.CliMessage(f"On ({os.path.getsize(journal.journal_path)} bytes)")
+
+        if state and journal is None:
+            project_store.ProjectJournal(project_path).create()
+        elif not state and journal is not None:
+            loaded_project = self.load_project(project_name=arguments["project_name"])
+            if isinstance(loaded_project, cli.CliMessage): return loaded_project
+            journal.detach(loaded_project)
+
+        self.project_cache.pop(project_path, None)
+        self.project_stores.pop(project_path, None)
+
     def list_projects(self, *args):
 
-        projects = [project.replace(".indc", "") for project in os.listdir(".") if project[-5:] == ".indc"]
+        projects = [os.path.splitext(project)[0] for project in os.listdir(".") if os.path.splitext(project)[1] in (".indc", project_store.EXTENSION)]
         if projects:
             return cli.CliMessage("\n".join(projects))
         return cli.CliMessage("There are no projects")
         
     def delete_project(self, arguments:dict[str], options:dict[str]):
 
-        file_path = converter.process_user_path(arguments['project_name'], ".indc")
+        file_path = self.project_path(arguments['project_name'])
         if os.path.exists(file_path):
+            self.project_cache.pop(os.path.realpath(file_path), None)
+            self.project_stores.pop(os.path.realpath(file_path), None)
             os.remove(file_path)
+            if os.path.exists(project_store.journal_path(file_path)):
+                os.remove(project_store.journal_path(file_path))
         else:
             return cli.CliMessage(f"Project do not exist: {arguments['project_name']}", status="error")
         
     def rename_project(self, arguments:dict[str], options:dict[str]):
 
-        old_file_path = converter.process_user_path(arguments['project_name'], ".indc")
-        new_file_path = converter.process_user_path(arguments['new_project_name'], ".indc")
+        old_file_path = self.project_path(arguments['project_name'])
+        new_file_path = converter.process_user_path(arguments['new_project_name'], os.path.splitext(old_file_path)[1])
         if not os.path.exists(old_file_path):
             return cli.CliMessage(f"Project not found: {arguments['project_name']}", status="error")
         
-        if os.path.exists(new_file_path):
+        if os.path.exists(self.project_path(arguments['new_project_name'])):
             return cli.CliMessage(f"Project already exists: {new_file_path}", status="error")
         
-        try: os.rename(old_file_path, new_file_path)
+        try:
+            os.rename(old_file_path, new_file_path)
+            if os.path.exists(project_store.journal_path(old_file_path)):
+                os.rename(project_store.journal_path(old_file_path), project_store.journal_path(new_file_path))
         except: return cli.CliMessage("Permission denied", "warning")
 
+        self.project_cache.pop(os.path.realpath(old_file_path), None)
+        self.project_stores.pop(os.path.realpath(old_file_path), None)
+
     def rename_inductor(self, arguments: dict[str], options: dict[str]):
 
         loaded_project = self.load_project(project_name=arguments["project_name"])
@@ -488,20 +911,408 @@ class InduCalcCLI(cli.CLI):
         loaded_project = self.load_project(project_name=arguments["project_name"])
         if isinstance(loaded_project, cli.CliMessage): return loaded_project
 
+        inductor = dict(loaded_project["inductors"][arguments["inductor_name"]])
+        techfile = loaded_project["techfiles"][inductor.pop("techfile_name")]
+
+        backend = options.get("backend", "native").lower()
+        trace = options.get("trace", "rectangles").lower()
+
+        # REUSING IDENTICAL DRAWINGS
+        cache = draw_cache.DrawCache(link=options.get("link", False))
+        use_cache = not options.get("no_cache", False)
+        key = draw_cache.draw_key(arguments["inductor_name"], inductor, techfile, backend=backend, trace=trace)
+
+        if use_cache and cache.fetch(key, arguments["output_file"]):
+            return cli.CliMessage(f"Unchanged inductor, drawing restored from cache: {arguments['output_file']}")
+
+        spiral = Spiral(progress=self.update_progressbar, backend=backend, trace=trace)
+
+        # THE PREVIOUS DRAWING IS ONLY REPLACED ONCE THE NEW ONE IS WRITTEN
+        staging = draw_cache.staging_path(arguments["output_file"])
+        try:
+            spiral.draw(
+                inductor_name=arguments["inductor_name"],
+                output_file=staging,
+                techfile=techfile,
+                **inductor,
+            )
+            os.replace(staging, arguments["output_file"])
+        except ValueError as error:
+            self.progressbar.set(0)
+            return cli.CliMessage(str(error), status="error")
+        finally:
+            if os.path.exists(staging):
+                os.remove(staging)
+
+        if use_cache:
+            cache.store(key, arguments["output_file"])
+
+        self.after(250, lambda: self.progressbar.set(0))
+
+    def estimate_inductance(self, arguments: dict[str], options: dict[str]):
+
+        loaded_project = self.load_project(project_name=arguments["project_name"])
+        if isinstance(loaded_project, cli.CliMessage): return loaded_project
+
         inductor = loaded_project["inductors"][arguments["inductor_name"]]
+
+        try:
+            estimates = inductance.estimate(
+                length=inductor["length"],
+                width=inductor["width"],
+                space=inductor["space"],
+                turns=inductor["turns"],
+                shape=inductor.get("shape", "square"),
+            )
+        except ValueError as error:
+            return cli.CliMessage(str(error), status="error")
+
+        if any(np.isnan(value) for value in estimates.values()):
+            return cli.CliMessage(f"The turns do not fit in the length of inductor: {arguments['inductor_name']}", status="error")
+
+        # PARTIAL INDUCTANCES OF THE DRAWN SEGMENTS
+        if inductor.get("shape", "square").lower() == "square":
+            techfile = loaded_project["techfiles"][inductor["techfile_name"]]
+            base_metal = techfile["metal"][get_metal_index(techfile=techfile, metal_name=inductor["base_metal"])]
+
+            estimates["greenhouse"] = greenhouse.square_spiral_inductance(
+                length=inductor["length"],
+                width=inductor["width"],
+                space=inductor["space"],
+                turns=inductor["turns"],
+                thickness=base_metal["thickness"],
+            )["total"]
+
+        return cli.CliMessage("".join(f"{method.replace('_', ' ')} = {value:.4f} nH\n" for method, value in estimates.items()))
+
+    def extract_pi_model(self, arguments: dict[str], options: dict[str]):
+
+        loaded_project = self.load_project(project_name=arguments["project_name"])
+        if isinstance(loaded_project, cli.CliMessage): return loaded_project
+
+        inductor_name = arguments["inductor_name"]
+        inductor = loaded_project["inductors"][inductor_name]
         techfile = loaded_project["techfiles"][inductor["techfile_name"]]
+        frequencies = np.linspace(options.get("start", 0.1), options.get("stop", 20), options.get("points", 1000)) * 1e9
+
+        try:
+            model = pi_model.extract(
+                inductors={inductor_name: inductor},
+                techfiles=loaded_project["techfiles"],
+                frequencies=frequencies,
+            )[0]
+
+            # SUBSTRATE EDDY CURRENT LOSSES WHEN SWITCHED ON IN THE CHIP SETTINGS
+            if converter.chip_settings(techfile=techfile)["eddy"]:
+                model["rs"] += substrate.eddy_resistance(inductor=inductor, techfile=techfile, frequencies=frequencies)
+        except ValueError as error:
+            return cli.CliMessage(str(error), status="error")
 
-        inductor.pop("techfile_name")
+        if np.isnan(model["rs"]).any():
+            return cli.CliMessage(f"The π-model of inductor {inductor_name} can not be extracted", status="error")
 
-        spiral = Spiral(self)
+        pi_model.write_csv(output_file=converter.process_user_path(arguments["output_file"], ".csv"), model=model)
+
+        return cli.CliMessage(f"π-model of inductor {inductor_name} extracted at {len(frequencies)} frequencies")
+
+    def compute_eddy_resistance(self, arguments: dict[str], options: dict[str]):
+
+        loaded_project = self.load_project(project_name=arguments["project_name"])
+        if isinstance(loaded_project, cli.CliMessage): return loaded_project
+
+        inductor = loaded_project["inductors"][arguments["inductor_name"]]
+        frequencies = np.linspace(options.get("start", 0.1), options.get("stop", 20), options.get("points", 20)) * 1e9
+
+        try:
+            resistances = substrate.eddy_resistance(
+                inductor=inductor,
+                techfile=loaded_project["techfiles"][inductor["techfile_name"]],
+                frequencies=frequencies,
+            )
+        except ValueError as error:
+            return cli.CliMessage(str(error), status="error")
+
+        lines = [f"{'f (GHz)':>10}  {'R eddy (Ω)':>12}"]
+        for frequency, eddy_resistance in zip(frequencies, resistances):
+            lines.append(f"{frequency / 1e9:10.3f}  {eddy_resistance:12.6f}")
+
+        return cli.CliMessage("\n".join(lines))
+
+    def solve_peec(self, arguments: dict[str], options: dict[str]):
+
+        loaded_project = self.load_project(project_name=arguments["project_name"])
+        if isinstance(loaded_project, cli.CliMessage): return loaded_project
+
+        inductor = loaded_project["inductors"][arguments["inductor_name"]]
+        frequencies = np.linspace(options.get("start", 0.1), options.get("stop", 20), options.get("points", 20)) * 1e9
+
+        try:
+            solution = peec.inductor_impedance(
+                inductor=inductor,
+                techfile=loaded_project["techfiles"][inductor["techfile_name"]],
+                frequencies=frequencies,
+                width_filaments=options.get("width_filaments", 4),
+                thickness_filaments=options.get("thickness_filaments", 2),
+                workers=options.get("workers"),
+            )
+        except ValueError as error:
+            return cli.CliMessage(str(error), status="error")
+
+        quality_factors = 2 * np.pi * solution["frequency"] * solution["inductance"] * 1e-9 / solution["resistance"]
+
+        lines = [f"{'f (GHz)':>10}  {'R (Ω)':>10}  {'L (nH)':>10}  {'Q':>10}"]
+        for i in range(len(frequencies)):
+            lines.append(
+                f"{solution['frequency'][i] / 1e9:10.3f}  {solution['resistance'][i]:10.4f}"
+                f"  {solution['inductance'][i]:10.4f}  {quality_factors[i]:10.3f}"
+            )
+
+        return cli.CliMessage("\n".join(lines))
+
+    def rank_quality_factors(self, arguments: dict[str], options: dict[str]):
+
+        loaded_project = self.load_project(project_name=arguments["project_name"])
+        if isinstance(loaded_project, cli.CliMessage): return loaded_project
+
+        inductors = loaded_project["inductors"]
+        if "inductors" in options:
+            names = [name.strip() for name in options["inductors"].split(",")]
+            for name in names:
+                if name not in inductors:
+                    return cli.CliMessage(f"Inductor do not exist: {name}", status="error")
+            inductors = {name: inductors[name] for name in names}
+
+        if not inductors:
+            return cli.CliMessage(f"There are no inductors in project: {arguments['project_name']}", status="error")
+
+        frequencies = np.linspace(options.get("start", 0.1), options.get("stop", 100), options.get("points", 1000)) * 1e9
+
+        try:
+            analysis = quality.analyze(inductors=inductors, techfiles=loaded_project["techfiles"], frequencies=frequencies)
+            if "frequency" in options:
+                ranked_q = quality.analyze(inductors=inductors, techfiles=loaded_project["techfiles"], frequencies=[options["frequency"] * 1e9])["q"][:, 0]
+            else:
+                ranked_q = analysis["peak_q"]
+        except ValueError as error:
+            return cli.CliMessage(str(error), status="error")
+
+        # BEST FIRST, INDUCTORS WITHOUT A MODEL LAST
+        order = np.argsort(np.where(np.isnan(ranked_q), np.inf, -ranked_q), kind="stable")
+
+        columns = {"name": analysis["name"]}
+        if "frequency" in options:
+            columns[f"Q @ {options['frequency']:g} GHz"] = [f"{value:.3f}" for value in ranked_q]
+        columns["peak Q"] = [f"{value:.3f}" for value in analysis["peak_q"]]
+        columns["peak (GHz)"] = [f"{value / 1e9:.3f}" for value in analysis["peak_frequency"]]
+        columns["SRF (GHz)"] = [f"{value / 1e9:.3f}" for value in analysis["self_resonance"]]
+
+        widths = [max(len(header), *(len(value) for value in values)) for header, values in columns.items()]
+
+        # NAMES ALIGNED TO THE LEFT, NUMBERS TO THE RIGHT
+        alignments = ["<"] + [">"] * (len(columns) - 1)
+
+        lines = ["  ".join(f"{header:{alignment}{width}}" for header, alignment, width in zip(columns, alignments, widths))]
+        for i in order:
+            lines.append("  ".join(f"{values[i]:{alignment}{width}}" for values, alignment, width in zip(columns.values(), alignments, widths)))
+
+        return cli.CliMessage("\n".join(lines))
+
+    def extract_resistances(self, arguments: dict[str], options: dict[str]):
+
+        loaded_project = self.load_project(project_name=arguments["project_name"])
+        if isinstance(loaded_project, cli.CliMessage): return loaded_project
+
+        if not loaded_project["inductors"]:
+            return cli.CliMessage(f"There are no inductors in project: {arguments['project_name']}", status="error")
+
+        try:
+            resistances = resistance.dc_resistance(inductors=loaded_project["inductors"], techfiles=loaded_project["techfiles"])
+        except ValueError as error:
+            return cli.CliMessage(str(error), status="error")
+
+        return cli.CliMessage("".join(
+            f"{name} = {total:.4f} Ω (trace {trace:.4f} Ω, exit {exit:.4f} Ω, vias {vias:.4f} Ω)\n"
+            for name, total, trace, exit, vias in zip(
+                resistances["name"],
+                resistances["total"],
+                resistances["trace"],
+                resistances["exit"],
+                resistances["vias"],
+            )
+        ))
+
+    def optimize_inductor(self, arguments: dict[str], options: dict[str]):
+
+        loaded_project = self.load_project(project_name=arguments["project_name"])
+        if isinstance(loaded_project, cli.CliMessage): return loaded_project
+
+        if arguments["inductor_name"] in loaded_project["inductors"]:
+            return cli.CliMessage(f"Inductor already exists: {arguments['inductor_name']}", status="error")
+
+        if not options["techfile_name"] in loaded_project["techfiles"]:
+            return cli.CliMessage(f"Techfile do not exist: {options['techfile_name']}", "error")
+
+        try:
+            result = optimizer.optimize(
+                target=options["target"],
+                frequency=options["frequency"] * 1e9,
+                max_length=options["max_length"],
+                techfile_name=options["techfile_name"],
+                techfiles=loaded_project["techfiles"],
+                base_metals=[metal.strip() for metal in options["base_metals"].split(",")],
+                exit_metal=options["exit_metal"],
+                widths=sweep.parse_values(options.get("width", "2:20:1")),
+                spaces=sweep.parse_values(options.get("space", "2")),
+                turns=sweep.parse_values(options.get("turns", "1.5:8:0.25")),
+                tolerance=options.get("tolerance", 2) / 100,
+            )
+        except ValueError as error:
+            return cli.CliMessage(str(error), status="error")
+
+        loaded_project["inductors"][arguments["inductor_name"]] = result["inductor"]
+        self.save_project(project_data=loaded_project, project_name=arguments["project_name"])
 
-        spiral.draw_square(
-            inductor_name=arguments["inductor_name"],
-            output_file=arguments["output_file"],
-            techfile=techfile,
-            **inductor,
+        inductor = result["inductor"]
+        return cli.CliMessage(
+            f"{arguments['inductor_name']}: {inductor['base_metal']} length = {inductor['length']:g} µm, width = {inductor['width']:g} µm, "
+            f"space = {inductor['space']:g} µm, turns = {inductor['turns']:g}\n"
+            f"L = {result['inductance']:.4f} nH, Q = {result['quality']:.3f} at {options['frequency']:g} GHz "
+            f"({result['estimated']} geometries estimated, {result['ranked']} ranked, {result['refined']} refined)"
         )
 
+    def draw_all_inductors(self, arguments: dict[str], options: dict[str]):
+
+        loaded_project = self.load_project(project_name=arguments["project_name"])
+        if isinstance(loaded_project, cli.CliMessage): return loaded_project
+
+        if not loaded_project["inductors"]:
+            return cli.CliMessage(f"There are no inductors in project: {arguments['project_name']}", status="error")
+
+        inductors = {}
+        for inductor_name, inductor in loaded_project["inductors"].items():
+            inductor = dict(inductor)
+            inductor["techfile"] = loaded_project["techfiles"][inductor.pop("techfile_name")]
+            inductors[inductor_name] = inductor
+
+        spiral = Spiral(
+            progress=self.update_progressbar,
+            backend=options.get("backend", "native").lower(),
+            trace=options.get("trace", "rectangles").lower(),
+        )
+
+        try:
+            spiral.draw_library(
+                inductors=inductors,
+                output_file=arguments["output_file"],
+                library_name=os.path.basename(arguments["project_name"]),
+                spacing=options.get("spacing", 100),
+            )
+        except ValueError as error:
+            self.progressbar.set(0)
+            return cli.CliMessage(str(error), status="error")
+
+        self.after(250, lambda: self.progressbar.set(0))
+
+        return cli.CliMessage(f"{len(inductors)} inductors drawn into: {arguments['output_file']}")
+
+    def sweep_inductors(self, arguments: dict[str], options: dict[str]):
+
+        loaded_project = self.load_project(project_name=arguments["project_name"])
+        if isinstance(loaded_project, cli.CliMessage): return loaded_project
+
+        if not options["techfile_name"] in loaded_project["techfiles"]:
+            return cli.CliMessage(f"Techfile do not exist: {options['techfile_name']}", "error")
+
+        try:
+            variants = sweep.sweep_variants(
+                prefix=arguments["inductor_name"],
+                **{parameter: sweep.parse_values(options[parameter]) for parameter in sweep.SWEEP_PARAMETERS},
+            )
+        except ValueError as error:
+            return cli.CliMessage(str(error), status="error")
+
+        try:
+            result = sweep.run_sweep(
+                variants=variants,
+                techfile=loaded_project["techfiles"][options["techfile_name"]],
+                base_metal=options["base_metal"],
+                exit_metal=options["exit_metal"],
+                output=arguments["output"],
+                merged=options.get("merged", False),
+                workers=options.get("workers"),
+                backend=options.get("backend", "native").lower(),
+                trace=options.get("trace", "rectangles").lower(),
+                progress=self.update_progressbar,
+                library_name=arguments["inductor_name"],
+                spacing=options.get("spacing", 100),
+            )
+        except ValueError as error:
+            self.progressbar.set(0)
+            return cli.CliMessage(str(error), status="error")
+
+        self.after(250, lambda: self.progressbar.set(0))
+
+        return cli.CliMessage(f"{result['cells']} cells drawn in {result['seconds']:.2f} s ({result['throughput']:.1f} cells/s)")
+
+    def explore_inductors(self, arguments: dict[str], options: dict[str]):
+
+        loaded_project = self.load_project(project_name=arguments["project_name"])
+        if isinstance(loaded_project, cli.CliMessage): return loaded_project
+
+        if not options["techfile_name"] in loaded_project["techfiles"]:
+            return cli.CliMessage(f"Techfile do not exist: {options['techfile_name']}", "error")
+
+        try:
+            result = explorer.explore(
+                **{parameter: sweep.parse_values(options[parameter]) for parameter in sweep.SWEEP_PARAMETERS},
+                techfile=loaded_project["techfiles"][options["techfile_name"]],
+                base_metal=options["base_metal"],
+                exit_metal=options["exit_metal"],
+                frequency=options["frequency"] * 1e9,
+                chunk_size=options.get("chunk_size", 4096),
+                raw_directory=options.get("raw"),
+                progress=self.update_progressbar,
+            )
+        except ValueError as error:
+            return cli.CliMessage(str(error), status="error")
+
+        self.after(250, lambda: self.progressbar.set(0))
+
+        explorer.write_front(
+            output_file=converter.process_user_path(arguments["output_file"], ".npz"),
+            front=result["front"],
+            techfile_name=options["techfile_name"],
+            base_metal=options["base_metal"],
+            exit_metal=options["exit_metal"],
+        )
+
+        return cli.CliMessage(f"{len(result['front']['length'])} pareto optimal geometries out of {result['valid']} valid and {result['evaluated']} evaluated")
+
+    def import_front(self, arguments: dict[str], options: dict[str]):
+
+        loaded_project = self.load_project(project_name=arguments["project_name"])
+        if isinstance(loaded_project, cli.CliMessage): return loaded_project
+
+        input_file = converter.process_user_path(arguments["input_file"], ".npz")
+        if not os.path.exists(input_file):
+            return cli.CliMessage(f"File do not exist: {input_file}", status="error")
+
+        inductors = explorer.front_inductors(input_file=input_file, prefix=arguments["inductor_name"])
+
+        for inductor in inductors.values():
+            if not inductor["techfile_name"] in loaded_project["techfiles"]:
+                return cli.CliMessage(f"Techfile do not exist: {inductor['techfile_name']}", "error")
+
+        loaded_project["inductors"].update(inductors)
+        self.save_project(project_data=loaded_project, project_name=arguments["project_name"])
+
+        return cli.CliMessage(f"{len(inductors)} inductors imported")
+
+    def update_progressbar(self, fraction: float):
+
+        self.progressbar.set(fraction)
+        self.update()
+
         
     def create_techfile(self, arguments:dict[str], options:dict[str]):
 
@@ -529,6 +1340,7 @@ class InduCalcCLI(cli.CLI):
         if loaded_project["techfiles"].pop(arguments['techfile_name'], None) == None:
             return cli.CliMessage(f"Techfile do not exist: {arguments['techfile_name']}", "error")
 
+        surrogate.invalidate(loaded_project, arguments["techfile_name"])
         self.save_project(project_data=loaded_project, project_name=arguments["project_name"])
         
     def rename_techfile(self, arguments:dict[str], options:dict[str]):
@@ -551,6 +1363,9 @@ class InduCalcCLI(cli.CLI):
 
         loaded_project["techfiles"] = aux
 
+        if arguments["techfile_name"] in loaded_project.get("surrogates", {}):
+            loaded_project["surrogates"][arguments["new_techfile_name"]] = loaded_project["surrogates"].pop(arguments["techfile_name"])
+
         self.save_project(project_data=loaded_project, project_name=arguments["project_name"])
 
     def list_techfiles_names(self, arguments:dict[str], options:dict[str]):
@@ -612,6 +1427,7 @@ class InduCalcCLI(cli.CLI):
         else:
             loaded_project["techfiles"][arguments["techfile_name"]][layer_type].append(options)
 
+        surrogate.invalidate(loaded_project, arguments["techfile_name"])
         self.save_project(project_data=loaded_project, project_name=arguments["project_name"])
 
         return self.list_tecfile(arguments, options)
@@ -649,6 +1465,7 @@ class InduCalcCLI(cli.CLI):
         key_order = converter.LAYER_KEY_ORDER if layer_type == "layer" else converter.METAL_KEY_ORDER if layer_type == "metal" else converter.VIA_KEY_ORDER
         loaded_project["techfiles"][arguments["techfile_name"]][layer_type][layer_id] = converter.reorder_dict(selected_layer, key_order)
 
+        surrogate.invalidate(loaded_project, arguments["techfile_name"])
         self.save_project(project_data=loaded_project, project_name=arguments["project_name"])
 
         return self.list_tecfile(arguments, options)
@@ -661,9 +1478,15 @@ class InduCalcCLI(cli.CLI):
         if not arguments["techfile_name"] in loaded_project["techfiles"]:
             return cli.CliMessage(f"Techfile do not exist: {arguments['techfile_name']}", "error")
 
-        if "grid" in options:
-            loaded_project["techfiles"][arguments["techfile_name"]]["chip"] = [{"grid": options["grid"]}]
+        techfile = loaded_project["techfiles"][arguments["techfile_name"]]
+        if not techfile.get("chip"):
+            techfile["chip"] = [{}]
+
+        for key in ("grid", *converter.CHIP_DEFAULTS):
+            if key in options:
+                techfile["chip"][0][key] = options[key]
 
+        surrogate.invalidate(loaded_project, arguments["techfile_name"])
         self.save_project(project_data=loaded_project, project_name=arguments["project_name"])
 
         return self.list_tecfile(arguments, options)
@@ -682,6 +1505,7 @@ class InduCalcCLI(cli.CLI):
         
         loaded_project["techfiles"][arguments["techfile_name"]][layer_type].pop(layer_id)
 
+        surrogate.invalidate(loaded_project, arguments["techfile_name"])
         self.save_project(project_data=loaded_project, project_name=arguments["project_name"])
 
         return self.list_tecfile(arguments, options)
@@ -706,10 +1530,80 @@ class InduCalcCLI(cli.CLI):
         loaded_project["techfiles"][arguments["techfile_name"]][layer_type].pop(from_)
         loaded_project["techfiles"][arguments["techfile_name"]][layer_type].insert(to_, aux)
 
+        surrogate.invalidate(loaded_project, arguments["techfile_name"])
         self.save_project(project_data=loaded_project, project_name=arguments["project_name"])
 
         return self.list_tecfile(arguments, options)
 
+    def fit_surrogate(self, arguments: dict[str], options: dict[str]):
+
+        loaded_project = self.load_project(project_name=arguments["project_name"])
+        if isinstance(loaded_project, cli.CliMessage): return loaded_project
+
+        if not arguments["techfile_name"] in loaded_project["techfiles"]:
+            return cli.CliMessage(f"Techfile do not exist: {arguments['techfile_name']}", "error")
+
+        bounds = {}
+        for parameter in sweep.SWEEP_PARAMETERS:
+            try:
+                values = sweep.parse_values(options[parameter])
+            except ValueError as error:
+                return cli.CliMessage(str(error), status="error")
+            bounds[parameter] = [min(values), max(values)]
+
+        try:
+            model = surrogate.fit(
+                techfile=loaded_project["techfiles"][arguments["techfile_name"]],
+                base_metal=options["base_metal"],
+                exit_metal=options["exit_metal"],
+                frequency=options["frequency"] * 1e9,
+                bounds=bounds,
+                samples=options.get("samples", 1000),
+                degree=options.get("degree", 4),
+                held_out=options.get("held_out", 0.2),
+                seed=options.get("seed"),
+            )
+        except ValueError as error:
+            return cli.CliMessage(str(error), status="error")
+
+        loaded_project.setdefault("surrogates", {})[arguments["techfile_name"]] = model
+        self.save_project(project_data=loaded_project, project_name=arguments["project_name"])
+
+        return self.report_surrogate(arguments, options)
+
+    def report_surrogate(self, arguments: dict[str], options: dict[str]):
+
+        loaded_project = self.load_project(project_name=arguments["project_name"])
+        if isinstance(loaded_project, cli.CliMessage): return loaded_project
+
+        model = loaded_project.get("surrogates", {}).get(arguments["techfile_name"])
+        if model is None:
+            return cli.CliMessage(f"Surrogate do not exist: {arguments['techfile_name']}", "error")
+
+        return cli.CliMessage("\n".join([
+            f"{model['base_metal']} base metal, {model['exit_metal']} exit metal, quality factor at {model['frequency'] / 1e9:g} GHz",
+            *(f"{parameter}: {low:g} to {high:g}" for parameter, (low, high) in model["bounds"].items()),
+            f"degree {model['degree']}, {model['samples']} samples fitted, {model['held_out']} held out",
+            *(f"{key} error: {error['mean']:.2%} mean, {error['max']:.2%} max" for key, error in model["error"].items()),
+        ]))
+
+    def query_surrogate(self, arguments: dict[str], options: dict[str]):
+
+        loaded_project = self.load_project(project_name=arguments["project_name"])
+        if isinstance(loaded_project, cli.CliMessage): return loaded_project
+
+        model = loaded_project.get("surrogates", {}).get(arguments["techfile_name"])
+        if model is None:
+            return cli.CliMessage(f"Surrogate do not exist: {arguments['techfile_name']}", "error")
+
+        result = surrogate.predict(model, *(options[parameter] for parameter in sweep.SWEEP_PARAMETERS))
+        message = f"L = {float(result['inductance']):.4g} nH, Q = {float(result['quality']):.4g} at {model['frequency'] / 1e9:g} GHz"
+
+        if not result["inside"]:
+            return cli.CliMessage(f"{message} (extrapolated outside the surrogate bounds)", status="warning")
+
+        return cli.CliMessage(message)
+
     def list_tecfile(self, arguments:dict[str], options:dict[str]):
 
         def enumerate_lists(data):
@@ -730,10 +1624,11 @@ class InduCalcCLI(cli.CLI):
             return cli.CliMessage(f"Techfile do not exist: {arguments['techfile_name']}", "error")
 
         enumerated_content = enumerate_lists(loaded_project["techfiles"][arguments["techfile_name"]])
-        content_to_print = yaml.dump(enumerated_content, default_flow_style=False, allow_unicode=True, sort_keys=False)[:-1]
+        content_to_print = serialization.dump(enumerated_content, default_flow_style=False)[:-1]
 
         return cli.CliMessage(content_to_print)
     
-induCalcCLI = InduCalcCLI(title="InduCalcCLI")
+if __name__ == "__main__":
+    induCalcCLI = InduCalcCLI(title="InduCalcCLI")
 
-induCalcCLI.mainloop()
\ No newline at end of file
+    induCalcCLI.mainloop()
\ No newline at end of file
@@ -0,0 +1,195 @@
+import numpy as np
+
+MU_0 = 4e-7 * np.pi
+
+# MODIFIED WHEELER COEFFICIENTS (K1, K2)
+WHEELER_COEFFICIENTS = {
+    "square": (2.34, 2.75),
+    "hexagonal": (2.33, 3.82),
+    "octagonal": (2.25, 3.55),
+}
+
+# CURRENT SHEET COEFFICIENTS (C1, C2, C3, C4)
+CURRENT_SHEET_COEFFICIENTS = {
+    "square": (1.27, 2.07, 0.18, 0.13),
+    "hexagonal": (1.09, 2.23, 0.00, 0.17),
+    "octagonal": (1.07, 2.29, 0.00, 0.19),
+    "circular": (1.00, 2.46, 0.00, 0.20),
+}
+
+# MONOMIAL FIT COEFFICIENTS (BETA, ALPHA1 TO ALPHA5), FOR LENGTHS IN µm AND INDUCTANCES IN nH
+MONOMIAL_COEFFICIENTS = {
+    "square": (1.62e-3, -1.21, -0.147, 2.40, 1.78, -0.030),
+    "hexagonal": (1.28e-3, -1.24, -0.174, 2.47, 1.77, -0.049),
+    "octagonal": (1.33e-3, -1.21, -0.163, 2.43, 1.75, -0.049),
+}
+
+# SHAPES WITHOUT THEIR OWN FIT USE THE CLOSEST ONE
+CLOSEST_SHAPES = {
+    "symmetric": "square",
+    "circular": "octagonal",
+}
+
+METHODS = ("modified_wheeler", "current_sheet", "monomial")
+
+def coefficients(table: dict[str, tuple], shape: str) -> tuple:
+
+    """
+    Gets the coefficients of a shape, or of its closest shape when it has no fit of its own.
+    """
+
+    shape = shape.lower()
+    if shape not in table:
+        shape = CLOSEST_SHAPES.get(shape, shape)
+
+    if shape not in table:
+        raise ValueError(f"Unknown inductor shape: {shape}. Use one of: {', '.join(table)}")
+
+    return table[shape]
+
+def diameters(length, width, space, turns) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+
+    """
+    Gets the geometric parameters shared by every closed-form expression.
+
+    Args:
+        length: Outer diameters (external lengths) in µm.
+        width: Trace widths in µm.
+        space: Spaces between traces in µm.
+        turns: Numbers of turns.
+
+    Returns:
+        Outer diameter, inner diameter, average diameter and fill ratio. Geometries whose
+        turns do not fit in the outer diameter get NaN.
+    """
+
+    outer = np.asarray(length, dtype=float)
+    width = np.asarray(width, dtype=float)
+    space = np.asarray(space, dtype=float)
+    turns = np.asarray(turns, dtype=float)
+
+    inner = outer - 2 * turns * width - 2 * (turns - 1) * space
+    inner = np.where(inner > 0, inner, np.nan)
+
+    average = (outer + inner) / 2
+    fill_ratio = (outer - inner) / (outer + inner)
+
+    return outer, inner, average, fill_ratio
+
+def modified_wheeler(length, width, space, turns, shape: str = "square") -> np.ndarray:
+
+    """
+    Estimates inductances with the modified Wheeler expression.
+
+    L = K1 µ0 n² d_avg / (1 + K2 ρ)
+
+    Args:
+        length: Outer diameters (external lengths) in µm.
+        width: Trace widths in µm.
+        space: Spaces between traces in µm.
+        turns: Numbers of turns.
+        shape: "square", "hexagonal", "octagonal" or "circular".
+
+    Returns:
+        Inductances in nH.
+    """
+
+    k1, k2 = coefficients(WHEELER_COEFFICIENTS, shape)
+    outer, inner, average, fill_ratio = diameters(length, width, space, turns)
+
+    return k1 * MU_0 * np.square(turns) * (average * 1e-6) / (1 + k2 * fill_ratio) * 1e9
+
+def current_sheet(length, width, space, turns, shape: str = "square") -> np.ndarray:
+
+    """
+    Estimates inductances with the current sheet expression.
+
+    L = µ0 n² d_avg c1 (ln(c2 / ρ) + c3 ρ + c4 ρ²) / 2
+
+    Args:
+        length: Outer diameters (external lengths) in µm.
+        width: Trace widths in µm.
+        space: Spaces between traces in µm.
+        turns: Numbers of turns.
+        shape: "square", "hexagonal", "octagonal" or "circular".
+
+    Returns:
+        Inductances in nH.
+    """
+
+    c1, c2, c3, c4 = coefficients(CURRENT_SHEET_COEFFICIENTS, shape)
+    outer, inner, average, fill_ratio = diameters(length, width, space, turns)
+
+    return (
+        MU_0 * np.square(turns) * (average * 1e-6) * c1 / 2
+        * (np.log(c2 / fill_ratio) + c3 * fill_ratio + c4 * np.square(fill_ratio))
+        * 1e9
+    )
+
+def monomial(length, width, space, turns, shape: str = "square") -> np.ndarray:
+
+    """
+    Estimates inductances with the data-fitted monomial expression.
+
+    L = β d_out^α1 w^α2 d_avg^α3 n^α4 s^α5
+
+    Args:
+        length: Outer diameters (external lengths) in µm.
+        width: Trace widths in µm.
+        space: Spaces between traces in µm.
+        turns: Numbers of turns.
+        shape: "square", "hexagonal", "octagonal" or "circular".
+
+    Returns:
+        Inductances in nH.
+    """
+
+    beta, *alpha = coefficients(MONOMIAL_COEFFICIENTS, shape)
+    outer, inner, average, fill_ratio = diameters(length, width, space, turns)
+
+    # SUMMING LOGARITHMS INSTEAD OF MULTIPLYING FIVE POWERS
+    return np.exp(
+        np.log(beta)
+        + alpha[0] * np.log(outer)
+        + alpha[1] * np.log(np.asarray(width, dtype=float))
+        + alpha[2] * np.log(average)
+        + alpha[3] * np.log(np.asarray(turns, dtype=float))
+        + alpha[4] * np.log(np.asarray(space, dtype=float))
+    )
+
+def estimate(length, width, space, turns, shape: str = "square", methods: tuple[str] = METHODS) -> dict[str, np.ndarray]:
+
+    """
+    Estimates inductances with closed-form expressions.
+
+    Every geometric parameter may be a number or an array, and arrays are broadcast
+    together, so a single call estimates whole families of inductors.
+
+    Args:
+        length: Outer diameters (external lengths) in µm.
+        width: Trace widths in µm.
+        space: Spaces between traces in µm.
+        turns: Numbers of turns.
+        shape: "square", "octagonal", "circular" or "symmetric".
+        methods: Expressions to evaluate, among "modified_wheeler", "current_sheet" and "monomial".
+
+    Returns:
+        Inductances in nH by method.
+
+    Raises:
+        ValueError: If a method or the shape is unknown.
+    """
+
+    expressions = {
+        "modified_wheeler": modified_wheeler,
+        "current_sheet": current_sheet,
+        "monomial": monomial,
+    }
+
+    estimates = {}
+    for method in methods:
+        if method not in expressions:
+            raise ValueError(f"Unknown estimation method: {method}. Use one of: {', '.join(METHODS)}")
+        estimates[method] = expressions[method](length, width, space, turns, shape=shape)
+
+    return estimates
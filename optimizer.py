@@ -0,0 +1,149 @@
+import functools
+import numpy as np
+import greenhouse
+import inductance
+import quality
+import spiral
+
+# RELATIVE ERROR OF THE CURRENT SHEET ESTIMATE, WIDENING THE COARSE SEARCH WINDOW
+ESTIMATE_ERROR = 0.1
+
+# MAXIMUM NUMBER OF CANDIDATES REFINED, IN MULTIPLES OF THE MATCHES SOUGHT
+MAX_REFINE_FACTOR = 20
+
+@functools.lru_cache(maxsize=4096)
+def refined_inductance(length: float, width: float, space: float, turns: float, thickness: float) -> float:
+
+    """
+    Gets the Greenhouse inductance of a square spiral in nH, memoized so candidates shared
+    by successive searches are solved once.
+    """
+
+    return float(greenhouse.square_spiral_inductance(length=length, width=width, space=space, turns=turns, thickness=thickness)["total"])
+
+def optimize(
+        target: float | int,
+        frequency: float | int,
+        max_length: float | int,
+        techfile_name: str,
+        techfiles: dict[str, dict[str, list[dict[str]]]],
+        base_metals: list[str],
+        exit_metal: str,
+        widths: list[float],
+        spaces: list[float],
+        turns: list[float],
+        min_length: float | int = 20,
+        length_step: float | int = 5,
+        tolerance: float = 0.02,
+        refine: int = 20,
+    ) -> dict[str]:
+
+    """
+    Searches the square spiral reaching a target inductance with the highest quality factor.
+
+    Every geometry of the grid is first estimated at once with the current sheet
+    expression, and those close enough to the target are ranked by their quality factor
+    at the frequency. They are refined with the Greenhouse method, best first, until
+    enough of them are within the tolerance, and the best refined geometry wins.
+
+    Args:
+        target: Target inductance in nH.
+        frequency: Frequency in Hz at which the quality factor is maximized.
+        max_length: Maximum external length in µm.
+        techfile_name: Name of the techfile of the inductors.
+        techfiles: Techfiles by techfile name, as stored in a project.
+        base_metals: Names of the metals allowed for the spiral.
+        exit_metal: Name of the exit metal.
+        widths: Widths of the metal traces to search, in µm.
+        spaces: Spaces between base metal traces to search, in µm.
+        turns: Numbers of turns to search.
+        min_length: Minimum external length in µm.
+        length_step: Step between the external lengths in µm.
+        tolerance: Maximum relative error of the refined inductance.
+        refine: Number of refined geometries within the tolerance compared at the end.
+
+    Returns:
+        Parameters of the winning inductor ("inductor"), its refined inductance in nH
+        ("inductance") and quality factor ("quality"), and the numbers of geometries
+        estimated ("estimated"), ranked by quality factor ("ranked") and refined ("refined").
+
+    Raises:
+        ValueError: If a metal do not exist or no geometry reaches the target.
+    """
+
+    techfile = techfiles[techfile_name]
+
+    for metal_name in (*base_metals, exit_metal):
+        if spiral.get_metal_index(techfile=techfile, metal_name=metal_name) == -1:
+            raise ValueError(f"Metal do not exist: {metal_name}")
+
+    lengths = np.arange(min_length, max_length + length_step / 2, length_step)
+    grid = [values.ravel() for values in np.meshgrid(lengths, widths, spaces, turns, indexing="ij")]
+
+    estimates = inductance.current_sheet(*grid, shape="square")
+    close = np.flatnonzero(np.abs(estimates - target) <= (tolerance + ESTIMATE_ERROR) * target)
+
+    # QUALITY FACTORS OF THE CLOSE GEOMETRIES ON EVERY ALLOWED METAL, IN A SINGLE BATCH
+    candidates = {
+        f"{base_metal}_{i}": {
+            "base_metal": base_metal,
+            "exit_metal": exit_metal,
+            "length": float(grid[0][i]),
+            "width": float(grid[1][i]),
+            "space": float(grid[2][i]),
+            "turns": float(grid[3][i]),
+            "techfile_name": techfile_name,
+            "x": 0.0,
+            "y": 0.0,
+        }
+        for base_metal in base_metals if base_metal.upper() != exit_metal.upper()
+        for i in close
+    }
+
+    if not candidates:
+        raise ValueError(f"No geometry reaches {target:g} nH within {max_length:g} µm")
+
+    coarse = quality.analyze(
+        inductors=candidates,
+        techfiles=techfiles,
+        frequencies=[frequency],
+        inductances=np.tile(estimates[close], len(candidates) // len(close)),
+    )["q"][:, 0]
+
+    ranked = np.argsort(np.where(np.isnan(coarse), np.inf, -coarse), kind="stable")
+    names = np.array(list(candidates))[ranked[:refine * MAX_REFINE_FACTOR]]
+
+    # REFINING THE BEST CANDIDATES, SKIPPING THOSE THE ESTIMATE MISPLACED, UNTIL ENOUGH REACH THE TARGET
+    refined = {}
+    for refined_count, name in enumerate(names, start=1):
+        candidate = candidates[name]
+        thickness = techfile["metal"][spiral.get_metal_index(techfile=techfile, metal_name=candidate["base_metal"])]["thickness"]
+        value = refined_inductance(candidate["length"], candidate["width"], candidate["space"], candidate["turns"], float(thickness))
+        if abs(value - target) <= tolerance * target:
+            refined[name] = value
+        if len(refined) == refine:
+            break
+
+    if not refined:
+        raise ValueError(f"No geometry reaches {target:g} nH within {tolerance:.1%} after refinement")
+
+    fine = quality.analyze(
+        inductors={name: candidates[name] for name in refined},
+        techfiles=techfiles,
+        frequencies=[frequency],
+        inductances=np.array(list(refined.values())),
+    )["q"][:, 0]
+
+    if np.isnan(fine).all():
+        raise ValueError(f"The quality factors of the geometries reaching {target:g} nH can not be extracted")
+
+    best = list(refined)[int(np.nanargmax(fine))]
+
+    return {
+        "inductor": candidates[best],
+        "inductance": refined[best],
+        "quality": float(np.nanmax(fine)),
+        "estimated": len(estimates),
+        "ranked": len(candidates),
+        "refined": refined_count,
+    }
@@ -0,0 +1,285 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import converter
+import geometry
+import greenhouse
+import spiral
+
+# MATRICES OF THE SPIRAL BEING SOLVED, SET ONCE IN EACH WORKER PROCESS
+SYSTEM: dict[str, np.ndarray] = dict()
+
+def filaments(
+        length: float | int,
+        width: float | int,
+        space: float | int,
+        turns: float | int,
+        thickness: float | int,
+        width_filaments: int = 4,
+        thickness_filaments: int = 2,
+    ) -> dict[str, np.ndarray]:
+
+    """
+    Splits every segment of a square spiral, as drawn by Spiral.square_cell, into filaments.
+
+    Each column of filaments across the width follows its own mitered path, so filaments
+    on the inner side of the corners are shorter than those on the outer side.
+
+    Args:
+        length: External length of the square inductor in µm.
+        width: Width of the metal traces in µm.
+        space: Space between base metal traces in µm.
+        turns: Number of turns in the spiral inductor.
+        thickness: Thickness of the base metal in µm.
+        width_filaments: Number of filaments across the width of a segment.
+        thickness_filaments: Number of filaments across the thickness of a segment.
+
+    Returns:
+        Start and end points of the filaments ("start" and "end", of shape (filaments, 2)),
+        their heights above the bottom of the metal ("height"), the segment each belongs
+        to ("segment") and the filament cross-section ("width" and "thickness").
+    """
+
+    if width_filaments < 1 or thickness_filaments < 1:
+        raise ValueError("The number of filaments must be at least 1")
+
+    outer_edge = geometry.square_spiral_path(length=length, width=width, space=space, turns=turns)
+    segments = len(outer_edge) - 1
+
+    filament_width = width / width_filaments
+    filament_thickness = thickness / thickness_filaments
+
+    # PATHS OF THE FILAMENT COLUMNS, OF SHAPE (WIDTH FILAMENTS, POINTS, 2)
+    columns = np.stack([
+        geometry.offset_path(path=outer_edge, distance=(k + 0.5) * filament_width)
+        for k in range(width_filaments)
+    ])
+    heights = (np.arange(thickness_filaments) + 0.5) * filament_thickness
+
+    # FILAMENTS ORDERED BY SEGMENT, THEN WIDTH, THEN THICKNESS
+    shape = (segments, width_filaments, thickness_filaments, 2)
+    start = np.broadcast_to(columns[:, :-1].transpose(1, 0, 2)[:, :, None], shape).reshape(-1, 2)
+    end = np.broadcast_to(columns[:, 1:].transpose(1, 0, 2)[:, :, None], shape).reshape(-1, 2)
+
+    return {
+        "start": start,
+        "end": end,
+        "height": np.tile(heights, segments * width_filaments),
+        "segment": np.repeat(np.arange(segments), width_filaments * thickness_filaments),
+        "width": filament_width,
+        "thickness": filament_thickness,
+    }
+
+def inductance_matrix(mesh: dict[str, np.ndarray], block_size: int = 256) -> np.ndarray:
+
+    """
+    Assembles the partial inductance matrix of a filament mesh.
+
+    Perpendicular filaments do not couple. The filaments along each axis are coupled in
+    blocks of rows, which bounds the memory of the temporaries, and every pair is taken
+    as two filaments at the distance between their centers.
+
+    Args:
+        mesh: Filaments, as returned by filaments.
+        block_size: Number of rows assembled at once.
+
+    Returns:
+        Symmetric matrix of shape (filaments, filaments) in nH.
+    """
+
+    vectors = mesh["end"] - mesh["start"]
+    count = len(vectors)
+
+    matrix = np.zeros((count, count))
+
+    for axis in (0, 1):
+        members = np.flatnonzero(np.abs(vectors[:, axis]) > 0)
+        if not len(members):
+            continue
+
+        spans = np.sort(np.stack((mesh["start"][members, axis], mesh["end"][members, axis]), axis=-1), axis=1)
+        directions = np.sign(vectors[members, axis])
+        positions = mesh["start"][members, 1 - axis]
+        heights = mesh["height"][members]
+
+        for first in range(0, len(members), block_size):
+            rows = slice(first, first + block_size)
+
+            distance = np.hypot(positions[rows, None] - positions, heights[rows, None] - heights)
+            with np.errstate(divide="ignore", invalid="ignore"):
+                values = greenhouse.parallel_mutual_inductances(spans[rows, None], spans[None], distance)
+
+            matrix[np.ix_(members[rows], members)] = directions[rows, None] * directions * values
+
+    lengths = np.abs(vectors).sum(axis=1)
+    matrix[np.diag_indices(count)] = greenhouse.self_inductances(lengths, mesh["width"], mesh["thickness"])
+
+    return matrix
+
+def set_system(system: dict[str, np.ndarray]):
+
+    """
+    Keeps the matrices of the spiral in a worker process, so they are sent only once.
+    """
+
+    SYSTEM.clear()
+    SYSTEM.update(system)
+
+def solve_frequencies(frequencies: np.ndarray) -> np.ndarray:
+
+    """
+    Solves the filament system at some frequencies. Runs inside the worker processes.
+
+    Every filament of a segment sees the segment voltage, and the segments are in series.
+    With the incidence matrix B of the filaments into the segments, the segment
+    admittance is Bᵀ Z⁻¹ B, and the spiral impedance is the sum of the segment voltages
+    for a unit current.
+
+    Args:
+        frequencies: Frequencies in Hz.
+
+    Returns:
+        Complex impedances in Ω.
+    """
+
+    resistance, inductance, incidence = SYSTEM["resistance"], SYSTEM["inductance"], SYSTEM["incidence"]
+    ones = np.ones(incidence.shape[1])
+
+    impedances = np.empty(len(frequencies), dtype=complex)
+    for i, frequency in enumerate(frequencies):
+        impedance = 1j * 2 * np.pi * frequency * 1e-9 * inductance
+        impedance[np.diag_indices(len(resistance))] += resistance
+
+        segment_admittance = incidence.T @ np.linalg.solve(impedance, incidence)
+        impedances[i] = np.linalg.solve(segment_admittance, ones).sum()
+
+    return impedances
+
+def square_spiral_impedance(
+        length: float | int,
+        width: float | int,
+        space: float | int,
+        turns: float | int,
+        sheet_resistance: float | int,
+        thickness: float | int,
+        frequencies,
+        width_filaments: int = 4,
+        thickness_filaments: int = 2,
+        workers: int = None,
+    ) -> dict[str, np.ndarray]:
+
+    """
+    Gets the frequency-dependent resistance and inductance of a square spiral trace with
+    the PEEC method, including the skin and proximity effects.
+
+    Args:
+        length: External length of the square inductor in µm.
+        width: Width of the metal traces in µm.
+        space: Space between base metal traces in µm.
+        turns: Number of turns in the spiral inductor.
+        sheet_resistance: Sheet resistance of the base metal in Ω/sq.
+        thickness: Thickness of the base metal in µm.
+        frequencies: Positive frequencies in Hz.
+        width_filaments: Number of filaments across the width of a segment.
+        thickness_filaments: Number of filaments across the thickness of a segment.
+        workers: Number of worker processes sharing the frequencies. Defaults to the number
+            of cores, and 1 solves in this process.
+
+    Returns:
+        Frequencies in Hz ("frequency"), resistances in Ω ("resistance") and inductances in
+        nH ("inductance").
+
+    Raises:
+        ValueError: If a frequency is not positive or a number of filaments is below 1.
+    """
+
+    frequencies = np.atleast_1d(np.asarray(frequencies, dtype=float))
+    if np.any(frequencies <= 0):
+        raise ValueError("The frequencies must be positive")
+
+    mesh = filaments(
+        length=length,
+        width=width,
+        space=space,
+        turns=turns,
+        thickness=thickness,
+        width_filaments=width_filaments,
+        thickness_filaments=thickness_filaments,
+    )
+
+    # SHEET RESISTANCE TIMES THICKNESS IS THE RESISTIVITY IN Ω µm
+    lengths = np.abs(mesh["end"] - mesh["start"]).sum(axis=1)
+    system = {
+        "resistance": sheet_resistance * thickness * lengths / (mesh["width"] * mesh["thickness"]),
+        "inductance": inductance_matrix(mesh),
+        "incidence": np.eye(mesh["segment"].max() + 1)[mesh["segment"]],
+    }
+
+    workers = min(workers or os.cpu_count(), len(frequencies))
+
+    if workers == 1:
+        set_system(system)
+        impedances = solve_frequencies(frequencies)
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=set_system, initargs=(system,)) as executor:
+            impedances = np.concatenate(list(executor.map(solve_frequencies, np.array_split(frequencies, workers))))
+
+    return {
+        "frequency": frequencies,
+        "resistance": impedances.real,
+        "inductance": impedances.imag / (2 * np.pi * frequencies) * 1e9,
+    }
+
+def inductor_impedance(
+        inductor: dict[str],
+        techfile: dict[str, list[dict[str]]],
+        frequencies,
+        width_filaments: int = 4,
+        thickness_filaments: int = 2,
+        workers: int = None,
+    ) -> dict[str, np.ndarray]:
+
+    """
+    Gets the PEEC resistance and inductance of the base metal trace of a project inductor.
+
+    Args:
+        inductor: Inductor parameters, as stored in a project.
+        techfile: Techfile referenced by the inductor.
+        frequencies: Positive frequencies in Hz.
+        width_filaments: Number of filaments across the width of a segment.
+        thickness_filaments: Number of filaments across the thickness of a segment.
+        workers: Number of worker processes sharing the frequencies.
+
+    Returns:
+        Frequencies, resistances and inductances, as returned by square_spiral_impedance.
+
+    Raises:
+        ValueError: If the inductor is not a square spiral, its base metal do not exist or
+            has no sheet resistance, a frequency is not positive or a number of filaments
+            is below 1.
+    """
+
+    if inductor.get("shape", "square").lower() != "square":
+        raise ValueError("The PEEC solver only supports square spirals")
+
+    techfile = converter.default_techfile(techfile)
+
+    base_metal_index = spiral.get_metal_index(techfile=techfile, metal_name=inductor["base_metal"])
+    if base_metal_index == -1:
+        raise ValueError("Metal do not exist")
+
+    base_metal = techfile["metal"][base_metal_index]
+
+    # SHEET RESISTANCES ARE IN mΩ PER SQUARE
+    return square_spiral_impedance(
+        length=inductor["length"],
+        width=inductor["width"],
+        space=inductor["space"],
+        turns=inductor["turns"],
+        sheet_resistance=base_metal["sheet_resistance"] / 1000,
+        thickness=base_metal["thickness"],
+        frequencies=frequencies,
+        width_filaments=width_filaments,
+        thickness_filaments=thickness_filaments,
+        workers=workers,
+    )
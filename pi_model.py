@@ -0,0 +1,323 @@
+import numpy as np
+import numpy.lib.recfunctions as rfn
+import converter
+import inductance
+import resistance
+import spiral
+
+# VACUUM PERMITTIVITY IN fF/µm
+EPSILON_0 = 8.854e-3
+
+# µ0 IN H/m
+MU_0 = 4e-7 * np.pi
+
+# LAYERS FROM THIS RESISTIVITY (Ω cm) ON ARE DIELECTRICS
+DIELECTRIC_RESISTIVITY = 1e6
+
+# FREQUENCY IN Hz, INDUCTANCE IN nH, RESISTANCES IN Ω AND CAPACITANCES IN fF
+PI_MODEL_DTYPE = np.dtype([
+    ("frequency", float),
+    ("ls", float),
+    ("rs", float),
+    ("cs", float),
+    ("cox", float),
+    ("csub", float),
+    ("rsub", float),
+])
+
+def layer_bounds(techfile: dict[str, list[dict[str]]]) -> tuple[np.ndarray, np.ndarray]:
+
+    """
+    Gets the bottom and top heights in µm of the techfile layers, stacked from the substrate up.
+    """
+
+    thicknesses = np.array([float(layer["thickness"]) for layer in techfile["layer"]])
+    tops = np.cumsum(thicknesses)
+
+    return tops - thicknesses, tops
+
+def metal_height(techfile: dict[str, list[dict[str]]], metal_index: int) -> float:
+
+    """
+    Gets the height in µm of the bottom of a metal, which lies at its distance from the
+    bottom of its layer.
+
+    Raises:
+        ValueError: If the metal references a layer that does not exist.
+    """
+
+    metal = techfile["metal"][metal_index]
+    bottoms, tops = layer_bounds(techfile)
+
+    if not 0 <= metal["layer"] < len(bottoms):
+        raise ValueError(f"Layer {metal['layer']} of metal {metal['name']} do not exist")
+
+    return bottoms[metal["layer"]] + metal.get("distance", 0)
+
+def substrate_layers(techfile: dict[str, list[dict[str]]]) -> int:
+
+    """
+    Gets the number of semiconducting layers at the bottom of the stack.
+
+    Raises:
+        ValueError: If a layer has no resistivity.
+    """
+
+    techfile = converter.default_techfile(techfile)
+
+    for index, layer in enumerate(techfile["layer"]):
+        if layer["resistivity"] >= DIELECTRIC_RESISTIVITY:
+            return index
+
+    return len(techfile["layer"])
+
+def capacitance_per_area(techfile: dict[str, list[dict[str]]], bottom: float, top: float) -> float:
+
+    """
+    Gets the capacitance per area of the dielectrics between two heights, as the layers
+    crossed in series.
+
+    Args:
+        techfile: Techfile containing the layers.
+        bottom: Lower height in µm.
+        top: Upper height in µm.
+
+    Returns:
+        Capacitance per area in fF/µm².
+    """
+
+    bottoms, tops = layer_bounds(techfile)
+    permittivities = np.array([float(layer["permittivity"]) for layer in techfile["layer"]])
+
+    crossed = np.clip(top, bottoms, tops) - np.clip(bottom, bottoms, tops)
+
+    return EPSILON_0 / np.sum(crossed / permittivities)
+
+def substrate_admittance(techfile: dict[str, list[dict[str]]]) -> tuple[float, float]:
+
+    """
+    Gets the capacitance and the conductance per area of the semiconducting layers.
+
+    Returns:
+        Capacitance per area in fF/µm² and conductance per area in S/µm².
+
+    Raises:
+        ValueError: If a layer has no resistivity.
+    """
+
+    techfile = converter.default_techfile(techfile)
+    layers = techfile["layer"][:substrate_layers(techfile)]
+    if not layers:
+        return 0.0, 0.0
+
+    # RESISTIVITIES ARE IN Ω cm, 1 Ω cm = 1e4 Ω µm
+    capacitance = EPSILON_0 / sum(layer["thickness"] / layer["permittivity"] for layer in layers)
+    conductance = 1 / sum(layer["resistivity"] * 1e4 * layer["thickness"] for layer in layers)
+
+    return capacitance, conductance
+
+def skin_factor(sheet_resistance: np.ndarray, thickness: np.ndarray, frequencies: np.ndarray) -> np.ndarray:
+
+    """
+    Gets the increase of the resistance of traces with the frequency, as t / (δ (1 - e^(-t/δ))).
+
+    Args:
+        sheet_resistance: Sheet resistances in Ω/sq, of shape (inductors, 1).
+        thickness: Thicknesses in µm, of shape (inductors, 1).
+        frequencies: Frequencies in Hz.
+
+    Returns:
+        Factors of shape (inductors, frequencies), 1 at DC.
+    """
+
+    resistivity = sheet_resistance * thickness * 1e-6
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        skin_depth = np.sqrt(resistivity / (np.pi * MU_0 * frequencies)) * 1e6
+        ratio = thickness / skin_depth
+        factor = ratio / -np.expm1(-ratio)
+
+    return np.where(ratio > 0, factor, 1.0)
+
+def stack_parameters(techfile: dict[str, list[dict[str]]], base_metal_index: int, exit_metal_index: int) -> tuple[float, ...]:
+
+    """
+    Gets the techfile data of a base metal and exit metal pair needed by the π-model.
+
+    Returns:
+        Sheet resistances in Ω/sq and thicknesses in µm of the base and exit metals, the
+        oxide capacitance per area under the base metal, the capacitance per area between
+        both metals in fF/µm², and the substrate capacitance and conductance per area.
+
+    Raises:
+        ValueError: If a metal references a layer that does not exist, or a layer or metal
+            has no resistivity or sheet resistance.
+    """
+
+    techfile = converter.default_techfile(techfile)
+
+    base_metal = techfile["metal"][base_metal_index]
+    exit_metal = techfile["metal"][exit_metal_index]
+
+    base_height = metal_height(techfile, base_metal_index)
+    exit_height = metal_height(techfile, exit_metal_index)
+
+    # THE OXIDE STARTS AT THE TOP OF THE SEMICONDUCTING LAYERS
+    bottoms, tops = layer_bounds(techfile)
+    substrate_top = np.concatenate(((0.0,), tops))[substrate_layers(techfile)]
+
+    # THE OVERLAP CAPACITANCE LIES BETWEEN THE TOP OF THE LOWER METAL AND THE BOTTOM OF THE UPPER ONE
+    if base_height >= exit_height:
+        overlap_bottom, overlap_top = exit_height + exit_metal["thickness"], base_height
+    else:
+        overlap_bottom, overlap_top = base_height + base_metal["thickness"], exit_height
+
+    return (
+        base_metal["sheet_resistance"] / 1000,
+        base_metal["thickness"],
+        exit_metal["sheet_resistance"] / 1000,
+        exit_metal["thickness"],
+        capacitance_per_area(techfile, substrate_top, base_height),
+        capacitance_per_area(techfile, overlap_bottom, overlap_top) if overlap_top > overlap_bottom else 0.0,
+        *substrate_admittance(techfile),
+    )
+
+def extract(
+        inductors: dict[str, dict[str]],
+        techfiles: dict[str, dict[str, list[dict[str]]]],
+        frequencies,
+        inductances=None,
+    ) -> np.ndarray:
+
+    """
+    Extracts the single-π models of many inductors over a frequency grid at once.
+
+    Every inductor and frequency is evaluated by broadcasting, with the series branch
+    Ls and Rs(f), the overlap capacitance Cs between the spiral and its exit, and on
+    each port the oxide capacitance Cox in series with the substrate Csub || Rsub.
+
+    Args:
+        inductors: Inductor parameters by inductor name, as stored in a project.
+        techfiles: Techfiles by techfile name, as stored in a project.
+        frequencies: Frequencies in Hz.
+        inductances: Series inductances in nH of the inductors. Defaults to the current
+            sheet estimate.
+
+    Returns:
+        Structured array of dtype PI_MODEL_DTYPE and shape (inductors, frequencies), in the
+        order of the inductors. Symmetric spirals and turns that do not fit get NaN.
+
+    Raises:
+        ValueError: If a metal references a layer that does not exist, or a layer, metal or
+            via has no resistivity, sheet resistance or resistance.
+    """
+
+    names = list(inductors)
+    frequencies = np.atleast_1d(np.asarray(frequencies, dtype=float))
+
+    # TECHFILES GIVEN BY CONDUCTIVITY OR RESISTIVITY ARE CONVERTED ONCE
+    techfiles = {techfile_name: converter.default_techfile(techfiles[techfile_name]) for techfile_name in {inductors[name]["techfile_name"] for name in names}}
+
+    length, width, space, turns = (np.array([float(inductors[name][key]) for name in names]) for key in ("length", "width", "space", "turns"))
+    shapes = np.array([inductors[name].get("shape", "square").lower() for name in names])
+
+    resistances = resistance.dc_resistance(inductors=inductors, techfiles=techfiles)
+
+    # GATHERING THE TECHFILE DATA OF EACH INDUCTOR, ONCE PER DISTINCT STACK
+    stacks: dict[tuple, tuple[float, ...]] = dict()
+    parameters = np.empty((len(names), 8))
+
+    for i, name in enumerate(names):
+        inductor = inductors[name]
+
+        key = (inductor["techfile_name"], inductor["base_metal"].upper(), inductor["exit_metal"].upper())
+        if key not in stacks:
+            techfile = techfiles[inductor["techfile_name"]]
+            stacks[key] = stack_parameters(
+                techfile=techfile,
+                base_metal_index=spiral.get_metal_index(techfile=techfile, metal_name=inductor["base_metal"]),
+                exit_metal_index=spiral.get_metal_index(techfile=techfile, metal_name=inductor["exit_metal"]),
+            )
+
+        parameters[i] = stacks[key]
+
+    if inductances is None:
+        inductances = np.empty(len(names))
+        for shape in np.unique(shapes):
+            same_shape = shapes == shape
+            inductances[same_shape] = inductance.current_sheet(length[same_shape], width[same_shape], space[same_shape], turns[same_shape], shape=shape)
+
+    return assemble(
+        frequencies=frequencies,
+        inductances=inductances,
+        resistances=resistances,
+        width=width,
+        turns=turns,
+        parameters=parameters,
+    )
+
+def assemble(
+        frequencies: np.ndarray,
+        inductances: np.ndarray,
+        resistances: dict[str, np.ndarray],
+        width: np.ndarray,
+        turns: np.ndarray,
+        parameters: np.ndarray,
+    ) -> np.ndarray:
+
+    """
+    Builds the π-models of inductors whose resistances and techfile data are known.
+
+    Args:
+        frequencies: Frequencies in Hz.
+        inductances: Series inductances in nH.
+        resistances: Trace squares and DC resistances, as returned by resistance.dc_resistance.
+        width: Widths of the metal traces in µm.
+        turns: Numbers of turns.
+        parameters: Array of shape (inductors, 8) with the stack_parameters of each inductor.
+
+    Returns:
+        Structured array of dtype PI_MODEL_DTYPE and shape (inductors, frequencies).
+    """
+
+    frequencies = np.atleast_1d(np.asarray(frequencies, dtype=float))
+    base_sheet, base_thickness, exit_sheet, exit_thickness, cox_per_area, cs_per_area, csub_per_area, gsub_per_area = parameters.T[:, :, None]
+
+    # THE EXIT CROSSES EVERY TURN ONCE
+    area = resistances["squares"] * np.square(width)
+    overlap_area = np.rint(turns) * np.square(width)
+
+    model = np.empty((len(width), len(frequencies)), dtype=PI_MODEL_DTYPE)
+    model["frequency"] = frequencies
+    model["ls"] = np.asarray(inductances, dtype=float)[:, None]
+    model["rs"] = (
+        resistances["trace"][:, None] * skin_factor(base_sheet, base_thickness, frequencies)
+        + resistances["exit"][:, None] * skin_factor(exit_sheet, exit_thickness, frequencies)
+        + resistances["vias"][:, None]
+    )
+    model["cs"] = overlap_area[:, None] * cs_per_area
+    model["cox"] = area[:, None] * cox_per_area / 2
+    model["csub"] = area[:, None] * csub_per_area / 2
+
+    with np.errstate(divide="ignore"):
+        model["rsub"] = 2 / (area[:, None] * gsub_per_area)
+
+    return model
+
+def write_csv(output_file: str, model: np.ndarray):
+
+    """
+    Writes a π-model of one inductor as a CSV table with a column per field.
+
+    Args:
+        output_file: Path of the CSV file.
+        model: Structured array of dtype PI_MODEL_DTYPE and shape (frequencies,).
+    """
+
+    np.savetxt(
+        output_file,
+        rfn.structured_to_unstructured(model),
+        delimiter=",",
+        header=",".join(model.dtype.names),
+        comments="",
+    )
@@ -0,0 +1,488 @@
+import contextlib
+import copy
+import json
+import os
+import sqlite3
+import threading
+import serialization
+
+# FILE EXTENSION OF THE PROJECTS STORED IN SQLITE
+EXTENSION = ".indb"
+
+# FILE EXTENSION OF THE JOURNALS OF .indc PROJECTS, AND THE SIZE PAST WHICH THEY ARE FOLDED INTO THE SNAPSHOT
+JOURNAL_EXTENSION = ".indj"
+JOURNAL_MAX_BYTES = 1024 * 1024
+
+# ENCODER OF THE ROW DATA, SHARED SO IT IS NOT REBUILT FOR EVERY ROW
+ENCODER = json.JSONEncoder(ensure_ascii=False)
+
+# TECHFILE LISTS STORED ROW BY ROW
+LAYER_TYPES = ("layer", "metal", "via")
+
+# KEY AND VALUE COLUMNS OF EVERY TABLE. SECTIONS HOLD THE TOP LEVEL PROJECT KEYS OTHER THAN INDUCTORS AND TECHFILES
+COLUMNS = {
+    "inductors": (("name",), ("position", "data")),
+    "techfiles": (("name",), ("position", "data")),
+    "layers": (("techfile", "type", "id"), ("data",)),
+    "sections": (("name",), ("position", "data")),
+}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS inductors (name TEXT PRIMARY KEY, position REAL NOT NULL, data TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS techfiles (name TEXT PRIMARY KEY, position REAL NOT NULL, data TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS layers (techfile TEXT NOT NULL, type TEXT NOT NULL, id INTEGER NOT NULL, data TEXT NOT NULL, PRIMARY KEY (techfile, type, id));
+CREATE TABLE IF NOT EXISTS sections (name TEXT PRIMARY KEY, position REAL NOT NULL, data TEXT NOT NULL);
+"""
+
+def journal_path(file_path: str) -> str:
+
+    """
+    Gets the path of the journal of an .indc project.
+    """
+
+    return os.path.splitext(file_path)[0] + JOURNAL_EXTENSION
+
+def named_positions(names: list[str], previous: dict[str, float]) -> dict[str, float]:
+
+    """
+    Gets the positions ordering named rows, moving as few stored rows as possible.
+
+    The stored rows keep their positions while they stay in increasing order, and the
+    others are spread between their neighbours, so adding, removing or renaming a row
+    leaves every other row untouched. The positions are renumbered only when a gap runs
+    out of floating point resolution.
+
+    Args:
+        names: Row names in their order.
+        previous: Stored positions by row name.
+
+    Returns:
+        Positions by row name.
+    """
+
+    positions: list[float] = [None] * len(names)
+
+    last = float("-inf")
+    for i, name in enumerate(names):
+        if name in previous and previous[name] > last:
+            positions[i] = last = previous[name]
+
+    anchors = [i for i, position in enumerate(positions) if position is not None]
+
+    # ROWS BEFORE THE FIRST ANCHOR, BETWEEN TWO ANCHORS AND AFTER THE LAST ONE
+    for low_index, high_index in zip([-1, *anchors], [*anchors, len(names)]):
+        count = high_index - low_index - 1
+        if not count:
+            continue
+
+        if low_index == -1 and high_index == len(names):
+            low, high = -1.0, float(count)
+        elif low_index == -1:
+            low, high = positions[high_index] - count - 1, positions[high_index]
+        elif high_index == len(names):
+            low, high = positions[low_index], positions[low_index] + count + 1
+        else:
+            low, high = positions[low_index], positions[high_index]
+
+        for k in range(1, count + 1):
+            positions[low_index + k] = low + (high - low) * k / (count + 1)
+
+    if any(first >= second for first, second in zip(positions, positions[1:])):
+        positions = [float(i) for i in range(len(names))]
+
+    return dict(zip(names, positions))
+
+def project_rows(project: dict[str, dict[str, dict]], previous: dict[tuple, tuple] = None) -> dict[tuple, tuple]:
+
+    """
+    Splits a project into rows, keyed by their table and key columns.
+
+    Inductors, techfiles and other sections get a row each, holding their data as JSON,
+    and every layer, metal and via of a techfile gets its own row. A techfile row keeps
+    its layer lists as null placeholders, which preserves the key order.
+
+    Args:
+        project: Project data, as stored in an .indc file.
+        previous: Rows the positions are kept from.
+
+    Returns:
+        Values of the value columns by row key.
+    """
+
+    previous = previous or dict()
+
+    sections = {
+        "inductors": project["inductors"],
+        "techfiles": {
+            techfile_name: {key: None if key in LAYER_TYPES else value for key, value in techfile.items()}
+            for techfile_name, techfile in project["techfiles"].items()
+        },
+        "sections": {key: value for key, value in project.items() if key not in ("inductors", "techfiles")},
+    }
+
+    rows: dict[tuple, tuple] = dict()
+
+    for table, items in sections.items():
+        positions = named_positions(list(items), {key[1]: value[0] for key, value in previous.items() if key[0] == table})
+        for name, data in items.items():
+            rows[(table, name)] = (positions[name], ENCODER.encode(data))
+
+    for techfile_name, techfile in project["techfiles"].items():
+        for layer_type in LAYER_TYPES:
+            for layer_id, layer in enumerate(techfile.get(layer_type) or []):
+                rows[("layers", techfile_name, layer_type, layer_id)] = (ENCODER.encode(layer),)
+
+    return rows
+
+def build_project(rows: dict[tuple, tuple]) -> dict[str, dict[str, dict]]:
+
+    """
+    Joins rows back into a project, as stored in an .indc file.
+    """
+
+    def named(table: str) -> dict[str]:
+        items = sorted(((value[0], key[1], value[1]) for key, value in rows.items() if key[0] == table))
+        return {name: json.loads(data) for position, name, data in items}
+
+    layers: dict[tuple[str, str], list[dict[str]]] = dict()
+    for key, value in sorted((key, value) for key, value in rows.items() if key[0] == "layers"):
+        layers.setdefault(key[1:3], []).append(json.loads(value[0]))
+
+    techfiles = {
+        techfile_name: {
+            key: layers.get((techfile_name, key), []) if key in LAYER_TYPES and value is None else value
+            for key, value in techfile.items()
+        }
+        for techfile_name, techfile in named("techfiles").items()
+    }
+
+    return {"inductors": named("inductors"), "techfiles": techfiles, **named("sections")}
+
+def diff_rows(old: dict[tuple, tuple], new: dict[tuple, tuple]) -> tuple[dict[tuple, tuple], list[tuple]]:
+
+    """
+    Gets the rows to write, new or changed, and the keys of the rows to delete.
+    """
+
+    changed = {key: value for key, value in new.items() if old.get(key) != value}
+    removed = [key for key in old if key not in new]
+
+    return changed, removed
+
+class ProjectStore:
+
+    """
+    Project stored in a SQLite database, one row per inductor, techfile and techfile layer.
+
+    The store keeps the rows it last read or wrote, so saving a project only writes the
+    rows that changed: editing one inductor is a single UPDATE, whatever the size of the
+    project.
+
+    Attributes:
+        file_path (str): Path of the database.
+        rows (dict[tuple, tuple]): Rows in the database, once read.
+    """
+
+    def __init__(self, file_path: str):
+
+        self.file_path = file_path
+        self.rows: dict[tuple, tuple] = None
+
+    def connect(self) -> sqlite3.Connection:
+
+        """
+        Opens the database, creating its tables if needed.
+        """
+
+        connection = sqlite3.connect(self.file_path)
+        connection.executescript(SCHEMA)
+
+        return connection
+
+    def create(self):
+
+        """
+        Creates the database of an empty project.
+        """
+
+        with contextlib.closing(self.connect()):
+            self.rows = dict()
+
+    def read_rows(self) -> dict[tuple, tuple]:
+
+        """
+        Reads every row of the database.
+        """
+
+        rows: dict[tuple, tuple] = dict()
+
+        with contextlib.closing(self.connect()) as connection:
+            for table, (key_columns, value_columns) in COLUMNS.items():
+                for record in connection.execute(f"SELECT {', '.join(key_columns + value_columns)} FROM {table}"):
+                    rows[(table, *record[:len(key_columns)])] = tuple(record[len(key_columns):])
+
+        return rows
+
+    def load(self) -> dict[str, dict[str, dict]]:
+
+        """
+        Reads the project from the database.
+        """
+
+        self.rows = self.read_rows()
+
+        return build_project(self.rows)
+
+    def save(self, project: dict[str, dict[str, dict]]) -> int:
+
+        """
+        Writes the rows of a project that differ from the database, in one transaction.
+
+        Args:
+            project: Project data, as stored in an .indc file.
+
+        Returns:
+            Number of rows inserted, updated or deleted.
+        """
+
+        if self.rows is None:
+            self.rows = self.read_rows()
+
+        rows = project_rows(project, previous=self.rows)
+        changed, removed = diff_rows(self.rows, rows)
+
+        if not changed and not removed:
+            return 0
+
+        with contextlib.closing(self.connect()) as connection, connection:
+            for key in removed:
+                key_columns = COLUMNS[key[0]][0]
+                connection.execute(f"DELETE FROM {key[0]} WHERE {' AND '.join(f'{column} = ?' for column in key_columns)}", key[1:])
+
+            for key, value in changed.items():
+                key_columns, value_columns = COLUMNS[key[0]]
+                if key in self.rows:
+                    connection.execute(
+                        f"UPDATE {key[0]} SET {', '.join(f'{column} = ?' for column in value_columns)} "
+                        f"WHERE {' AND '.join(f'{column} = ?' for column in key_columns)}",
+                        (*value, *key[1:]),
+                    )
+                else:
+                    connection.execute(
+                        f"INSERT INTO {key[0]} ({', '.join(key_columns + value_columns)}) VALUES ({', '.join('?' * len(key_columns + value_columns))})",
+                        (*key[1:], *value),
+                    )
+
+        self.rows = rows
+
+        return len(changed) + len(removed)
+
+class ProjectJournal:
+
+    """
+    Project stored as an .indc snapshot followed by an append-only journal of row changes.
+
+    Every save appends one JSON line with the rows it sets and deletes, as split by
+    project_rows, so its cost depends on the change rather than on the project. Loading
+    replays the journal over the snapshot.
+
+    Once the journal outgrows its size bound, a fold record is appended and a background
+    thread writes the current project as the new snapshot, then keeps only the records
+    after the fold. The first line of the journal holds the digest of its snapshot, so a
+    crash between both writes is recovered by replaying from the fold only.
+
+    Attributes:
+        file_path (str): Path of the .indc snapshot.
+        journal_path (str): Path of the journal.
+        max_bytes (int): Size of the journal past which it is folded into the snapshot.
+        rows (dict[tuple, tuple]): Rows of the project, once read.
+        size (int): Size of the journal in bytes.
+        lock (threading.Lock): Lock shared with the compaction thread.
+        compaction (threading.Thread): Last compaction thread.
+    """
+
+    def __init__(self, file_path: str, max_bytes: int = JOURNAL_MAX_BYTES):
+
+        self.file_path = file_path
+        self.journal_path = journal_path(file_path)
+        self.max_bytes = max_bytes
+        self.rows: dict[tuple, tuple] = None
+        self.size = 0
+        self.lock = threading.Lock()
+        self.compaction: threading.Thread = None
+
+    def create(self):
+
+        """
+        Starts an empty journal over the current snapshot.
+        """
+
+        with open(self.file_path, "r") as file:
+            content = file.read()
+
+        with self.lock:
+            serialization.write_atomic(self.journal_path, json.dumps({"snapshot": serialization.digest(content)}) + "\n")
+            self.rows = None
+
+    def append(self, record: dict[str]):
+
+        """
+        Appends a record to the journal and syncs it. Must be called holding the lock.
+        """
+
+        line = json.dumps(record, ensure_ascii=False) + "\n"
+
+        with open(self.journal_path, "a") as file:
+            file.write(line)
+            file.flush()
+            os.fsync(file.fileno())
+
+        self.size = os.path.getsize(self.journal_path)
+
+    def load(self) -> dict[str, dict[str, dict]]:
+
+        """
+        Reads the snapshot and replays the journal over it.
+
+        Raises:
+            ValueError: If the journal has no snapshot record or does not belong to the snapshot.
+        """
+
+        with self.lock:
+            with open(self.file_path, "r") as file:
+                content = file.read()
+            with open(self.journal_path, "r") as file:
+                lines = file.read().split("\n")
+
+            # A TORN LAST RECORD WAS NEVER ACKNOWLEDGED, SO IT IS DROPPED BEFORE ANYTHING IS APPENDED AFTER IT
+            if lines[-1]:
+                try:
+                    json.loads(lines[-1])
+                except json.JSONDecodeError:
+                    lines[-1] = ""
+                    serialization.write_atomic(self.journal_path, "\n".join(lines))
+
+            lines = [line for line in lines if line]
+            records = [json.loads(line) for line in lines]
+            snapshot_digest = serialization.digest(content)
+
+            # THE SNAPSHOT RECORD IS WRITTEN ATOMICALLY, SO A JOURNAL WITHOUT IT WAS DAMAGED FROM OUTSIDE
+            if not records or "snapshot" not in records[0]:
+                raise ValueError(f"Journal has no snapshot: {self.journal_path}")
+
+            # THE SNAPSHOT WAS ALREADY REPLACED BY THE LAST FOLD, BUT NOT THE JOURNAL
+            if records[0]["snapshot"] != snapshot_digest:
+                folds = [i for i, record in enumerate(records) if "fold" in record]
+                if len(folds) != 1:
+                    raise ValueError(f"The journal does not belong to the project: {self.journal_path}")
+
+                records = [{"snapshot": snapshot_digest}, *records[folds[0] + 1:]]
+                serialization.write_atomic(self.journal_path, "".join(f"{line}\n" for line in [json.dumps(records[0]), *lines[folds[0] + 1:]]))
+
+            self.size = os.path.getsize(self.journal_path)
+
+        rows = project_rows(serialization.load(content))
+
+        for record in records[1:]:
+            if "fold" in record:
+                rows = project_rows(build_project(rows))
+                continue
+
+            for key in record["delete"]:
+                rows.pop(tuple(key), None)
+            for key, value in record["set"]:
+                rows[tuple(key)] = tuple(value)
+
+        self.rows = rows
+
+        return build_project(rows)
+
+    def save(self, project: dict[str, dict[str, dict]]) -> int:
+
+        """
+        Appends the rows of a project that changed to the journal, and starts a compaction
+        once the journal outgrows its size bound.
+
+        Args:
+            project: Project data, as stored in an .indc file.
+
+        Returns:
+            Number of rows set or deleted.
+        """
+
+        if self.rows is None:
+            self.load()
+
+        with self.lock:
+            rows = project_rows(project, previous=self.rows)
+            changed, removed = diff_rows(self.rows, rows)
+
+            if not changed and not removed:
+                return 0
+
+            self.append({"set": [[list(key), list(value)] for key, value in changed.items()], "delete": [list(key) for key in removed]})
+            self.rows = rows
+
+        if self.size > self.max_bytes and not (self.compaction and self.compaction.is_alive()):
+            self.compact(project)
+
+        return len(changed) + len(removed)
+
+    def compact(self, project: dict[str, dict[str, dict]], wait: bool = False):
+
+        """
+        Folds the journal into a new snapshot of a project, in a background thread.
+
+        Args:
+            project: Current project data.
+            wait: Whether to wait for the new snapshot to be written.
+        """
+
+        if self.compaction:
+            self.compaction.join()
+
+        # FROM THE FOLD ON, THE ROWS ARE NUMBERED AS THEY WILL BE READ FROM THE NEW SNAPSHOT
+        with self.lock:
+            self.append({"fold": True})
+            snapshot = copy.deepcopy(project)
+            self.rows = project_rows(snapshot)
+
+        self.compaction = threading.Thread(target=self.write_snapshot, args=(snapshot,))
+        self.compaction.start()
+
+        if wait:
+            self.compaction.join()
+
+    def write_snapshot(self, snapshot: dict[str, dict[str, dict]]):
+
+        """
+        Replaces the snapshot, then drops the journal records it holds.
+        """
+
+        content = serialization.dump(snapshot)
+
+        with self.lock:
+            serialization.write_atomic(self.file_path, content)
+
+            with open(self.journal_path, "r") as file:
+                lines = file.read().split("\n")
+
+            fold = max(i for i, line in enumerate(lines) if line and "fold" in json.loads(line))
+            header = json.dumps({"snapshot": serialization.digest(content)})
+
+            serialization.write_atomic(self.journal_path, "\n".join([header, *lines[fold + 1:]]))
+            self.size = os.path.getsize(self.journal_path)
+
+    def detach(self, project: dict[str, dict[str, dict]]):
+
+        """
+        Writes a project as the snapshot and removes the journal, leaving a plain .indc file.
+        """
+
+        if self.compaction:
+            self.compaction.join()
+
+        with self.lock:
+            serialization.write_atomic(self.file_path, serialization.dump(project))
+            os.remove(self.journal_path)
+            self.rows = None
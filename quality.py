@@ -0,0 +1,112 @@
+import numpy as np
+import pi_model
+
+def input_admittance(model: np.ndarray) -> np.ndarray:
+
+    """
+    Gets the admittance in S seen at one port of π-models with the other port grounded.
+
+    Args:
+        model: Structured array of dtype PI_MODEL_DTYPE.
+    """
+
+    omega = 2 * np.pi * model["frequency"]
+
+    # nH TO H AND fF TO F
+    series_impedance = model["rs"] + 1j * omega * model["ls"] * 1e-9
+    oxide_impedance = 1 / (1j * omega * model["cox"] * 1e-15)
+    substrate_impedance = 1 / (1 / model["rsub"] + 1j * omega * model["csub"] * 1e-15)
+
+    return 1 / series_impedance + 1j * omega * model["cs"] * 1e-15 + 1 / (oxide_impedance + substrate_impedance)
+
+def quality_factor(model: np.ndarray) -> np.ndarray:
+
+    """
+    Gets the quality factors of π-models, as -Im(Y11) / Re(Y11) with the other port grounded.
+
+    Args:
+        model: Structured array of dtype PI_MODEL_DTYPE.
+
+    Returns:
+        Quality factors with the shape of the model.
+    """
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        admittance = input_admittance(model)
+
+        return -admittance.imag / admittance.real
+
+def self_resonance(frequencies: np.ndarray, quality: np.ndarray) -> np.ndarray:
+
+    """
+    Gets the self-resonant frequencies, where the quality factors first fall to zero.
+
+    Args:
+        frequencies: Increasing frequencies in Hz.
+        quality: Quality factors of shape (inductors, frequencies).
+
+    Returns:
+        Frequencies in Hz, linearly interpolated between the grid points. Inductors that do
+        not resonate within the grid get NaN.
+    """
+
+    if quality.shape[1] < 2:
+        return np.full(len(quality), np.nan)
+
+    inductive = quality > 0
+    crossings = inductive[:, :-1] & (quality[:, 1:] <= 0)
+
+    index = np.argmax(crossings, axis=1)
+    rows = np.arange(len(quality))
+
+    q0, q1 = quality[rows, index], quality[rows, index + 1]
+    f0, f1 = frequencies[index], frequencies[index + 1]
+
+    return np.where(crossings.any(axis=1), f0 + (f1 - f0) * q0 / (q0 - q1), np.nan)
+
+def analyze(
+        inductors: dict[str, dict[str]],
+        techfiles: dict[str, dict[str, list[dict[str]]]],
+        frequencies,
+        inductances=None,
+    ) -> dict[str, np.ndarray]:
+
+    """
+    Gets the quality factors and self-resonant frequencies of many inductors at once.
+
+    The π-models of every inductor over every frequency are extracted and evaluated in a
+    single broadcast, so ranking a whole project at one frequency is a single call with
+    a one-element frequency grid.
+
+    Args:
+        inductors: Inductor parameters by inductor name, as stored in a project.
+        techfiles: Techfiles by techfile name, as stored in a project.
+        frequencies: Increasing frequencies in Hz.
+        inductances: Series inductances in nH of the inductors, passed to pi_model.extract.
+
+    Returns:
+        Inductor names ("name"), quality factors of shape (inductors, frequencies) ("q"),
+        peak quality factors ("peak_q"), frequencies of the peaks in Hz ("peak_frequency")
+        and self-resonant frequencies in Hz ("self_resonance"), in the order of the
+        inductors. Inductors whose π-model can not be extracted get NaN.
+
+    Raises:
+        ValueError: If a metal references a layer that does not exist.
+    """
+
+    frequencies = np.atleast_1d(np.asarray(frequencies, dtype=float))
+    model = pi_model.extract(inductors=inductors, techfiles=techfiles, frequencies=frequencies, inductances=inductances)
+
+    quality = quality_factor(model)
+
+    # THE PEAK OF A ROW WITHOUT ANY VALID POINT IS NaN
+    valid = ~np.isnan(quality).all(axis=1)
+    peak = np.argmax(np.where(np.isnan(quality), -np.inf, quality), axis=1)
+
+    return {
+        "name": np.array(list(inductors)),
+        "q": quality,
+        "peak_q": np.where(valid, quality[np.arange(len(quality)), peak], np.nan),
+        "peak_frequency": np.where(valid, frequencies[peak], np.nan),
+        "self_resonance": self_resonance(frequencies, quality),
+    }
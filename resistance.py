@@ -0,0 +1,250 @@
+import numpy as np
+import converter
+import geometry
+import spiral
+
+# A RIGHT-ANGLE CORNER CONDUCTS AS 0.56 SQUARES INSTEAD OF ONE
+CORNER_SQUARES = 0.56
+
+def square_trace_squares(length, width, space, turns) -> np.ndarray:
+
+    """
+    Gets the number of squares of square spiral traces in closed form.
+
+    Segment i of the outer edge has length L - p max(0, (i - 1) // 2), so the n segments
+    add up to n L - p floor((n - 2) / 2) ceil((n - 2) / 2). The center line is one width
+    shorter per corner, and every corner counts as CORNER_SQUARES.
+
+    Args:
+        length: External lengths of the square inductors.
+        width: Widths of the metal traces.
+        space: Spaces between base metal traces.
+        turns: Numbers of turns.
+
+    Returns:
+        Number of squares of each trace.
+    """
+
+    length = np.asarray(length, dtype=float)
+    width = np.asarray(width, dtype=float)
+    pitch = np.asarray(space, dtype=float) + width
+
+    segments = np.rint(np.asarray(turns, dtype=float) * 4)
+    corners = segments - 1
+    edge_length = segments * length - pitch * np.floor((segments - 2) / 2) * np.ceil((segments - 2) / 2)
+
+    return edge_length / width - (2 - CORNER_SQUARES) * corners
+
+def square_exit_length(width, space, turns) -> np.ndarray:
+
+    """
+    Gets the length of the exit metal traces of square spirals, as drawn by Spiral.square_cell.
+
+    Args:
+        width: Widths of the metal traces.
+        space: Spaces between base metal traces.
+        turns: Numbers of turns.
+    """
+
+    pitch = np.asarray(space, dtype=float) + np.asarray(width, dtype=float)
+    segments = np.rint(np.asarray(turns, dtype=float) * 4)
+
+    # THE EXIT OF A SPIRAL ENDING ON THE WEST SIDE RUNS ONE MORE PITCH
+    return np.rint(turns) * pitch + np.where((segments - 1) % 4 == 0, pitch, 0)
+
+def polygon_trace_lengths(
+        length: float | int,
+        width: float | int,
+        space: float | int,
+        turns: float | int,
+        sides: int,
+        continuous: bool = False,
+    ) -> tuple[float, float]:
+
+    """
+    Gets the center line length and the exit metal length of a polygon spiral.
+
+    Their obtuse corners barely crowd the current, so they are counted as plain length.
+    """
+
+    path = geometry.polygon_spiral_path(length=length, width=width, space=space, turns=turns, sides=sides, continuous=continuous)
+    center_line = geometry.offset_path(path=path, distance=width / 2)
+    pad, exit_rectangle, slanted = geometry.polygon_spiral_exit(path=path, length=length, width=width, space=space)
+
+    return float(np.hypot(*np.diff(center_line, axis=0).T).sum()), max(exit_rectangle[2], exit_rectangle[3])
+
+def via_stack_resistance(
+        techfile: dict[str, list[dict[str]]],
+        base_metal_index: int,
+        exit_metal_index: int,
+        width: float | int,
+    ) -> float:
+
+    """
+    Gets the resistance of the via stack joining the base metal to the exit metal.
+
+    Every level is a square array of via_count² cuts in parallel, and the levels are in series.
+
+    Args:
+        techfile: Techfile containing the vias.
+        base_metal_index: Index of the base metal.
+        exit_metal_index: Index of the exit metal.
+        width: Width of the metal traces.
+
+    Returns:
+        Resistance in Ω, infinite if a level has no room for a single cut.
+
+    Raises:
+        ValueError: If a via of the stack has no resistance.
+    """
+
+    techfile = converter.default_techfile(techfile)
+
+    resistance = 0.0
+    for i in range(min(base_metal_index, exit_metal_index), max(base_metal_index, exit_metal_index)):
+        via = techfile["via"][i]
+        cuts = spiral.via_count(via=via, width=width) ** 2
+        resistance += via["resistance"] / cuts if cuts > 0 else np.inf
+
+    return resistance
+
+def square_resistances(
+        length,
+        width,
+        space,
+        turns,
+        techfile: dict[str, list[dict[str]]],
+        base_metal_index: int,
+        exit_metal_index: int,
+    ) -> dict[str, np.ndarray]:
+
+    """
+    Extracts the DC resistance of square spirals sharing a techfile and metals, from arrays.
+
+    Args:
+        length: External lengths of the square inductors.
+        width: Widths of the metal traces.
+        space: Spaces between base metal traces.
+        turns: Numbers of turns.
+        techfile: Techfile of the inductors.
+        base_metal_index: Index of the base metal.
+        exit_metal_index: Index of the exit metal.
+
+    Returns:
+        Number of squares and resistances in Ω, as returned by dc_resistance, without the names.
+
+    Raises:
+        ValueError: If a metal has no sheet resistance or a via has no resistance.
+    """
+
+    techfile = converter.default_techfile(techfile)
+    width = np.asarray(width, dtype=float)
+
+    # SHEET RESISTANCES ARE IN mΩ PER SQUARE
+    trace_squares = square_trace_squares(length, width, space, turns)
+    trace = techfile["metal"][base_metal_index]["sheet_resistance"] / 1000 * trace_squares
+    exit = techfile["metal"][exit_metal_index]["sheet_resistance"] / 1000 * square_exit_length(width, space, turns) / width
+
+    # ONE VIA STACK PER DISTINCT WIDTH
+    widths, inverse = np.unique(width, return_inverse=True)
+    vias = np.array([via_stack_resistance(techfile, base_metal_index, exit_metal_index, value) for value in widths])[inverse.reshape(width.shape)]
+
+    return {
+        "squares": trace_squares,
+        "trace": trace,
+        "exit": exit,
+        "vias": vias,
+        "total": trace + exit + vias,
+    }
+
+def dc_resistance(
+        inductors: dict[str, dict[str]],
+        techfiles: dict[str, dict[str, list[dict[str]]]],
+    ) -> dict[str, np.ndarray]:
+
+    """
+    Extracts the DC resistance of many inductors at once.
+
+    Square spirals are computed together in closed form, polygon spirals from their
+    paths. Symmetric spirals and turns that do not fit are not supported and get NaN.
+
+    Args:
+        inductors: Inductor parameters by inductor name, as stored in a project.
+        techfiles: Techfiles by techfile name, as stored in a project.
+
+    Returns:
+        Inductor names ("name"), the number of squares of their base metal traces ("squares")
+        and the resistances in Ω of their base metal traces ("trace"), exit metal traces
+        ("exit"), via stacks ("vias") and in total ("total"), in the order of the inductors.
+
+    Raises:
+        ValueError: If a metal has no sheet resistance or a via has no resistance.
+    """
+
+    names = list(inductors)
+    count = len(names)
+
+    # TECHFILES GIVEN BY CONDUCTIVITY OR RESISTIVITY ARE CONVERTED ONCE
+    techfiles = {techfile_name: converter.default_techfile(techfiles[techfile_name]) for techfile_name in {inductors[name]["techfile_name"] for name in names}}
+
+    length, width, space, turns = (np.array([float(inductors[name][key]) for name in names]) for key in ("length", "width", "space", "turns"))
+    base_sheet, exit_sheet, vias = np.empty(count), np.empty(count), np.empty(count)
+    trace_squares, exit_squares = np.full(count, np.nan), np.full(count, np.nan)
+    shapes = np.array([inductors[name].get("shape", "square").lower() for name in names])
+
+    # GATHERING THE TECHFILE DATA OF EACH INDUCTOR, ONCE PER DISTINCT STACK
+    stacks: dict[tuple, tuple[float, float, float]] = dict()
+
+    for i, name in enumerate(names):
+        inductor = inductors[name]
+
+        key = (inductor["techfile_name"], inductor["base_metal"].upper(), inductor["exit_metal"].upper(), width[i])
+        if key not in stacks:
+            techfile = techfiles[inductor["techfile_name"]]
+
+            base_metal_index = spiral.get_metal_index(techfile=techfile, metal_name=inductor["base_metal"])
+            exit_metal_index = spiral.get_metal_index(techfile=techfile, metal_name=inductor["exit_metal"])
+
+            # SHEET RESISTANCES ARE IN mΩ PER SQUARE
+            stacks[key] = (
+                techfile["metal"][base_metal_index]["sheet_resistance"] / 1000,
+                techfile["metal"][exit_metal_index]["sheet_resistance"] / 1000,
+                via_stack_resistance(techfile, base_metal_index, exit_metal_index, width[i]),
+            )
+
+        base_sheet[i], exit_sheet[i], vias[i] = stacks[key]
+
+        if shapes[i] in ("octagonal", "circular"):
+            sides = 8 if shapes[i] == "octagonal" else int(inductor.get("points_per_turn", 64))
+            try:
+                trace_length, exit_length = polygon_trace_lengths(
+                    length=length[i],
+                    width=width[i],
+                    space=space[i],
+                    turns=turns[i],
+                    sides=sides,
+                    continuous=shapes[i] == "circular",
+                )
+            except ValueError:
+                continue
+            trace_squares[i] = trace_length / width[i]
+            exit_squares[i] = exit_length / width[i]
+
+    # SQUARE SPIRALS IN A SINGLE PASS
+    square = shapes == "square"
+    trace_squares[square] = square_trace_squares(length[square], width[square], space[square], turns[square])
+    exit_squares[square] = square_exit_length(width[square], space[square], turns[square]) / width[square]
+
+    vias[np.isnan(trace_squares)] = np.nan
+
+    trace = base_sheet * trace_squares
+    exit = exit_sheet * exit_squares
+
+    return {
+        "name": np.array(names),
+        "squares": trace_squares,
+        "trace": trace,
+        "exit": exit,
+        "vias": vias,
+        "total": trace + exit + vias,
+    }
@@ -0,0 +1,94 @@
+import hashlib
+import os
+import stat
+import tempfile
+import yaml
+
+# LIBYAML LOADER AND DUMPER WHEN PYYAML WAS BUILT WITH IT, WITH THE SAME SAFE TAG SET AS THE PURE PYTHON ONES
+LIBYAML = hasattr(yaml, "CSafeLoader") and hasattr(yaml, "CSafeDumper")
+LOADER = yaml.CSafeLoader if LIBYAML else yaml.SafeLoader
+DUMPER = yaml.CSafeDumper if LIBYAML else yaml.SafeDumper
+
+def load(stream):
+
+    """
+    Parses a YAML document, as yaml.safe_load.
+
+    Args:
+        stream: String or open file.
+
+    Returns:
+        The plain Python data of the document.
+    """
+
+    return yaml.load(stream, Loader=LOADER)
+
+def dump(data, stream=None, **options):
+
+    """
+    Writes plain Python data as a YAML document, keeping the key order and the unicode
+    characters, as every project, techfile and CLI data file is written.
+
+    Args:
+        data: Dicts, lists and scalars to write.
+        stream: Open file receiving the document. Without it the document is returned.
+        **options: Other options of yaml.dump, such as default_flow_style.
+
+    Returns:
+        The document as a string when there is no stream.
+    """
+
+    return yaml.dump(data, stream, Dumper=DUMPER, allow_unicode=True, sort_keys=False, **options)
+
+def digest(text: str) -> str:
+
+    """
+    Gets the SHA-256 hexadecimal digest of a document, telling whether its content changed.
+    """
+
+    return hashlib.sha256(text.encode()).hexdigest()
+
+def write_atomic(file_path: str, text: str):
+
+    """
+    Writes a text file without ever leaving it torn.
+
+    The text is written and synced into a temporary file in the same directory, which
+    then replaces the file in a single rename, keeping its permissions. A crash leaves
+    either the old or the new content.
+
+    Args:
+        file_path: Path of the file.
+        text: New content of the file.
+    """
+
+    directory = os.path.dirname(os.path.abspath(file_path))
+
+    descriptor, temporary_path = tempfile.mkstemp(dir=directory, prefix=".", suffix=".tmp")
+    try:
+        with os.fdopen(descriptor, "w") as file:
+            file.write(text)
+            file.flush()
+            os.fsync(file.fileno())
+
+        if os.path.exists(file_path):
+            os.chmod(temporary_path, stat.S_IMODE(os.stat(file_path).st_mode))
+
+        os.replace(temporary_path, file_path)
+    except BaseException:
+        if os.path.exists(temporary_path):
+            os.remove(temporary_path)
+        raise
+
+    # SYNCING THE RENAME, WHERE DIRECTORIES CAN BE OPENED
+    try:
+        directory_descriptor = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return
+
+    try:
+        os.fsync(directory_descriptor)
+    except OSError:
+        pass
+    finally:
+        os.close(directory_descriptor)
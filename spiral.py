@@ -1,18 +1,284 @@
 import math
-import gdsfactory as gf
+import gds
+import geometry
 import os
-import cli
 import time
+import zlib
+from collections import OrderedDict
+import numpy as np
+
+GDS_BACKENDS = ("native", "gdsfactory")
+TRACE_MODES = ("rectangles", "polygon", "path")
+SHAPES = ("square", "octagonal", "circular", "symmetric")
+
+# BUMP WHENEVER THE DRAWN GEOMETRY CHANGES, SO CACHED DRAWINGS ARE NOT REUSED
+GENERATOR_VERSION = 1
 
 def magnitude(number: float):
     if number == 0:
         return 0
     return int(math.floor(math.log10(abs(number))))
 
+class Progress:
+
+    """
+    Reports the progress of a drawing to a callback, at most once per interval.
+
+    The first and the last reports (0 and 1) are always delivered, so callers
+    can rely on them to reset or finish their progress displays.
+    """
+
+    def __init__(self, callback: callable = None, interval: float = 0.1):
+
+        """
+        Args:
+            callback: Function receiving the progress as a fraction between 0 and 1.
+            interval: Minimum time in seconds between two reports.
+        """
+
+        self.callback = callback
+        self.interval = interval
+        self.last_report = -math.inf
+
+    def __call__(self, fraction: float):
+
+        if self.callback is None:
+            return
+
+        now = time.monotonic()
+        if fraction in (0, 1) or now - self.last_report >= self.interval:
+            self.last_report = now
+            self.callback(fraction)
+
+def via_count(via: dict[str], width: float | int) -> int:
+
+    """
+    Gets the number of via cuts per row of the square via array filling a trace-wide pad.
+
+    Args:
+        via: Via element of a techfile.
+        width: Width of the metal traces connected by the vias.
+    """
+
+    v_mw = via["min_width"]
+    v_s = via["space"] + via["space"]
+    max_enclosure = max(via["enclosure"], via["endcap_enclosure"])
+
+    return int((width - (2 * max_enclosure - v_s)) / (v_s + v_mw))
+
+class ViaCache:
+
+    """
+    Least recently used cache of via array cells.
+
+    Via arrays only depend on the via rule and on the trace width, so a cell built once
+    is placed by reference in every later drawing that uses the same rule and width.
+
+    Attributes:
+        maxsize (int): Maximum number of cells kept before the least recently used is evicted.
+        hits (int): Number of lookups served from the cache.
+        misses (int): Number of lookups that built a new cell.
+    """
+
+    def __init__(self, maxsize: int = 256):
+
+        self.maxsize = maxsize
+        self.cells: OrderedDict[tuple, gds.Cell] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def via_array(self, via: dict[str], width: float | int) -> gds.Cell:
+
+        """
+        Gets the via array filling a trace-wide square landing pad.
+
+        The array cell has its origin at the lower left corner of the landing pad.
+
+        Args:
+            via: Via element of a techfile.
+            width: Width of the metal traces connected by the vias.
+        """
+
+        via_layer = (via["gds_number"], via["gds_datatype"])
+        key = (via_layer, via["min_width"], via["space"], via["enclosure"], via["endcap_enclosure"], width)
+
+        if key in self.cells:
+            self.hits += 1
+            self.cells.move_to_end(key)
+            return self.cells[key]
+
+        self.misses += 1
+
+        v_mw = via["min_width"]
+        v_s = via["space"] + via["space"]
+        v_num = via_count(via=via, width=width)
+
+        external_spacing = (width - v_num * (v_s + v_mw) + v_s) / 2
+
+        # THE CHECKSUMS OF THE EXACT KEYS TELL APART VALUES ROUNDED TO THE SAME NAME
+        cut = gds.Cell(f"via_{via_layer[0]}_{via_layer[1]}_{v_mw:g}_{zlib.crc32(repr((via_layer, v_mw)).encode()):08x}".replace(".", "p"))
+        cut.add_rectangle(0, 0, v_mw, v_mw, layer=via_layer)
+
+        array_name = "via_array_{}_{}_{:g}_{:g}_{:g}_{:g}_{:g}_{:08x}".format(*via_layer, *key[1:], zlib.crc32(repr(key).encode()))
+        array = gds.Cell(array_name.replace(".", "p").replace("-", "m"))
+        array.add_reference(
+            cut,
+            origin=(external_spacing, external_spacing),
+            columns=v_num,
+            rows=v_num,
+            spacing=(v_s + v_mw, v_s + v_mw),
+        )
+
+        self.cells[key] = array
+        if len(self.cells) > self.maxsize:
+            self.cells.popitem(last=False)
+
+        return array
+
+    def clear(self):
+
+        self.cells.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self.cells)
+
+    def __repr__(self):
+        return f"ViaCache(cells={len(self.cells)}, maxsize={self.maxsize}, hits={self.hits}, misses={self.misses})"
+
+# SHARED BY EVERY DRAWING OF THE PROCESS, SO REPEATED AND BATCH DRAWS REUSE THE SAME VIA ARRAYS
+VIA_CACHE = ViaCache()
+
+def get_metal_index(techfile: dict[str, list[dict[str]]], metal_name: str) -> int:
+
+    """
+    Gets metal list index of techfile metals.
+
+    Args:
+        techfile: Techfile containing the metals.
+        metal_name: Name of a metal.
+    """
+
+    metal_name = metal_name.upper()
+    metals = techfile["metal"]
+
+    for i in range(len(metals)):
+        if metals[i]["name"].upper() == metal_name:
+            return i
+    return -1
+
+def to_component(cell: gds.Cell, components: dict[str] = None):
+
+    """
+    Converts a native cell, and every cell it references, into gdsfactory components.
+
+    Args:
+        cell: Native cell.
+        components: Components already converted, by cell name.
+    """
+
+    import gdsfactory as gf
+
+    if components is None:
+        components = dict()
+
+    if cell.name in components:
+        return components[cell.name]
+
+    component = gf.Component(cell.name)
+
+    for layer, polygons in cell.polygons:
+        for polygon in polygons:
+            component.add_polygon(polygon, layer=layer)
+
+    for layer, path, width in cell.paths:
+        outer_edge = geometry.offset_path(path=path, distance=-width / 2)
+        component.add_polygon(geometry.trace_outline(path=outer_edge, width=width), layer=layer)
+
+    for reference in cell.references:
+        referenced_component = to_component(reference.cell, components)
+
+        if reference.columns > 1 or reference.rows > 1:
+            referenced_component = gf.components.array(
+                referenced_component,
+                columns=reference.columns,
+                column_pitch=reference.spacing[0],
+                rows=reference.rows,
+                row_pitch=reference.spacing[1],
+            )
+
+        component_ref = component.add_ref(referenced_component)
+        if reference.x_reflection:
+            component_ref.mirror_y()
+        if reference.rotation:
+            component_ref.rotate(reference.rotation)
+        component_ref.move(reference.origin)
+
+    components[cell.name] = component
+
+    return component
+
+def write_cell(cell: gds.Cell, output_file: str, backend: str = "native", flatten: bool = False):
+
+    """
+    Writes a cell, and every cell it references, into a GDS file.
+
+    Args:
+        cell: Top cell.
+        output_file: Path of the GDS file.
+        backend: "native" for the built-in GDSII writer or "gdsfactory".
+        flatten: Whether the gdsfactory backend flattens the hierarchy before writing.
+    """
+
+    match backend:
+        case "native":
+            gds.write_gds(output_file, cell)
+        case "gdsfactory":
+            import gdsfactory as gf
+
+            gf.clear_cache()
+
+            component = to_component(cell)
+            if flatten:
+                component.flatten()
+            component.write_gds(output_file)
+        case _:
+            raise ValueError(f"Unknown GDS backend: {backend}. Use one of: {', '.join(GDS_BACKENDS)}")
+
 class Spiral:
-    def __init__(self, cli: cli.CLI):
-        
-        self.cli = cli
+    def __init__(
+            self,
+            progress: callable = None,
+            progress_interval: float = 0.1,
+            backend: str = "native",
+            trace: str = "rectangles",
+            via_cache: ViaCache = None,
+        ):
+
+        """
+        Headless inductor drawing engine.
+
+        Args:
+            progress: Optional function receiving the drawing progress as a fraction between 0 and 1.
+            progress_interval: Minimum time in seconds between two progress reports.
+            backend: GDS writer, "native" or "gdsfactory".
+            trace: How the base metal trace is drawn. "rectangles" draws one overlapping rectangle
+                per segment, "polygon" a single merged polygon and "path" a single GDS path.
+            via_cache: Cache of via array cells. Defaults to the cache shared by the whole process.
+        """
+
+        if backend not in GDS_BACKENDS:
+            raise ValueError(f"Unknown GDS backend: {backend}. Use one of: {', '.join(GDS_BACKENDS)}")
+
+        if trace not in TRACE_MODES:
+            raise ValueError(f"Unknown trace mode: {trace}. Use one of: {', '.join(TRACE_MODES)}")
+
+        self.progress = Progress(callback=progress, interval=progress_interval)
+        self.backend = backend
+        self.trace = trace
+        self.via_cache = VIA_CACHE if via_cache is None else via_cache
+        self.crossover_cells: dict[tuple, gds.Cell] = dict()
 
     def draw_square(
             self,
@@ -44,169 +310,305 @@ class Spiral:
             xy: Coordinates (x, y) of the inductor's starting position.
         """
 
-        def get_metal_index(metal_name: str) -> int:
+        self.progress(0)
 
-            """
-            Gets metal list index of techfile metals.
+        inductor = self.square_cell(
+            base_metal=base_metal,
+            exit_metal=exit_metal,
+            inductor_name=inductor_name,
+            length=length,
+            space=space,
+            techfile=techfile,
+            turns=turns,
+            width=width,
+            x=x,
+            y=y,
+            progress=self.progress,
+        )
 
-            Args:
-                metal_name: Name of a metal.
-            """
+        write_cell(inductor, output_file, backend=self.backend, flatten=True)
+        self.progress(1)
 
-            metal_name = metal_name.upper()
-            metals = techfile["metal"]
+    def draw_octagonal(
+            self,
+            base_metal: str,
+            exit_metal: str,
+            inductor_name: str,
+            length: float | int,
+            output_file: str,
+            space: float | int,
+            techfile: dict[str, list[dict[str]]],
+            turns: float | int,
+            width: float | int,
+            x: float | int,
+            y: float | int,
+        ):
 
-            for i in range(len(metals)):
-                if metals[i]["name"].upper() == metal_name:
-                    return i
-            return -1
-        
-        self.cli.progressbar.set(0)
-        
-        l = length
-        s = space
-        w = width
+        """
+        Draw an octagonal IC inductor.
 
-        gf.clear_cache()
+        Args:
+            base_metal: Name of the main inductor's structure.
+            exit_metal: Name of the exit metal of the inductor.
+            length: External length of the inductor, measured between opposite sides.
+            space: Space between base metal traces.
+            techfile: Some data of a tecnology file containing design rules, material properties, 
+                    and process parameters required for chip fabrication.
+            turns: Number of turns in the spiral inductor.
+            width: Width of the metal traces forming the inductor.
+            x: X coordinate of the lower left corner of the inductor's bounding square.
+            y: Y coordinate of the lower left corner of the inductor's bounding square.
+        """
 
-        inductor = gf.Component(inductor_name)
-        segments = round(turns * 4)
+        self.draw(
+            output_file=output_file,
+            shape="octagonal",
+            base_metal=base_metal,
+            exit_metal=exit_metal,
+            inductor_name=inductor_name,
+            length=length,
+            space=space,
+            techfile=techfile,
+            turns=turns,
+            width=width,
+            x=x,
+            y=y,
+        )
 
-        base_metal_index = get_metal_index(metal_name=base_metal)
-        base_metal_layer = (techfile["metal"][base_metal_index]["gds_number"], techfile["metal"][base_metal_index]["gds_datatype"])
+    def draw_circular(
+            self,
+            base_metal: str,
+            exit_metal: str,
+            inductor_name: str,
+            length: float | int,
+            output_file: str,
+            space: float | int,
+            techfile: dict[str, list[dict[str]]],
+            turns: float | int,
+            width: float | int,
+            x: float | int,
+            y: float | int,
+            points_per_turn: int = 64,
+        ):
 
-        exit_metal_index = get_metal_index(metal_name=exit_metal)
-        exit_metal_layer = (techfile["metal"][exit_metal_index]["gds_number"], techfile["metal"][exit_metal_index]["gds_datatype"])
+        """
+        Draw a circular IC inductor.
 
-        # DRAWING BASE METAL
-        toggle = False
-        for i in range(segments):
-
-            if toggle:
-                l -= (s + w) * (i % 2) 
-            
-            match (i % 4):
-                case 0: # WEST
-                    inductor.add_polygon(
-                        (
-                            (x, y),
-                            (x + w, y),
-                            (x + w, y + l),
-                            (x, y + l),
-                        ),
-                        layer=base_metal_layer
-                    )
-
-                    y += l
-                    
-                case 1: # NORTH
-                    inductor.add_polygon(
-                        (
-                            (x, y - w),
-                            (x + l, y - w),
-                            (x + l, y),
-                            (x, y),
-                        ),
-                        layer=base_metal_layer
-                    )
-
-                    x += l
-
-                case 2: # EAST
-                    inductor.add_polygon(
-                        (
-                            (x - w, y - l),
-                            (x, y - l),
-                            (x, y),
-                            (x - w, y),
-                        ),
-                        layer=base_metal_layer
-                    )
-                    
-                    y -= l
-
-                case 3: # SOUTH
-                    if not toggle:
-                        l -= (s + w)
-                        toggle = True
-
-                    inductor.add_polygon(
-                        (
-                            (x - l, y),
-                            (x, y),
-                            (x, y + w),
-                            (x - l, y + w),
-                        ),
-                        layer=base_metal_layer
-                    )
-
-                    x -= l
-
-            self.cli.progressbar.set((1/3) * (i/(segments - 1)))
-            self.cli.update()
+        Args:
+            base_metal: Name of the main inductor's structure.
+            exit_metal: Name of the exit metal of the inductor.
+            length: External diameter of the inductor.
+            space: Space between base metal traces.
+            techfile: Some data of a tecnology file containing design rules, material properties, 
+                    and process parameters required for chip fabrication.
+            turns: Number of turns in the spiral inductor.
+            width: Width of the metal traces forming the inductor.
+            x: X coordinate of the lower left corner of the inductor's bounding square.
+            y: Y coordinate of the lower left corner of the inductor's bounding square.
+            points_per_turn: Vertex budget per turn.
+        """
 
-        # DRAWING VIAS
-        start = min(base_metal_index, exit_metal_index)
-        end = max(base_metal_index, exit_metal_index)
+        self.draw(
+            output_file=output_file,
+            shape="circular",
+            points_per_turn=points_per_turn,
+            base_metal=base_metal,
+            exit_metal=exit_metal,
+            inductor_name=inductor_name,
+            length=length,
+            space=space,
+            techfile=techfile,
+            turns=turns,
+            width=width,
+            x=x,
+            y=y,
+        )
 
-        top_or_bottom = "top_metal" if exit_metal_index > base_metal_index else "bottom_metal"
+    def draw_symmetric(
+            self,
+            base_metal: str,
+            exit_metal: str,
+            inductor_name: str,
+            length: float | int,
+            output_file: str,
+            space: float | int,
+            techfile: dict[str, list[dict[str]]],
+            turns: float | int,
+            width: float | int,
+            x: float | int,
+            y: float | int,
+            tap_metal: str = None,
+        ):
 
-        last_segment_index = i
+        """
+        Draw a symmetric, center-tapped, square IC inductor.
 
-        via_range = end - start
+        Args:
+            base_metal: Name of the main inductor's structure.
+            exit_metal: Name of the crossovers' underpass metal.
+            length: External length of the square inductor.
+            space: Space between base metal traces.
+            techfile: Some data of a tecnology file containing design rules, material properties, 
+                    and process parameters required for chip fabrication.
+            turns: Number of rings.
+            width: Width of the metal traces forming the inductor.
+            x: X coordinate of the lower left corner of the inductor's rings.
+            y: Y coordinate of the lower left corner of the inductor's rings.
+            tap_metal: Name of the center tap metal. Without it no center tap is drawn.
+        """
 
-        for i in range(start, end):
+        self.draw(
+            output_file=output_file,
+            shape="symmetric",
+            tap_metal=tap_metal,
+            base_metal=base_metal,
+            exit_metal=exit_metal,
+            inductor_name=inductor_name,
+            length=length,
+            space=space,
+            techfile=techfile,
+            turns=turns,
+            width=width,
+            x=x,
+            y=y,
+        )
 
-            via = techfile["via"][i]
-            via_layer = (via["gds_number"], via["gds_datatype"])
+    def draw(self, output_file: str, shape: str = "square", **inductor):
 
-            v_mw = via["min_width"]
-            v_s = via["space"] + via["space"]
-            max_enclosure = max(via["enclosure"], via["endcap_enclosure"])
-            v_num = int((w - (2 * max_enclosure - v_s)) / (v_s + v_mw))
+        """
+        Draw an IC inductor of any shape.
 
-            via_componenet = gf.components.rectangle(
-                size=(v_mw, v_mw),
-                layer=via_layer,
-            )
-            via_ref = inductor.add_ref(
-                gf.components.array(
-                    via_componenet,
-                    columns=v_num,
-                    column_pitch=v_s + v_mw,
-                    rows=v_num, 
-                    row_pitch=v_s + v_mw,
-                ),
-            )
+        Args:
+            output_file: Path of the GDS file.
+            shape: "square", "octagonal", "circular" or "symmetric".
+            **inductor: Inductor parameters, as taken by inductor_cell.
+        """
 
-            external_spacing = (w - v_num * (v_s + v_mw) + v_s) / 2
+        self.progress(0)
 
-            aux_metal = techfile["metal"][via[top_or_bottom]]
-            aux_metal_layer = (aux_metal["gds_number"], aux_metal["gds_datatype"])
+        cell = self.inductor_cell(shape=shape, progress=self.progress, **inductor)
 
-            aux_metal_ref = inductor.add_ref(
-                gf.components.rectangle(
-                    size=(w, w),
-                    layer=aux_metal_layer,
-                )
+        write_cell(cell, output_file, backend=self.backend, flatten=True)
+        self.progress(1)
+
+    def draw_library(
+            self,
+            inductors: dict[str, dict[str]],
+            output_file: str,
+            library_name: str = "inductors",
+            spacing: float | int = 100,
+        ):
+
+        """
+        Draw many IC inductors into a single GDS library.
+
+        Every inductor becomes its own cell, the via arrays are shared between them and
+        a top cell places all of them on a grid.
+
+        Args:
+            inductors: Parameters of each inductor by inductor name, as taken by inductor_cell.
+            output_file: Path of the GDS file.
+            library_name: Name of the top cell.
+            spacing: Space between the inductors on the grid.
+        """
+
+        self.progress(0)
+
+        library = gds.Cell(library_name)
+
+        pitch = max(inductor["length"] for inductor in inductors.values()) + spacing
+        columns = math.ceil(math.sqrt(len(inductors)))
+
+        for i, (inductor_name, inductor) in enumerate(inductors.items()):
+
+            library.add_reference(
+                self.inductor_cell(inductor_name=inductor_name, **inductor),
+                origin=((i % columns) * pitch - inductor["x"], (i // columns) * pitch - inductor["y"]),
             )
 
-            match last_segment_index % 4:
-                case 0: # WEST
-                    via_ref.move((x + external_spacing, y - w + external_spacing))
-                    aux_metal_ref.move((x, y - w))
-                case 1: # NORTH
-                    via_ref.move((x - w + external_spacing, y - w + external_spacing))
-                    aux_metal_ref.move((x - w, y - w))
-                case 2: # EAST
-                    via_ref.move((x - w + external_spacing, y + external_spacing))
-                    aux_metal_ref.move((x - w, y))
-                case 3: # SOUTH
-                    via_ref.move((x + external_spacing, y + external_spacing))
-                    aux_metal_ref.move((x, y))
-
-            self.cli.progressbar.set((1 / 3) + ((1 / 3) * ((i - start)/(via_range))))
-            self.cli.update()
+            self.progress((i + 1) / len(inductors))
+
+        write_cell(library, output_file, backend=self.backend)
+        self.progress(1)
+
+    def square_cell(
+            self,
+            base_metal: str,
+            exit_metal: str,
+            inductor_name: str,
+            length: float | int,
+            space: float | int,
+            techfile: dict[str, list[dict[str]]],
+            turns: float | int,
+            width: float | int,
+            x: float | int,
+            y: float | int,
+            progress: callable = lambda fraction: None,
+        ) -> gds.Cell:
+
+        """
+        Build the cell of a square IC inductor.
+
+        Args:
+            base_metal: Name of the main inductor's structure.
+            exit_metal: Name of the exit metal of the inductor.
+            inductor_name: Name of the inductor cell.
+            length: External length of the square inductor.
+            space: Space between base metal traces.
+            techfile: Some data of a tecnology file containing design rules, material properties, 
+                    and process parameters required for chip fabrication.
+            turns: Number of turns in the spiral inductor.
+            width: Width of the metal traces forming the inductor.
+            x: X coordinate of the inductor's starting position.
+            y: Y coordinate of the inductor's starting position.
+            progress: Function receiving the building progress as a fraction between 0 and 1.
+        """
+
+        l = length
+        s = space
+        w = width
+
+        inductor = gds.Cell(inductor_name)
+        segments = round(turns * 4)
+
+        base_metal_index = get_metal_index(techfile=techfile, metal_name=base_metal)
+        base_metal_layer = (techfile["metal"][base_metal_index]["gds_number"], techfile["metal"][base_metal_index]["gds_datatype"])
+
+        exit_metal_index = get_metal_index(techfile=techfile, metal_name=exit_metal)
+        exit_metal_layer = (techfile["metal"][exit_metal_index]["gds_number"], techfile["metal"][exit_metal_index]["gds_datatype"])
+
+        # DRAWING BASE METAL
+        path = geometry.square_spiral_path(length=l, width=w, space=s, turns=turns, x=x, y=y)
+
+        self.add_trace(cell=inductor, path=path, width=w, layer=base_metal_layer)
+
+        x, y = path[-1]
+
+        progress(1/3)
+
+        # DRAWING VIAS
+        last_segment_index = segments - 1
+
+        match last_segment_index % 4:
+            case 0: # WEST
+                aux_x, aux_y = x, y - w
+            case 1: # NORTH
+                aux_x, aux_y = x - w, y - w
+            case 2: # EAST
+                aux_x, aux_y = x - w, y
+            case 3: # SOUTH
+                aux_x, aux_y = x, y
+
+        self.add_vias(
+            cell=inductor,
+            techfile=techfile,
+            base_metal_index=base_metal_index,
+            exit_metal_index=exit_metal_index,
+            x=aux_x,
+            y=aux_y,
+            width=w,
+            progress=progress,
+        )
 
         # DRAWING EXIT METAL
         e_l = round(turns) * (s + w)
@@ -251,10 +653,410 @@ class Spiral:
                     ),
                     layer=exit_metal_layer
                 )
-        
-        inductor.flatten()
-        inductor.write_gds(output_file)
-        self.cli.progressbar.set(1)
-        self.cli.update()
-        time.sleep(0.25)
-        self.cli.progressbar.set(0)
\ No newline at end of file
+
+        return inductor
+
+    def polygon_cell(
+            self,
+            base_metal: str,
+            exit_metal: str,
+            inductor_name: str,
+            length: float | int,
+            space: float | int,
+            techfile: dict[str, list[dict[str]]],
+            turns: float | int,
+            width: float | int,
+            x: float | int,
+            y: float | int,
+            sides: int,
+            continuous: bool = False,
+            progress: callable = lambda fraction: None,
+        ) -> gds.Cell:
+
+        """
+        Build the cell of a regular polygon IC inductor, as octagonal and circular ones.
+
+        Args:
+            base_metal: Name of the main inductor's structure.
+            exit_metal: Name of the exit metal of the inductor.
+            inductor_name: Name of the inductor cell.
+            length: External length of the inductor, measured between opposite sides.
+            space: Space between base metal traces.
+            techfile: Some data of a tecnology file containing design rules, material properties, 
+                    and process parameters required for chip fabrication.
+            turns: Number of turns in the spiral inductor.
+            width: Width of the metal traces forming the inductor.
+            x: X coordinate of the lower left corner of the inductor's bounding square.
+            y: Y coordinate of the lower left corner of the inductor's bounding square.
+            sides: Number of sides per turn.
+            continuous: Whether the spiral shrinks at every side instead of once per turn.
+            progress: Function receiving the building progress as a fraction between 0 and 1.
+        """
+
+        l = length
+        s = space
+        w = width
+
+        inductor = gds.Cell(inductor_name)
+
+        base_metal_index = get_metal_index(techfile=techfile, metal_name=base_metal)
+        base_metal_layer = (techfile["metal"][base_metal_index]["gds_number"], techfile["metal"][base_metal_index]["gds_datatype"])
+
+        exit_metal_index = get_metal_index(techfile=techfile, metal_name=exit_metal)
+        exit_metal_layer = (techfile["metal"][exit_metal_index]["gds_number"], techfile["metal"][exit_metal_index]["gds_datatype"])
+
+        # DRAWING BASE METAL
+        path = geometry.polygon_spiral_path(length=l, width=w, space=s, turns=turns, sides=sides, x=x, y=y, continuous=continuous)
+
+        self.add_trace(cell=inductor, path=path, width=w, layer=base_metal_layer, square=sides == 4)
+
+        progress(1/3)
+
+        # DRAWING VIAS ON A SQUARE PAD CENTERED ON THE END OF THE TRACE
+        (pad_x, pad_y), exit_rectangle, slanted = geometry.polygon_spiral_exit(path=path, length=l, width=w, space=s, x=x, y=y)
+
+        # A SLANTED TRACE ONLY COVERS PART OF THE PAD
+        if slanted:
+            inductor.add_rectangle(pad_x, pad_y, w, w, layer=base_metal_layer)
+
+        self.add_vias(
+            cell=inductor,
+            techfile=techfile,
+            base_metal_index=base_metal_index,
+            exit_metal_index=exit_metal_index,
+            x=pad_x,
+            y=pad_y,
+            width=w,
+            progress=progress,
+        )
+
+        # DRAWING EXIT METAL ALONG THE AXIS CLOSEST TO THE OUTWARD DIRECTION, ONE PITCH PAST THE OUTER EDGE
+        inductor.add_rectangle(*exit_rectangle, layer=exit_metal_layer)
+
+        return inductor
+
+    def octagonal_cell(self, **kwargs) -> gds.Cell:
+
+        """
+        Build the cell of an octagonal IC inductor. Keyword arguments are passed to polygon_cell.
+        """
+
+        return self.polygon_cell(sides=8, **kwargs)
+
+    def circular_cell(self, points_per_turn: int = 64, **kwargs) -> gds.Cell:
+
+        """
+        Build the cell of a circular IC inductor, approximated by a regular polygon.
+
+        Args:
+            points_per_turn: Vertex budget per turn. More vertices give a rounder spiral at
+                the cost of larger GDS files and slower downstream solvers.
+            **kwargs: Passed to polygon_cell.
+        """
+
+        return self.polygon_cell(sides=points_per_turn, continuous=True, **kwargs)
+
+    def inductor_cell(self, shape: str = "square", points_per_turn: int = 64, tap_metal: str = None, **kwargs) -> gds.Cell:
+
+        """
+        Build the cell of an IC inductor of any shape.
+
+        Args:
+            shape: "square", "octagonal", "circular" or "symmetric".
+            points_per_turn: Vertex budget per turn of circular inductors.
+            tap_metal: Name of the center tap metal of symmetric inductors.
+            **kwargs: Passed to the cell builder of the shape.
+        """
+
+        match shape.lower():
+            case "square":
+                return self.square_cell(**kwargs)
+            case "octagonal":
+                return self.octagonal_cell(**kwargs)
+            case "circular":
+                return self.circular_cell(points_per_turn=points_per_turn, **kwargs)
+            case "symmetric":
+                return self.symmetric_cell(tap_metal=tap_metal, **kwargs)
+            case _:
+                raise ValueError(f"Unknown inductor shape: {shape}. Use one of: {', '.join(SHAPES)}")
+
+    def symmetric_cell(
+            self,
+            base_metal: str,
+            exit_metal: str,
+            inductor_name: str,
+            length: float | int,
+            space: float | int,
+            techfile: dict[str, list[dict[str]]],
+            turns: float | int,
+            width: float | int,
+            x: float | int,
+            y: float | int,
+            tap_metal: str = None,
+            progress: callable = lambda fraction: None,
+        ) -> gds.Cell:
+
+        """
+        Build the cell of a symmetric, center-tapped, square IC inductor for differential circuits.
+
+        The rings are joined by crossovers whose second path runs under the base metal on the
+        exit metal. The crossover is built once as a cell and placed by reference between
+        every pair of rings, mirrored on the top side. Both ports leave the outer ring at the
+        bottom and the center tap leaves the innermost ring, between the ports when it is at
+        the bottom.
+
+        Args:
+            base_metal: Name of the main inductor's structure.
+            exit_metal: Name of the crossovers' underpass metal.
+            inductor_name: Name of the inductor cell.
+            length: External length of the square inductor.
+            space: Space between base metal traces.
+            techfile: Some data of a tecnology file containing design rules, material properties, 
+                    and process parameters required for chip fabrication.
+            turns: Number of rings, rounded to an integer.
+            width: Width of the metal traces forming the inductor.
+            x: X coordinate of the lower left corner of the inductor's rings.
+            y: Y coordinate of the lower left corner of the inductor's rings.
+            tap_metal: Name of the center tap metal. Without it no center tap is drawn.
+            progress: Function receiving the building progress as a fraction between 0 and 1.
+
+        Raises:
+            ValueError: If the rings do not fit in the length or the center tap metal does
+                not exist or is shared with the rings or the crossovers.
+        """
+
+        l = length
+        s = space
+        w = width
+        p = s + w
+        rings = max(1, round(turns))
+
+        # GAP CROSSED BY A 45 DEGREE JOG, KEEPING THE SPACE TO THE RING ENDS AND TO THE CENTER TAP
+        gap = p + w + 2 * s
+
+        if l / 2 - (rings - 1) * p < gap / 2 + 2 * w:
+            raise ValueError(f"{rings} symmetric rings of width {w:g} and space {s:g} do not fit in a length of {l:g}")
+
+        inductor = gds.Cell(inductor_name)
+
+        base_metal_index = get_metal_index(techfile=techfile, metal_name=base_metal)
+        base_metal_layer = (techfile["metal"][base_metal_index]["gds_number"], techfile["metal"][base_metal_index]["gds_datatype"])
+
+        exit_metal_index = get_metal_index(techfile=techfile, metal_name=exit_metal)
+
+        # DRAWING BASE METAL RINGS
+        left_halves, right_halves = geometry.symmetric_half_rings(length=l, width=w, space=s, turns=rings, gap=gap, x=x, y=y)
+
+        for left_half, right_half in zip(left_halves, right_halves):
+            self.add_trace(cell=inductor, path=left_half, width=w, layer=base_metal_layer, square=False)
+            self.add_trace(cell=inductor, path=right_half, width=w, layer=base_metal_layer, square=False)
+
+        progress(1/3)
+
+        # DRAWING CROSSOVERS, AT THE TOP BETWEEN RINGS 0 AND 1, AT THE BOTTOM BETWEEN RINGS 1 AND 2...
+        middle = x + l / 2
+
+        if rings > 1:
+            crossover = self.crossover_cell(
+                techfile=techfile,
+                base_metal_index=base_metal_index,
+                exit_metal_index=exit_metal_index,
+                width=w,
+                space=s,
+                gap=gap,
+            )
+
+            for ring in range(rings - 1):
+                if ring % 2 == 0:
+                    inductor.add_reference(crossover, origin=(middle, y + l - ring * p), x_reflection=True)
+                else:
+                    inductor.add_reference(crossover, origin=(middle, y + ring * p))
+
+        progress(2/3)
+
+        # DRAWING PORTS, ONE PITCH BELOW THE OUTER RING
+        inductor.add_rectangle(middle - gap / 2 - w, y - p, w, p + w, layer=base_metal_layer)
+        inductor.add_rectangle(middle + gap / 2, y - p, w, p + w, layer=base_metal_layer)
+
+        # DRAWING CENTER TAP FROM THE CLOSED SIDE OF THE INNERMOST RING
+        if tap_metal is not None:
+
+            tap_metal_index = get_metal_index(techfile=techfile, metal_name=tap_metal)
+            if tap_metal_index == -1:
+                raise ValueError(f"Metal do not exist: {tap_metal}")
+            if tap_metal_index in (base_metal_index, exit_metal_index):
+                raise ValueError(f"The center tap metal must differ from the base and exit metals: {tap_metal}")
+
+            tap_metal_layer = (techfile["metal"][tap_metal_index]["gds_number"], techfile["metal"][tap_metal_index]["gds_datatype"])
+
+            inner = (rings - 1) * p
+            if rings % 2 == 0: # BOTTOM
+                tap_y = y + inner
+                inductor.add_rectangle(middle - w / 2, y - p, w, inner + p + w, layer=tap_metal_layer)
+            else: # TOP
+                tap_y = y + l - inner - w
+                inductor.add_rectangle(middle - w / 2, tap_y, w, inner + p + w, layer=tap_metal_layer)
+
+            self.add_vias(
+                cell=inductor,
+                techfile=techfile,
+                base_metal_index=base_metal_index,
+                exit_metal_index=tap_metal_index,
+                x=middle - w / 2,
+                y=tap_y,
+                width=w,
+            )
+
+        progress(1)
+
+        return inductor
+
+    def crossover_cell(
+            self,
+            techfile: dict[str, list[dict[str]]],
+            base_metal_index: int,
+            exit_metal_index: int,
+            width: float | int,
+            space: float | int,
+            gap: float | int,
+        ) -> gds.Cell:
+
+        """
+        Gets the crossover joining two adjacent rings of a symmetric inductor, building it only once.
+
+        In the cell, the outer ring lies on y from 0 to width and the inner ring one pitch
+        above, both interrupted between -gap / 2 and gap / 2. The base metal joins the left
+        end of the outer ring to the right end of the inner one, and the exit metal the
+        right end of the outer ring to the left end of the inner one, through via stacks on
+        the ring ends.
+
+        Args:
+            techfile: Techfile containing the vias and metals.
+            base_metal_index: Index of the ring metal.
+            exit_metal_index: Index of the underpass metal.
+            width: Width of the rings.
+            space: Space between the rings.
+            gap: Width of the ring gaps.
+        """
+
+        start = min(base_metal_index, exit_metal_index)
+        end = max(base_metal_index, exit_metal_index)
+
+        key = (
+            base_metal_index,
+            exit_metal_index,
+            width,
+            space,
+            gap,
+            tuple(tuple(sorted(techfile["metal"][i].items())) for i in range(start, end + 1)),
+            tuple(tuple(sorted(techfile["via"][i].items())) for i in range(start, end)),
+        )
+
+        if key in self.crossover_cells:
+            return self.crossover_cells[key]
+
+        w = width
+        p = space + width
+        jog = p / 2
+        half_gap = gap / 2
+
+        base_metal_layer = (techfile["metal"][base_metal_index]["gds_number"], techfile["metal"][base_metal_index]["gds_datatype"])
+        exit_metal_layer = (techfile["metal"][exit_metal_index]["gds_number"], techfile["metal"][exit_metal_index]["gds_datatype"])
+
+        name = f"crossover_{w:g}_{space:g}_{zlib.crc32(repr(key).encode()):08x}".replace(".", "p")
+        crossover = gds.Cell(name)
+
+        # CENTER LINES OF BOTH PATHS, CROSSING EACH OTHER WITH 45 DEGREE JOGS
+        over = ((-half_gap, w / 2), (-jog, w / 2), (jog, p + w / 2), (half_gap, p + w / 2))
+        under = ((half_gap + w, w / 2), (jog, w / 2), (-jog, p + w / 2), (-half_gap - w, p + w / 2))
+
+        for center_line, layer in ((over, base_metal_layer), (under, exit_metal_layer)):
+            outer_edge = geometry.offset_path(path=np.array(center_line, dtype=float), distance=-w / 2)
+            self.add_trace(cell=crossover, path=outer_edge, width=w, layer=layer, square=False)
+
+        # VIA STACKS ON THE RING ENDS JOINED BY THE UNDERPASS
+        for pad_x, pad_y in ((half_gap, 0), (-half_gap - w, p)):
+            self.add_vias(
+                cell=crossover,
+                techfile=techfile,
+                base_metal_index=base_metal_index,
+                exit_metal_index=exit_metal_index,
+                x=pad_x,
+                y=pad_y,
+                width=w,
+            )
+
+        self.crossover_cells[key] = crossover
+
+        return crossover
+
+    def add_vias(
+            self,
+            cell: gds.Cell,
+            techfile: dict[str, list[dict[str]]],
+            base_metal_index: int,
+            exit_metal_index: int,
+            x: float | int,
+            y: float | int,
+            width: float | int,
+            progress: callable = lambda fraction: None,
+        ):
+
+        """
+        Adds the via stack joining the base metal to the exit metal on a square landing pad.
+
+        Args:
+            cell: Cell receiving the vias.
+            techfile: Techfile containing the vias and metals.
+            base_metal_index: Index of the base metal.
+            exit_metal_index: Index of the exit metal.
+            x: X coordinate of the lower left corner of the pad.
+            y: Y coordinate of the lower left corner of the pad.
+            width: Side of the pad, the width of the metal traces.
+            progress: Function receiving the building progress, from 1/3 to 2/3 along the stack.
+        """
+
+        start = min(base_metal_index, exit_metal_index)
+        end = max(base_metal_index, exit_metal_index)
+
+        top_or_bottom = "top_metal" if exit_metal_index > base_metal_index else "bottom_metal"
+
+        via_range = end - start
+
+        for i in range(start, end):
+
+            via = techfile["via"][i]
+
+            cell.add_reference(self.via_cache.via_array(via=via, width=width), origin=(x, y))
+
+            aux_metal = techfile["metal"][via[top_or_bottom]]
+            aux_metal_layer = (aux_metal["gds_number"], aux_metal["gds_datatype"])
+
+            cell.add_rectangle(x, y, width, width, layer=aux_metal_layer)
+
+            progress((1 / 3) + ((1 / 3) * ((i - start)/(via_range))))
+
+    def add_trace(self, cell: gds.Cell, path, width: float | int, layer: tuple[int, int], square: bool = True):
+
+        """
+        Adds a spiral trace to a cell, as set by the trace mode.
+
+        Args:
+            cell: Cell receiving the trace.
+            path: Outer edge path of the trace, as returned by geometry.square_spiral_path
+                or geometry.polygon_spiral_path.
+            width: Width of the trace.
+            layer: GDS number and datatype.
+            square: Whether the path is a square spiral path. Square spirals are drawn with
+                overlapping rectangles and any other path with abutting quadrilaterals.
+        """
+
+        match self.trace:
+            case "rectangles" if square:
+                cell.add_polygons(geometry.square_path_segments(path=path, width=width), layer=layer)
+            case "rectangles":
+                cell.add_polygons(geometry.path_quads(path=path, width=width), layer=layer)
+            case "polygon":
+                cell.add_polygon(geometry.trace_outline(path=path, width=width), layer=layer)
+            case "path":
+                cell.add_path(geometry.offset_path(path=path, distance=width / 2), width=width, layer=layer)
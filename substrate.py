@@ -0,0 +1,194 @@
+import numpy as np
+import converter
+import geometry
+import pi_model
+import spiral
+
+# µ0 IN H/µm
+MU_0 = 4e-13 * np.pi
+
+def inductor_path(inductor: dict[str]) -> np.ndarray:
+
+    """
+    Gets the outer edge of the base metal trace of an inductor, as drawn by Spiral.
+
+    Raises:
+        ValueError: If the shape has no single trace or the turns do not fit.
+    """
+
+    shape = inductor.get("shape", "square").lower()
+    geometry_parameters = {key: inductor[key] for key in ("length", "width", "space", "turns")}
+
+    if shape == "square":
+        return geometry.square_spiral_path(**geometry_parameters)
+    if shape == "octagonal":
+        return geometry.polygon_spiral_path(**geometry_parameters, sides=8)
+    if shape == "circular":
+        return geometry.polygon_spiral_path(**geometry_parameters, sides=int(inductor.get("points_per_turn", 64)), continuous=True)
+
+    raise ValueError(f"The substrate loss model does not support {shape} spirals")
+
+def current_density(outer_edge: np.ndarray, width: float | int, chip: dict[str, int]) -> tuple[np.ndarray, np.ndarray]:
+
+    """
+    Spreads a unit current flowing along a spiral trace over the chip FFT grid.
+
+    The trace is sampled across its width and along its length at half a grid cell, and
+    every sample adds its current moment to the cell holding it. The spiral is centered
+    on the chip.
+
+    Args:
+        outer_edge: Outer edge of the trace, with the trace on its right side, in µm.
+        width: Width of the trace in µm.
+        chip: Chip settings, as returned by converter.chip_settings.
+
+    Returns:
+        Sheet current densities along x and along y in A/µm, of shape (fftx, ffty).
+
+    Raises:
+        ValueError: If the spiral does not fit in the chip.
+    """
+
+    cell = np.array((chip["chipx"] / chip["fftx"], chip["chipy"] / chip["ffty"]))
+    step = cell.min() / 2
+
+    # COLUMNS OF SAMPLES ACROSS THE WIDTH
+    columns = int(np.ceil(width / step))
+    paths = [geometry.offset_path(path=outer_edge, distance=(k + 0.5) * width / columns) for k in range(columns)]
+
+    starts = np.concatenate([path[:-1] for path in paths])
+    vectors = np.concatenate([np.diff(path, axis=0) for path in paths])
+
+    # SAMPLES ALONG EACH SEGMENT, AT THEIR MIDDLES
+    pieces = np.maximum(np.ceil(np.hypot(*vectors.T) / step).astype(int), 1)
+    segment = np.repeat(np.arange(len(vectors)), pieces)
+    fraction = (np.arange(pieces.sum()) - np.repeat(np.cumsum(pieces) - pieces, pieces) + 0.5) / pieces[segment]
+
+    points = starts[segment] + fraction[:, None] * vectors[segment]
+    moments = vectors[segment] / (pieces[segment, None] * columns)
+
+    offset = (np.array((chip["chipx"], chip["chipy"])) - (outer_edge.min(axis=0) + outer_edge.max(axis=0))) / 2
+    indices = np.floor((points + offset) / cell).astype(int)
+
+    if np.any(indices < 0) or np.any(indices >= (chip["fftx"], chip["ffty"])):
+        raise ValueError(f"The spiral does not fit in the {chip['chipx']} x {chip['chipy']} µm chip")
+
+    densities = np.zeros((2, chip["fftx"], chip["ffty"]))
+    for axis in (0, 1):
+        np.add.at(densities[axis], (indices[:, 0], indices[:, 1]), moments[:, axis] / cell.prod())
+
+    return densities[0], densities[1]
+
+def greens_function(
+        chip: dict[str, int],
+        height: float | int,
+        conductivities: np.ndarray,
+        thicknesses: np.ndarray,
+        frequencies: np.ndarray,
+    ) -> np.ndarray:
+
+    """
+    Gets the spectral Green's function relating the sheet current of the spiral to the
+    eddy current loss in the conducting substrate layers.
+
+    A sheet current K at a height h above the substrate makes the vector potential
+    µ0 K e^(-k h) / (k + γ1) at its top, which decays as e^(-γ z) through every layer,
+    with γ = sqrt(k² + j ω µ0 σ). Each layer dissipates σ ω² ∫ |A|² per unit area, so the
+    weight of every wave number is the sum over the layers of σ |A / K|² integrated
+    across their thickness. Reflections at the layer interfaces are neglected.
+
+    Args:
+        chip: Chip settings, as returned by converter.chip_settings.
+        height: Height of the trace above the top of the substrate in µm.
+        conductivities: Conductivities of the substrate layers from the top down in S/µm.
+        thicknesses: Thicknesses of the substrate layers from the top down in µm.
+        frequencies: Frequencies in Hz.
+
+    Returns:
+        Weights of shape (frequencies, fftx, ffty) in the layout of numpy.fft.fft2.
+    """
+
+    kx = 2 * np.pi * np.fft.fftfreq(chip["fftx"], d=chip["chipx"] / chip["fftx"])
+    ky = 2 * np.pi * np.fft.fftfreq(chip["ffty"], d=chip["chipy"] / chip["ffty"])
+    k = np.hypot(kx[:, None], ky[None, :])
+
+    omega = 2 * np.pi * np.asarray(frequencies, dtype=float)[:, None, None]
+
+    weights = np.zeros(np.broadcast_shapes(omega.shape, k.shape))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        # |A / K|² AT THE TOP OF THE SUBSTRATE
+        gamma = np.sqrt(np.square(k) + 1j * omega * MU_0 * conductivities[0])
+        amplitude = np.square(np.abs(MU_0 * np.exp(-k * height) / (k + gamma)))
+
+        for conductivity, thickness in zip(conductivities, thicknesses):
+            gamma = np.sqrt(np.square(k) + 1j * omega * MU_0 * conductivity)
+            weights += conductivity * amplitude * -np.expm1(-2 * gamma.real * thickness) / (2 * gamma.real)
+            amplitude = amplitude * np.exp(-2 * gamma.real * thickness)
+
+    # THE UNIFORM COMPONENT HAS NO FINITE FIELD IN AN UNBOUNDED PLANE
+    weights[..., 0, 0] = 0
+
+    return weights
+
+def eddy_resistance(
+        inductor: dict[str],
+        techfile: dict[str, list[dict[str]]],
+        frequencies,
+        chunk_size: int = 32,
+    ) -> np.ndarray:
+
+    """
+    Gets the series resistance added by eddy currents in the substrate under an inductor.
+
+    The chip size and the FFT grid come from the techfile chip settings. The spiral current
+    is transformed once, and the frequencies are evaluated in chunks, which bounds the
+    memory of the Green's functions.
+
+    Args:
+        inductor: Inductor parameters, as stored in a project.
+        techfile: Techfile referenced by the inductor.
+        frequencies: Frequencies in Hz.
+        chunk_size: Number of frequencies evaluated at once.
+
+    Returns:
+        Resistances in Ω.
+
+    Raises:
+        ValueError: If the shape is not supported, the turns or the spiral do not fit, the
+            base metal or its layer do not exist, or a layer has no resistivity.
+    """
+
+    frequencies = np.atleast_1d(np.asarray(frequencies, dtype=float))
+    techfile = converter.default_techfile(techfile)
+    chip = converter.chip_settings(techfile=techfile)
+
+    base_metal_index = spiral.get_metal_index(techfile=techfile, metal_name=inductor["base_metal"])
+    if base_metal_index == -1:
+        raise ValueError("Metal do not exist")
+
+    substrate_layers = techfile["layer"][:pi_model.substrate_layers(techfile)][::-1]
+    if not substrate_layers:
+        return np.zeros(frequencies.shape)
+
+    # HEIGHT OF THE MIDDLE OF THE TRACE ABOVE THE TOP OF THE SUBSTRATE
+    bottoms, tops = pi_model.layer_bounds(techfile)
+    substrate_top = tops[len(substrate_layers) - 1]
+    height = pi_model.metal_height(techfile, base_metal_index) + techfile["metal"][base_metal_index]["thickness"] / 2 - substrate_top
+
+    # RESISTIVITIES ARE IN Ω cm, 1 Ω cm = 1e4 Ω µm
+    conductivities = 1 / (np.array([float(layer["resistivity"]) for layer in substrate_layers]) * 1e4)
+    thicknesses = np.array([float(layer["thickness"]) for layer in substrate_layers])
+
+    density_x, density_y = current_density(inductor_path(inductor), inductor["width"], chip)
+    spectrum = np.square(np.abs(np.fft.fft2(density_x))) + np.square(np.abs(np.fft.fft2(density_y)))
+
+    # PARSEVAL: THE INTEGRAL OVER THE CHIP IS THE CELL AREA OVER THE NUMBER OF CELLS TIMES THE SPECTRAL SUM
+    cells = chip["fftx"] * chip["ffty"]
+    scale = chip["chipx"] * chip["chipy"] / cells / cells
+
+    losses = np.concatenate([
+        np.sum(greens_function(chip, height, conductivities, thicknesses, chunk) * spectrum, axis=(1, 2))
+        for chunk in np.array_split(frequencies, max(1, int(np.ceil(len(frequencies) / chunk_size))))
+    ])
+
+    return np.square(2 * np.pi * frequencies) * scale * losses
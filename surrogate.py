@@ -0,0 +1,228 @@
+import functools
+import itertools
+import numpy as np
+import greenhouse
+import inductance
+import pi_model
+import quality
+import resistance
+import spiral
+import sweep
+
+# MAXIMUM NUMBER OF BATCHES DRAWN TO FIND ENOUGH GEOMETRIES THAT FIT
+MAX_DRAWS = 20
+
+@functools.lru_cache(maxsize=16)
+def exponents(degree: int) -> np.ndarray:
+
+    """
+    Gets the exponents of the monomials of a polynomial in the four geometry parameters,
+    of shape (terms, 4), with every total degree up to degree.
+    """
+
+    return np.array([powers for powers in itertools.product(range(degree + 1), repeat=len(sweep.SWEEP_PARAMETERS)) if sum(powers) <= degree])
+
+def features(model: dict[str], length, width, space, turns) -> np.ndarray:
+
+    """
+    Gets the polynomial terms of geometries, with the logarithm of every parameter scaled
+    to [-1, 1] over the bounds of the model.
+
+    Returns:
+        Array of shape (geometries, terms).
+    """
+
+    bounds = np.log([model["bounds"][parameter] for parameter in sweep.SWEEP_PARAMETERS])
+    center, span = bounds.mean(axis=1), np.diff(bounds, axis=1)[:, 0] / 2
+
+    values = np.log(np.stack(np.broadcast_arrays(length, width, space, turns), axis=-1).astype(float).reshape(-1, 4))
+    scaled = (values - center) / np.where(span > 0, span, 1)
+
+    return np.prod(np.power(scaled[:, None, :], exponents(model["degree"])), axis=2)
+
+def draw_samples(bounds: dict[str, list[float]], samples: int, seed: int = None) -> dict[str, np.ndarray]:
+
+    """
+    Draws random square spiral geometries within bounds, uniformly in the logarithm of the
+    length, width and space and over the quarter turns, keeping those whose turns fit.
+
+    Args:
+        bounds: Minimum and maximum of every geometry parameter.
+        samples: Number of geometries.
+        seed: Seed of the random generator.
+
+    Returns:
+        Arrays of every geometry parameter.
+
+    Raises:
+        ValueError: If the bounds are not positive or hold no quarter turn, or too few
+            geometries fit.
+    """
+
+    if any(low <= 0 or high < low for low, high in bounds.values()):
+        raise ValueError("The bounds must be positive and increasing")
+
+    quarter_turns = (int(np.ceil(bounds["turns"][0] * 4)), int(np.floor(bounds["turns"][1] * 4)))
+    if quarter_turns[1] < quarter_turns[0]:
+        raise ValueError("The turns bounds hold no quarter turn")
+
+    generator = np.random.default_rng(seed)
+    drawn = {parameter: np.empty(0) for parameter in sweep.SWEEP_PARAMETERS}
+
+    for _ in range(MAX_DRAWS):
+        batch = {
+            parameter: np.exp(generator.uniform(*np.log(bounds[parameter]), size=samples))
+            for parameter in ("length", "width", "space")
+        }
+        batch["turns"] = generator.integers(quarter_turns[0], quarter_turns[1] + 1, size=samples) / 4
+
+        fits = np.isfinite(inductance.diameters(**batch)[1])
+        drawn = {parameter: np.concatenate((drawn[parameter], batch[parameter][fits])) for parameter in drawn}
+
+        if len(drawn["length"]) >= samples:
+            return {parameter: values[:samples] for parameter, values in drawn.items()}
+
+    raise ValueError(f"Only {len(drawn['length'])} of {samples} geometries fit within the bounds")
+
+def solve(
+        samples: dict[str, np.ndarray],
+        techfile: dict[str, list[dict[str]]],
+        base_metal_index: int,
+        exit_metal_index: int,
+        frequency: float | int,
+    ) -> tuple[np.ndarray, np.ndarray]:
+
+    """
+    Gets the Greenhouse inductances in nH and the π-model quality factors at a frequency of
+    square spirals, from arrays.
+    """
+
+    thickness = float(techfile["metal"][base_metal_index]["thickness"])
+    with np.errstate(divide="ignore", invalid="ignore"):
+        inductances = np.array([
+            float(greenhouse.square_spiral_inductance(*values, thickness=thickness)["total"])
+            for values in zip(*(samples[parameter] for parameter in sweep.SWEEP_PARAMETERS))
+        ])
+
+    resistances = resistance.square_resistances(**samples, techfile=techfile, base_metal_index=base_metal_index, exit_metal_index=exit_metal_index)
+    parameters = np.broadcast_to(pi_model.stack_parameters(techfile, base_metal_index, exit_metal_index), (len(inductances), 8))
+
+    model = pi_model.assemble([frequency], inductances, resistances, samples["width"], samples["turns"], parameters)
+
+    return inductances, quality.quality_factor(model)[:, 0]
+
+def fit(
+        techfile: dict[str, list[dict[str]]],
+        base_metal: str,
+        exit_metal: str,
+        frequency: float | int,
+        bounds: dict[str, list[float]],
+        samples: int = 1000,
+        degree: int = 4,
+        held_out: float = 0.2,
+        seed: int = None,
+    ) -> dict[str]:
+
+    """
+    Fits the surrogate model of a techfile from solver samples.
+
+    Random geometries within the bounds are solved with the Greenhouse method and the
+    π-model, and the logarithms of their inductances and quality factors are fitted by
+    least squares with polynomials of the logarithms of the parameters. The held out
+    samples are not fitted, and give the error report.
+
+    Args:
+        techfile: Techfile of the inductors.
+        base_metal: Name of the base metal.
+        exit_metal: Name of the exit metal.
+        frequency: Frequency of the quality factor in Hz.
+        bounds: Minimum and maximum of every geometry parameter, in µm and turns.
+        samples: Number of solved geometries, held out ones included.
+        degree: Total degree of the polynomials.
+        held_out: Fraction of the samples held out of the fit.
+        seed: Seed of the random generator.
+
+    Returns:
+        Surrogate model, made of plain values so it can be stored in a project.
+
+    Raises:
+        ValueError: If a metal do not exist, the bounds are not valid or there are too few
+            samples for the degree.
+    """
+
+    base_metal_index = spiral.get_metal_index(techfile=techfile, metal_name=base_metal)
+    exit_metal_index = spiral.get_metal_index(techfile=techfile, metal_name=exit_metal)
+    if base_metal_index == -1 or exit_metal_index == -1:
+        raise ValueError("Metal do not exist")
+
+    if not 0 < held_out < 1:
+        raise ValueError("The held out fraction must be between 0 and 1")
+
+    model = {
+        "base_metal": base_metal,
+        "exit_metal": exit_metal,
+        "frequency": float(frequency),
+        "degree": int(degree),
+        "bounds": {parameter: [float(value) for value in bounds[parameter]] for parameter in sweep.SWEEP_PARAMETERS},
+    }
+
+    drawn = draw_samples(model["bounds"], samples, seed)
+    testing = np.arange(samples) < round(samples * held_out)
+    if (~testing).sum() < len(exponents(degree)) or not testing.any():
+        raise ValueError(f"{samples} samples are too few for a polynomial of degree {degree}")
+
+    inductances, quality_factors = solve(drawn, techfile, base_metal_index, exit_metal_index, frequency)
+    terms = features(model, **drawn)
+
+    # THE QUALITY FACTOR IS ONLY FITTED WHERE THE SPIRAL IS STILL INDUCTIVE
+    for key, values in (("inductance", inductances), ("quality", quality_factors)):
+        valid = np.isfinite(values) & (values > 0)
+        training = valid & ~testing
+
+        coefficients = np.linalg.lstsq(terms[training], np.log(values[training]), rcond=None)[0]
+        errors = np.abs(np.exp(terms[valid & testing] @ coefficients) / values[valid & testing] - 1)
+
+        model[key] = coefficients.tolist()
+        model.setdefault("error", dict())[key] = {
+            "mean": float(errors.mean()) if len(errors) else float("nan"),
+            "max": float(errors.max()) if len(errors) else float("nan"),
+        }
+
+    model["samples"] = int((~testing).sum())
+    model["held_out"] = int(testing.sum())
+
+    return model
+
+def predict(model: dict[str], length, width, space, turns) -> dict[str, np.ndarray]:
+
+    """
+    Gets the inductances in nH and the quality factors of square spirals from a surrogate
+    model.
+
+    Returns:
+        Inductances ("inductance"), quality factors ("quality") and whether every parameter
+        is within the bounds of the model ("inside"), with the broadcast shape of the
+        parameters.
+    """
+
+    values = np.broadcast_arrays(length, width, space, turns)
+    terms = features(model, *values)
+
+    inside = np.all([
+        (np.asarray(value) >= model["bounds"][parameter][0]) & (np.asarray(value) <= model["bounds"][parameter][1])
+        for parameter, value in zip(sweep.SWEEP_PARAMETERS, values)
+    ], axis=0)
+
+    return {
+        "inductance": np.exp(terms @ model["inductance"]).reshape(values[0].shape),
+        "quality": np.exp(terms @ model["quality"]).reshape(values[0].shape),
+        "inside": inside,
+    }
+
+def invalidate(project: dict[str, dict[str, dict]], techfile_name: str):
+
+    """
+    Removes the surrogate model of a techfile from a project, once the techfile changes.
+    """
+
+    project.get("surrogates", dict()).pop(techfile_name, None)
@@ -0,0 +1,203 @@
+import itertools
+import math
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import numpy as np
+import gds
+import spiral
+
+SWEEP_PARAMETERS = ("length", "width", "space", "turns")
+
+def parse_values(text: str | float | int) -> list[float]:
+
+    """
+    Parses the values of a sweep parameter.
+
+    Values can be a single number, a comma separated list ("1,2,5") or an inclusive
+    range written as start:stop:step ("2:10:0.5").
+
+    Args:
+        text: Text describing the values.
+
+    Returns:
+        List with the values of the parameter.
+
+    Raises:
+        ValueError: If the text is not a number, a list or a range.
+    """
+
+    if isinstance(text, (float, int)):
+        return [float(text)]
+
+    text = text.strip()
+
+    if ":" in text:
+        try:
+            start, stop, step = (float(item) for item in text.split(":"))
+        except ValueError:
+            raise ValueError(f"Invalid range: {text}. Use start:stop:step")
+        if step <= 0 or stop < start:
+            raise ValueError(f"Invalid range: {text}. Use start:stop:step")
+
+        count = math.floor((stop - start) / step + 1e-9) + 1
+        return [round(value, 9) for value in (start + step * np.arange(count)).tolist()]
+
+    try:
+        return [float(item) for item in text.split(",") if item.strip()]
+    except ValueError:
+        raise ValueError(f"Invalid list of values: {text}")
+
+def sweep_variants(
+        length: list[float],
+        width: list[float],
+        space: list[float],
+        turns: list[float],
+        prefix: str = "inductor",
+    ) -> dict[str, dict[str, float]]:
+
+    """
+    Gets every combination of the sweep parameters.
+
+    Args:
+        length: External lengths of the square inductors.
+        width: Widths of the metal traces.
+        space: Spaces between base metal traces.
+        turns: Numbers of turns.
+        prefix: Prefix of the variant names.
+
+    Returns:
+        Parameters of each variant by variant name.
+    """
+
+    variants = {}
+    for values in itertools.product(length, width, space, turns):
+        variant = dict(zip(SWEEP_PARAMETERS, values))
+        variant_name = f"{prefix}_L{variant['length']:g}_W{variant['width']:g}_S{variant['space']:g}_N{variant['turns']:g}"
+        variants[variant_name] = variant
+
+    return variants
+
+def draw_variant(job: tuple[str, dict[str], str | None, str, str]) -> tuple[str, gds.Cell | None]:
+
+    """
+    Draws a single sweep variant. Runs inside the worker processes.
+
+    Args:
+        job: Variant name, variant parameters, output file, GDS backend and trace mode.
+            Without an output file the variant cell is returned instead of written.
+
+    Returns:
+        The variant name and, when it was not written, the variant cell.
+    """
+
+    variant_name, variant, output_file, backend, trace = job
+
+    if output_file is None:
+        return variant_name, spiral.Spiral(trace=trace).square_cell(inductor_name=variant_name, **variant)
+
+    spiral.Spiral(backend=backend, trace=trace).draw_square(
+        inductor_name=variant_name,
+        output_file=output_file,
+        **variant,
+    )
+
+    return variant_name, None
+
+def run_sweep(
+        variants: dict[str, dict[str, float]],
+        techfile: dict[str, list[dict[str]]],
+        base_metal: str,
+        exit_metal: str,
+        output: str,
+        merged: bool = False,
+        workers: int = None,
+        backend: str = "native",
+        trace: str = "rectangles",
+        progress: callable = None,
+        library_name: str = "sweep",
+        spacing: float | int = 100,
+    ) -> dict[str, float]:
+
+    """
+    Draws every variant of a sweep in a process pool.
+
+    Args:
+        variants: Parameters of each variant by variant name, as returned by sweep_variants.
+        techfile: Techfile used by every variant.
+        base_metal: Name of the main inductors' structure.
+        exit_metal: Name of the exit metal of the inductors.
+        output: Output directory, or output GDS file when merged is True.
+        merged: Whether all the variants are written into a single GDS library.
+        workers: Number of worker processes. Defaults to the number of cores.
+        backend: GDS writer, "native" or "gdsfactory".
+        trace: Base metal trace drawing, "rectangles", "polygon" or "path".
+        progress: Optional function receiving the sweep progress as a fraction between 0 and 1.
+        library_name: Name of the top cell of the merged library.
+        spacing: Space between the variants of the merged library.
+
+    Returns:
+        Number of cells drawn, elapsed time in seconds and throughput in cells per second.
+
+    Raises:
+        ValueError: If a metal do not exist or a variant can not be drawn.
+    """
+
+    if -1 in (spiral.get_metal_index(techfile=techfile, metal_name=base_metal), spiral.get_metal_index(techfile=techfile, metal_name=exit_metal)):
+        raise ValueError("Metal do not exist")
+
+    report = spiral.Progress(callback=progress)
+    report(0)
+
+    start_time = time.perf_counter()
+
+    if not merged:
+        os.makedirs(output, exist_ok=True)
+
+    jobs = [
+        (
+            variant_name,
+            {
+                **variant,
+                "techfile": techfile,
+                "base_metal": base_metal,
+                "exit_metal": exit_metal,
+                "x": 0,
+                "y": 0,
+            },
+            None if merged else os.path.join(output, f"{variant_name}.gds"),
+            backend,
+            trace,
+        )
+        for variant_name, variant in variants.items()
+    ]
+
+    cells: dict[str, gds.Cell] = dict()
+
+    with ProcessPoolExecutor(max_workers=workers or os.cpu_count()) as executor:
+        futures = [executor.submit(draw_variant, job) for job in jobs]
+        for done, future in enumerate(as_completed(futures), start=1):
+            variant_name, cell = future.result()
+            cells[variant_name] = cell
+            report(done / len(jobs))
+
+    # MERGING THE VARIANTS INTO A SINGLE LIBRARY
+    if merged:
+        library = gds.Cell(library_name)
+
+        pitch = max(variant["length"] for variant in variants.values()) + spacing
+        columns = math.ceil(math.sqrt(len(jobs)))
+
+        for i, variant_name in enumerate(variants):
+            library.add_reference(cells[variant_name], origin=((i % columns) * pitch, (i // columns) * pitch))
+
+        spiral.write_cell(library, output, backend=backend)
+
+    seconds = time.perf_counter() - start_time
+    report(1)
+
+    return {
+        "cells": len(jobs),
+        "seconds": seconds,
+        "throughput": len(jobs) / seconds if seconds else math.inf,
+    }